@@ -0,0 +1,70 @@
+"""Add full text search
+
+Revision ID: 5c1f7e2a9d43
+Revises: e6ad79141ad9
+Create Date: 2026-10-18 10:15:12.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f7e2a9d43'
+down_revision: Union[str, None] = 'e6ad79141ad9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'questions',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('russian', title), 'A') || "
+                "setweight(to_tsvector('english', title), 'A')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_questions_search_vector',
+        'questions',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+    op.add_column(
+        'answers',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('russian', "
+                "regexp_replace(content, '<[^>]+>', ' ', 'g')), 'B') || "
+                "setweight(to_tsvector('english', "
+                "regexp_replace(content, '<[^>]+>', ' ', 'g')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_answers_search_vector',
+        'answers',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_answers_search_vector', table_name='answers', postgresql_using='gin')
+    op.drop_column('answers', 'search_vector')
+    op.drop_index('ix_questions_search_vector', table_name='questions', postgresql_using='gin')
+    op.drop_column('questions', 'search_vector')
@@ -0,0 +1,97 @@
+"""Add answer plain text
+
+Revision ID: 8b3e0c6f41a2
+Revises: 5c1f7e2a9d43
+Create Date: 2026-10-18 11:42:08.530117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from bs4 import BeautifulSoup
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3e0c6f41a2"
+down_revision: Union[str, None] = "5c1f7e2a9d43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# Копия src.utils.html: миграция не должна зависеть от кода приложения.
+BLOCK_TAGS = [
+    "address",
+    "article",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "tr",
+    "ul",
+]
+
+
+def html_to_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup.find_all(BLOCK_TAGS):
+        tag.insert_after("\n")
+    return soup.get_text().strip()
+
+
+def upgrade() -> None:
+    op.add_column(
+        "answers",
+        sa.Column("content_text", sa.Text(), server_default="", nullable=False),
+    )
+
+    answers = sa.table(
+        "answers",
+        sa.column("id", sa.Integer),
+        sa.column("content", sa.Text),
+        sa.column("content_text", sa.Text),
+    )
+    update_stmt = (
+        answers.update()
+        .where(answers.c.id == sa.bindparam("answer_id"))
+        .values(content_text=sa.bindparam("text"))
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(answers.c.id, answers.c.content)
+            .where(answers.c.id > last_id)
+            .order_by(answers.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = [
+            {"answer_id": answer_id, "text": html_to_text(content)}
+            for answer_id, content in rows
+        ]
+        connection.execute(update_stmt, params)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_column("answers", "content_text")
@@ -0,0 +1,29 @@
+"""Add user token version
+
+Revision ID: 9e4c2d7b5a18
+Revises: 3d9a6b1f7c20
+Create Date: 2026-10-18 14:27:10.203718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4c2d7b5a18'
+down_revision: Union[str, None] = '3d9a6b1f7c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,28 @@
+"""Add question list indexes
+
+Revision ID: 4f7a2c9e1b36
+Revises: 9e4c2d7b5a18
+Create Date: 2026-10-18 16:12:05.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f7a2c9e1b36'
+down_revision: Union[str, None] = '9e4c2d7b5a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_questions_category_id_id', 'questions', ['category_id', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_category_id_id', table_name='questions')
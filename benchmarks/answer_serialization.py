@@ -0,0 +1,87 @@
+"""
+Сравнение скорости сериализации ответов API: разбор HTML через BeautifulSoup
+при каждой сериализации (как было) и готовый текст из колонки content_text.
+
+Запуск: python -m benchmarks.answer_serialization [--answers 2000] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from bs4 import BeautifulSoup
+from pydantic import TypeAdapter, field_serializer
+
+from src.answer.schemas import AnswerRead, AnswerReadBase
+from src.question.schemas import QuestionReadNested
+from src.utils.html import html_to_text
+
+
+class LegacyAnswerRead(AnswerReadBase):
+    question: QuestionReadNested
+
+    @field_serializer("content")
+    def strip_html(self, v):
+        soup = BeautifulSoup(v, "html.parser")
+        return soup.get_text()
+
+
+def make_answers(count: int, seed: int = 42) -> list[SimpleNamespace]:
+    rnd = random.Random(seed)
+    words = ["docker", "kubernetes", "pod", "сеть", "контейнер", "volume", "ingress"]
+    category = SimpleNamespace(id=1, name="DevOps", slug="devops", description=None)
+    answers = []
+    for answer_id in range(1, count + 1):
+        paragraphs = [
+            "<p>"
+            + " ".join(rnd.choice(words) for _ in range(rnd.randint(20, 80)))
+            + "</p><pre><code>kubectl get pods -A</code></pre>"
+            for _ in range(rnd.randint(1, 6))
+        ]
+        content = "<div>" + "".join(paragraphs) + "</div>"
+        question = SimpleNamespace(
+            id=answer_id,
+            title=f"Вопрос {answer_id}",
+            category_id=1,
+            category=category,
+        )
+        text = html_to_text(content)
+        answers.append(
+            SimpleNamespace(
+                id=answer_id,
+                question_id=answer_id,
+                content=content,
+                content_text=text,
+                question=question,
+            )
+        )
+    return answers
+
+
+def measure(model, answers: list[SimpleNamespace], repeat: int) -> float:
+    adapter = TypeAdapter(list[model])
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        adapter.dump_json(adapter.validate_python(answers, from_attributes=True))
+        best = min(best, time.perf_counter() - started)
+    return len(answers) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--answers", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    answers = make_answers(args.answers)
+    legacy = measure(LegacyAnswerRead, answers, args.repeat)
+    current = measure(AnswerRead, answers, args.repeat)
+    print(f"BeautifulSoup on serialize: {legacy:12.0f} answers/s")
+    print(f"precomputed content_text:   {current:12.0f} answers/s")
+    print(f"speedup:                    {current / legacy:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
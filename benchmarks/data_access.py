@@ -0,0 +1,377 @@
+"""
+Микробенчмарки функций доступа к данным из src/*/dependencies.py на каталогах
+разного размера. Для каждой функции записываются задержка (медиана и p95),
+число возвращенных строк, число ORM-объектов в сессии, число SQL-запросов
+и пиковая память Python (tracemalloc, отдельным прогоном).
+
+Работает с БД из настроек приложения (DB__URL). С --reseed перед
+каждым масштабом каталог ОЧИЩАЕТСЯ и заполняется генератором
+src.utils.generate_data, поэтому запускать его можно только на отдельной БД:
+    python -m benchmarks.data_access --reseed --scales 10000 100000 1000000
+
+Без --reseed измеряется текущее содержимое БД. Результаты пишутся в JSON
+(--output); с --baseline они сравниваются с сохраненными: рост числа
+запросов или ORM-объектов - регрессия всегда, рост задержки - если больше
+--tolerance. Изменяющие функции выполняются в транзакции с откатом.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.answer.dependencies import (
+    get_all_answers,
+    get_answer_by_id,
+    get_answers_page,
+    get_answers_page_rows,
+)
+from src.answer.schemas import AnswerListQuery
+from src.answer.models import Answer
+from src.auth.models import User
+from src.category.dependencies import (
+    get_all_category,
+    get_categories_page,
+    get_categories_page_rows,
+    get_questions_by_category_id,
+    get_questions_count_by_category_id,
+)
+from src.common.pagination import Page
+from src.config import settings
+from src.db.database import db_helper
+from src.favorite.dependencies import (
+    get_all_favorites_with_pagination,
+    get_user_favorites,
+)
+from src.favorite.models import Favorite
+from src.question.dependencies import (
+    delete_question_by_id,
+    get_all_question,
+    get_all_questions_with_pagination,
+    get_question_by_id,
+    get_question_by_slug,
+    get_questions_page,
+    get_questions_page_rows,
+    get_total_questions_count,
+)
+from src.question.models import Question
+from src.question.schemas import QuestionListQuery
+from src.category.schemas import CategoryListQuery
+from src.search.dependencies import get_search_count, search_questions
+from src.utils.generate_data import DataGenerator, generate
+
+DEFAULT_OUTPUT = Path(__file__).with_name("data_access_results.json")
+
+
+@dataclass
+class Context:
+    """Идентификаторы, на которых вызываются функции; выбираются из БД."""
+
+    question_id: int
+    question_slug: str
+    deletable_question_id: int
+    category_id: int
+    deep_page: int
+    answer_id: int
+    user: User
+
+
+Case = Callable[[AsyncSession, Context], Awaitable[Any]]
+
+CASES: dict[str, Case] = {
+    "question.get_all_question": lambda s, c: get_all_question(s),
+    "question.get_question_by_id": lambda s, c: get_question_by_id(c.question_id, s),
+    "question.get_question_by_slug": lambda s, c: get_question_by_slug(
+        c.question_slug, s
+    ),
+    "question.get_all_questions_with_pagination": lambda s, c: (
+        get_all_questions_with_pagination(s)
+    ),
+    "question.get_all_questions_with_pagination[deep]": lambda s, c: (
+        get_all_questions_with_pagination(s, page=c.deep_page)
+    ),
+    "question.get_questions_page": lambda s, c: get_questions_page(
+        QuestionListQuery(), s
+    ),
+    "question.get_questions_page[category]": lambda s, c: get_questions_page(
+        QuestionListQuery(category_id=c.category_id, has_answer=True), s
+    ),
+    "question.get_questions_page_rows": lambda s, c: get_questions_page_rows(
+        QuestionListQuery(), s
+    ),
+    "question.get_total_questions_count": lambda s, c: get_total_questions_count(s),
+    "question.delete_question_by_id": lambda s, c: delete_question_by_id(
+        c.deletable_question_id, s
+    ),
+    "category.get_all_category": lambda s, c: get_all_category(s),
+    "category.get_categories_page": lambda s, c: get_categories_page(
+        CategoryListQuery(), s
+    ),
+    "category.get_categories_page_rows": lambda s, c: get_categories_page_rows(
+        CategoryListQuery(), s
+    ),
+    "category.get_questions_by_category_id": lambda s, c: (
+        get_questions_by_category_id(c.category_id, s)
+    ),
+    "category.get_questions_by_category_id[deep]": lambda s, c: (
+        get_questions_by_category_id(c.category_id, s, page=c.deep_page)
+    ),
+    "category.get_questions_count_by_category_id": lambda s, c: (
+        get_questions_count_by_category_id(c.category_id, s)
+    ),
+    "favorite.get_user_favorites": lambda s, c: get_user_favorites(c.user, s),
+    "favorite.get_all_favorites_with_pagination": lambda s, c: (
+        get_all_favorites_with_pagination(c.user, s)
+    ),
+    "answer.get_all_answers": lambda s, c: get_all_answers(s),
+    "answer.get_answers_page": lambda s, c: get_answers_page(AnswerListQuery(), s),
+    "answer.get_answers_page[category]": lambda s, c: get_answers_page(
+        AnswerListQuery(category_id=c.category_id), s
+    ),
+    "answer.get_answers_page_rows": lambda s, c: get_answers_page_rows(
+        AnswerListQuery(), s
+    ),
+    "answer.get_answer_by_id": lambda s, c: get_answer_by_id(c.answer_id, s),
+    "search.search_questions": lambda s, c: search_questions("docker", s),
+    "search.get_search_count": lambda s, c: get_search_count("docker", s),
+}
+
+
+async def load_context(session: AsyncSession) -> Context:
+    category_id, category_size = (
+        await session.execute(
+            select(Question.category_id, func.count())
+            .group_by(Question.category_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+    ).one()
+    # Вопрос из середины таблицы, чтобы не попадать в первые страницы.
+    question_id, question_slug = (
+        await session.execute(
+            select(Question.id, Question.slug)
+            .order_by(Question.id)
+            .offset(await get_total_questions_count(session) // 2)
+            .limit(1)
+        )
+    ).one()
+    deletable_question_id = await session.scalar(
+        select(Question.id)
+        .where(~exists().where(Favorite.question_id == Question.id))
+        .order_by(Question.id.desc())
+        .limit(1)
+    )
+    # Пользователь с самым большим избранным - худший случай для профиля.
+    user_id = await session.scalar(
+        select(Favorite.user_id)
+        .group_by(Favorite.user_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    user = await session.get(User, user_id) if user_id else User(id=0)
+    return Context(
+        question_id=question_id,
+        question_slug=question_slug,
+        deletable_question_id=deletable_question_id or 0,
+        category_id=category_id,
+        deep_page=max(category_size // 9 // 2, 1),
+        answer_id=await session.scalar(select(func.min(Answer.id))) or 0,
+        user=user,
+    )
+
+
+def count_rows(result: Any) -> int:
+    if isinstance(result, Page):
+        return len(result.items)
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 0 if result is None else 1
+
+
+async def run_once(case: Case, context: Context) -> dict[str, float | int]:
+    # Сессия работает внутри внешней транзакции: commit в функциях
+    # фиксирует только точку сохранения, и все изменения откатываются.
+    async with db_helper.engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        )
+        try:
+            # SAVEPOINT выполняется до замера и в число запросов не входит.
+            await session.connection()
+            with db_helper.track_usage() as usage:
+                started = time.perf_counter()
+                result = await case(session, context)
+                elapsed = time.perf_counter() - started
+            return {
+                "seconds": elapsed,
+                "rows": count_rows(result),
+                "objects": len(session.identity_map),
+                "statements": usage.statements,
+            }
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+async def measure(
+    case: Case, context: Context, repeat: int, time_budget: float
+) -> dict[str, float | int]:
+    await run_once(case, context)  # прогрев кеша планов и буферов БД
+    runs = []
+    started = time.perf_counter()
+    while len(runs) < repeat and (
+        not runs or time.perf_counter() - started < time_budget
+    ):
+        runs.append(await run_once(case, context))
+
+    tracemalloc.start()
+    try:
+        await run_once(case, context)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = sorted(run["seconds"] for run in runs)
+    return {
+        "runs": len(runs),
+        "median_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 3),
+        "rows": runs[-1]["rows"],
+        "objects": runs[-1]["objects"],
+        "statements": runs[-1]["statements"],
+        "peak_memory_kb": round(peak / 1024),
+    }
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], tolerance: float
+) -> list[str]:
+    regressions = []
+    for scale, cases in results.items():
+        for name, current in cases.items():
+            expected = baseline.get(scale, {}).get(name)
+            if expected is None:
+                continue
+            for key in ("statements", "objects"):
+                if current[key] > expected[key]:
+                    regressions.append(
+                        f"{scale} {name}: {key} {expected[key]} -> {current[key]}"
+                    )
+            for key in ("median_ms", "peak_memory_kb"):
+                if current[key] > expected[key] * (1 + tolerance):
+                    regressions.append(
+                        f"{scale} {name}: {key} {expected[key]} -> {current[key]}"
+                    )
+    return regressions
+
+
+def format_results(scale: str, cases: dict[str, dict]) -> str:
+    lines = [
+        f"масштаб {scale}",
+        f"  {'функция':<52}{'медиана, мс':>12}{'p95, мс':>10}{'строк':>9}"
+        f"{'объектов':>10}{'SQL':>5}{'память, КБ':>12}",
+    ]
+    for name, stats in cases.items():
+        lines.append(
+            f"  {name:<52}{stats['median_ms']:>12.2f}{stats['p95_ms']:>10.2f}"
+            f"{stats['rows']:>9}{stats['objects']:>10}{stats['statements']:>5}"
+            f"{stats['peak_memory_kb']:>12}"
+        )
+    return "\n".join(lines)
+
+
+async def main(args: argparse.Namespace) -> int:
+    results: dict[str, dict] = {}
+    selected = {
+        name: case
+        for name, case in CASES.items()
+        if not args.only or any(part in name for part in args.only)
+    }
+    try:
+        for scale in args.scales if args.reseed else [None]:
+            if scale is not None:
+                await generate(
+                    DataGenerator(
+                        questions=scale,
+                        users=max(scale // 10, 1),
+                        categories=30,
+                        favorites_per_user=5.0,
+                        max_views=100_000,
+                        seed=args.seed,
+                    ),
+                    truncate=True,
+                    defer_search_indexes=True,
+                    database_url=str(settings.db.url),
+                )
+            async with db_helper.session_factory() as session:
+                context = await load_context(session)
+                total = await get_total_questions_count(session)
+            label = str(scale or total)
+            results[label] = {}
+            for name, case in selected.items():
+                try:
+                    results[label][name] = await measure(
+                        case, context, args.repeat, args.time_budget
+                    )
+                except HTTPException as err:
+                    print(f"{name}: пропущено ({err.detail})")
+            print(format_results(label, results[label]))
+    finally:
+        await db_helper.dispose()
+
+    args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    print(f"Результаты сохранены в {args.output}")
+
+    if args.baseline is None:
+        return 0
+    regressions = compare(
+        results, json.loads(args.baseline.read_text()), args.tolerance
+    )
+    if regressions:
+        print("Регрессии:")
+        print("\n".join(f"  {line}" for line in regressions))
+        return 1
+    print("Регрессий нет.")
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.data_access",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=30.0,
+        help="не больше секунд на повторы одной функции",
+    )
+    parser.add_argument("--only", nargs="*", help="подстроки имен функций")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
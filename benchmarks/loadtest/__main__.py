@@ -0,0 +1,156 @@
+"""
+Нагрузочный тест: заполняет БД детерминированным каталогом, прогоняет смесь
+сценариев (каталог, поиск, вопросы, вход, избранное, списки API) и печатает
+p50/p95/p99 и rps по каждому шагу. Результат сравнивается с сохраненным
+эталоном, и при регрессии процесс завершается с кодом 1.
+
+Запуск против поднятого сервера (БД для заполнения берется из DB__URL):
+    python -m benchmarks.loadtest --base-url http://localhost:8000
+
+Запуск приложения в том же процессе, без сети:
+    python -m benchmarks.loadtest --in-process
+
+Эталон (benchmarks/loadtest/baseline.json) зависит от машины, поэтому в
+репозитории его нет: результаты с другой машины сравнивать бессмысленно.
+Первый эталон записывается один раз на машине, где будет идти проверка
+(например, CI-раннер), прогоном заведомо исправной версии с теми же
+параметрами, что и у проверки, и коммитится вместе с кодом:
+    git checkout <исправный коммит>
+    python -m benchmarks.loadtest --in-process --update-baseline
+    git add benchmarks/loadtest/baseline.json
+
+Без эталона проверка завершается с кодом 1, а не проходит молча.
+Обновлять эталон нужно после намеренных изменений производительности
+и при смене машины.
+"""
+
+import argparse
+import asyncio
+import sys
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadtest.dataset import build_dataset, seed_database
+from benchmarks.loadtest.runner import (
+    build_report,
+    compare,
+    format_report,
+    load_baseline,
+    run_load,
+    save_baseline,
+)
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", default="http://localhost:8000")
+    target.add_argument("--in-process", action="store_true")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--no-seed", action="store_true", help="не заполнять БД")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="допустимое ухудшение относительно эталона (доля)",
+    )
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> int:
+    from src.db.database import db_helper
+
+    dataset = build_dataset(seed=args.seed, questions=args.questions, users=args.users)
+    parameters = {
+        "seed": args.seed,
+        "questions": args.questions,
+        "users": args.users,
+        "duration": args.duration,
+        "concurrency": args.concurrency,
+        "in_process": args.in_process,
+    }
+
+    async with AsyncExitStack() as stack:
+        if args.in_process:
+            from src.main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            # Исключения приложения считаются ответами 500, а не прерывают прогон.
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            base_url = "http://loadtest"
+        else:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=args.concurrency)
+            )
+            base_url = args.base_url
+        await stack.enter_async_context(transport)
+
+        if not args.no_seed:
+            async with db_helper.session_factory() as session:
+                await seed_database(session, dataset)
+            print(
+                f"БД заполнена: {len(dataset.questions)} вопросов, "
+                f"{len(dataset.users)} пользователей."
+            )
+
+        recorder, elapsed = await run_load(
+            transport,
+            base_url,
+            dataset,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            seed=args.seed,
+            warmup=args.warmup,
+        )
+        if not args.in_process:
+            await db_helper.dispose()
+
+    report = build_report(recorder, elapsed)
+    print(format_report(report))
+
+    if args.update_baseline:
+        save_baseline(args.baseline, report, parameters)
+        print(f"Эталон сохранен в {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(
+            f"Эталона {args.baseline} нет, сравнивать не с чем. Запишите его "
+            "прогоном исправной версии с флагом --update-baseline."
+        )
+        return 1
+    if baseline["parameters"] != parameters:
+        print(
+            "Параметры прогона отличаются от эталонных, сравнение неточно: "
+            f"{baseline['parameters']}"
+        )
+    regressions = compare(
+        report, baseline["steps"], args.tolerance, args.max_error_rate
+    )
+    if regressions:
+        print("Регрессии:")
+        print("\n".join(f"  {line}" for line in regressions))
+        return 1
+    print("Регрессий нет.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
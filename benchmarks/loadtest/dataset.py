@@ -0,0 +1,188 @@
+"""
+Детерминированный каталог для нагрузочного теста: одинаковые seed и размеры
+всегда дают одни и те же категории, вопросы, ответы и пользователей, поэтому
+сценариям не нужно читать их из БД. Все строки помечены префиксом `lt-`,
+повторное заполнение удаляет только их.
+"""
+
+import random
+from dataclasses import dataclass, field
+
+from fastapi_users.password import PasswordHelper
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.answer.models import Answer
+from src.auth.models import User
+from src.category.models import Category
+from src.favorite.models import Favorite
+from src.question.models import Question
+from src.utils.html import html_to_text
+
+PREFIX = "lt-"
+PASSWORD = "loadtest-password"
+
+TOPICS = [
+    ("Docker", "docker"),
+    ("Kubernetes", "kubernetes"),
+    ("Linux", "linux"),
+    ("Сети", "network"),
+    ("CI/CD", "cicd"),
+    ("Terraform", "terraform"),
+    ("Ansible", "ansible"),
+    ("Мониторинг", "monitoring"),
+    ("PostgreSQL", "postgresql"),
+    ("Облака", "cloud"),
+]
+WORDS = [
+    "контейнер",
+    "образ",
+    "сеть",
+    "volume",
+    "deployment",
+    "ingress",
+    "pod",
+    "сервис",
+    "nginx",
+    "ядро",
+    "процесс",
+    "pipeline",
+    "runner",
+    "модуль",
+    "state",
+    "playbook",
+    "alert",
+    "prometheus",
+    "индекс",
+    "репликация",
+    "backup",
+    "балансировщик",
+    "dns",
+    "firewall",
+]
+SEARCH_TERMS = ["docker", "контейнер", "kubernetes pod", "сеть", "nginx", "backup"]
+
+
+@dataclass
+class Dataset:
+    categories: list[dict] = field(default_factory=list)
+    questions: list[dict] = field(default_factory=list)
+    answers: list[dict] = field(default_factory=list)
+    users: list[dict] = field(default_factory=list)
+    favorites: list[tuple[int, int]] = field(default_factory=list)
+    search_terms: list[str] = field(default_factory=lambda: list(SEARCH_TERMS))
+
+
+def _answer_html(rnd: random.Random) -> str:
+    paragraphs = []
+    for _ in range(rnd.randint(1, 8)):
+        text = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(15, 120)))
+        paragraphs.append(f"<p>{text}</p>")
+        if rnd.random() < 0.3:
+            paragraphs.append("<pre><code>kubectl get pods -A</code></pre>")
+    return "".join(paragraphs)
+
+
+def build_dataset(
+    seed: int = 42, questions: int = 2000, users: int = 50, favorites: int = 10
+) -> Dataset:
+    """favorites - среднее число избранных вопросов на пользователя."""
+    rnd = random.Random(seed)
+    dataset = Dataset()
+    for name, slug in TOPICS:
+        dataset.categories.append(
+            {
+                "name": f"{name} ({PREFIX}{seed})",
+                "slug": f"{PREFIX}{slug}",
+                "description": f"Вопросы по теме {name}",
+            }
+        )
+    for index in range(questions):
+        words = rnd.sample(WORDS, 4)
+        dataset.questions.append(
+            {
+                "title": f"Как настроить {' '.join(words)}?",
+                "slug": f"{PREFIX}q-{index}",
+                "category": rnd.randrange(len(TOPICS)),
+                "views": int(rnd.paretovariate(1.2)),
+            }
+        )
+        html = _answer_html(rnd)
+        text = html_to_text(html)
+        dataset.answers.append({"content": html, "content_text": text})
+    for index in range(users):
+        dataset.users.append(
+            {
+                "email": f"{PREFIX}user-{index}@example.com",
+                "username": f"{PREFIX}user-{index}",
+            }
+        )
+        for question in rnd.sample(range(questions), min(favorites, questions)):
+            dataset.favorites.append((index, question))
+    return dataset
+
+
+async def seed_database(session: AsyncSession, dataset: Dataset) -> None:
+    """Удаляет прежние строки нагрузочного теста и вставляет каталог заново."""
+    lt_users = select(User.id).where(User.username.startswith(PREFIX))
+    lt_questions = select(Question.id).where(Question.slug.startswith(PREFIX))
+    await session.execute(delete(Favorite).where(Favorite.user_id.in_(lt_users)))
+    await session.execute(
+        delete(Favorite).where(Favorite.question_id.in_(lt_questions))
+    )
+    await session.execute(delete(Answer).where(Answer.question_id.in_(lt_questions)))
+    await session.execute(delete(Question).where(Question.slug.startswith(PREFIX)))
+    await session.execute(delete(Category).where(Category.slug.startswith(PREFIX)))
+    await session.execute(delete(User).where(User.username.startswith(PREFIX)))
+
+    category_ids = (
+        await session.scalars(
+            insert(Category).returning(Category.id, sort_by_parameter_order=True),
+            dataset.categories,
+        )
+    ).all()
+    question_ids = (
+        await session.scalars(
+            insert(Question).returning(Question.id, sort_by_parameter_order=True),
+            [
+                {
+                    "title": question["title"],
+                    "slug": question["slug"],
+                    "category_id": category_ids[question["category"]],
+                    "views": question["views"],
+                }
+                for question in dataset.questions
+            ],
+        )
+    ).all()
+    await session.execute(
+        insert(Answer),
+        [
+            {**answer, "question_id": question_id}
+            for answer, question_id in zip(dataset.answers, question_ids)
+        ],
+    )
+    hashed_password = PasswordHelper().hash(PASSWORD)
+    user_ids = (
+        await session.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {
+                    **user,
+                    "hashed_password": hashed_password,
+                    "is_active": True,
+                    "is_superuser": False,
+                    "is_verified": True,
+                }
+                for user in dataset.users
+            ],
+        )
+    ).all()
+    await session.execute(
+        insert(Favorite),
+        [
+            {"user_id": user_ids[user], "question_id": question_ids[question]}
+            for user, question in dataset.favorites
+        ],
+    )
+    await session.commit()
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadtest.dataset import Dataset
+from benchmarks.loadtest.scenarios import Recorder, VirtualUser, pick_scenario
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: list[float], rank: int) -> float:
+    """Перцентиль методом ближайшего ранга."""
+    ordered = sorted(values)
+    index = max(int(round(rank / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+async def run_load(
+    transport: httpx.AsyncBaseTransport,
+    base_url: str,
+    dataset: Dataset,
+    duration: float,
+    concurrency: int,
+    seed: int,
+    warmup: float = 0.0,
+) -> tuple[Recorder, float]:
+    """
+    Запускает concurrency посетителей на duration секунд. Запросы, выполненные
+    за первые warmup секунд (прогрев кешей и пулов), в результат не попадают.
+    Возвращает собранные измерения и фактическую длительность замера.
+    """
+    recorder = Recorder()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def visitor(number: int) -> None:
+        async with httpx.AsyncClient(
+            transport=transport, base_url=base_url, timeout=30.0
+        ) as client:
+            local = Recorder()
+            user = VirtualUser(client, dataset, local, seed=seed * 1000 + number)
+            rnd = random.Random(seed * 1000 + number)
+            while time.perf_counter() < deadline:
+                warming = time.perf_counter() < measure_from
+                user.recorder = Recorder() if warming else local
+                await pick_scenario(rnd)(user)
+            recorder.merge(local)
+
+    await asyncio.gather(*(visitor(number) for number in range(concurrency)))
+    return recorder, max(time.perf_counter() - measure_from, 1e-9)
+
+
+def build_report(recorder: Recorder, elapsed: float) -> dict[str, dict[str, float]]:
+    report = {}
+    for step in sorted(recorder.latencies):
+        values = recorder.latencies[step]
+        if not values:
+            continue
+        errors = recorder.errors.get(step, 0)
+        stats = {
+            f"p{rank}_ms": round(percentile(values, rank) * 1000, 2)
+            for rank in PERCENTILES
+        }
+        stats["rps"] = round(len(values) / elapsed, 2)
+        stats["requests"] = len(values)
+        stats["error_rate"] = round(errors / len(values), 4)
+        report[step] = stats
+    return report
+
+
+def format_report(report: dict[str, dict[str, float]]) -> str:
+    lines = [
+        f"{'шаг':<18}{'запросов':>10}{'rps':>10}{'p50, мс':>10}"
+        f"{'p95, мс':>10}{'p99, мс':>10}{'ошибки':>9}"
+    ]
+    for step, stats in report.items():
+        lines.append(
+            f"{step:<18}{stats['requests']:>10}{stats['rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+            f"{stats['error_rate']:>9.2%}"
+        )
+    return "\n".join(lines)
+
+
+def compare(
+    report: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+    max_error_rate: float = 0.01,
+) -> list[str]:
+    """
+    Сравнивает отчет с эталоном. Регрессия - рост перцентиля или падение
+    пропускной способности больше чем на tolerance (доля), а также доля ошибок
+    выше max_error_rate. Шаги, которых нет в эталоне, проверяются только по доле ошибок.
+    """
+    regressions = []
+    for step, stats in report.items():
+        if stats["error_rate"] > max_error_rate:
+            regressions.append(f"{step}: доля ошибок {stats['error_rate']:.2%}")
+        expected = baseline.get(step)
+        if expected is None:
+            continue
+        for rank in PERCENTILES:
+            key = f"p{rank}_ms"
+            limit = expected[key] * (1 + tolerance)
+            if stats[key] > limit:
+                regressions.append(
+                    f"{step}: {key} {stats[key]:.1f} > {limit:.1f} "
+                    f"(эталон {expected[key]:.1f})"
+                )
+        floor = expected["rps"] * (1 - tolerance)
+        if stats["rps"] < floor:
+            regressions.append(
+                f"{step}: rps {stats['rps']:.1f} < {floor:.1f} "
+                f"(эталон {expected['rps']:.1f})"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> dict | None:
+    """Эталон: {"parameters": {...}, "steps": {шаг: метрики}}."""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_baseline(
+    path: Path, report: dict[str, dict[str, float]], parameters: dict
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {"parameters": parameters, "steps": report}, indent=2, ensure_ascii=False
+        )
+        + "\n"
+    )
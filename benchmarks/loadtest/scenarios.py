@@ -0,0 +1,207 @@
+"""
+Сценарии нагрузочного теста. Каждый сценарий - последовательность HTTP-запросов
+одного посетителя; время каждого запроса записывается под своим именем шага,
+поэтому в отчете видно, например, отдельно добавление и удаление избранного.
+"""
+
+import random
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks.loadtest.dataset import PASSWORD, Dataset
+
+
+class Recorder:
+    """Собирает длительности и ошибки запросов по именам шагов."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    async def request(
+        self,
+        step: str,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        expected: tuple[int, ...] = (200,),
+        **kwargs,
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.latencies.setdefault(step, []).append(time.perf_counter() - started)
+        if response is None or response.status_code not in expected:
+            self.errors[step] = self.errors.get(step, 0) + 1
+            return None
+        return response
+
+    def merge(self, other: "Recorder") -> None:
+        for step, values in other.latencies.items():
+            self.latencies.setdefault(step, []).extend(values)
+        for step, count in other.errors.items():
+            self.errors[step] = self.errors.get(step, 0) + count
+
+
+class VirtualUser:
+    """
+    Посетитель со своим генератором случайных чисел: при одинаковом seed
+    последовательность выбранных сценариев и их параметров повторяется.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        dataset: Dataset,
+        recorder: Recorder,
+        seed: int,
+    ) -> None:
+        self.client = client
+        self.dataset = dataset
+        self.recorder = recorder
+        self.rnd = random.Random(seed)
+        self.account = self.rnd.choice(dataset.users)
+        self.bearer: str | None = None
+        self.question_ids: list[int] = []
+
+    def _question_slug(self) -> str:
+        # Популярность вопросов неравномерна: чаще открываются первые.
+        count = len(self.dataset.questions)
+        index = int(self.rnd.paretovariate(1.1)) - 1
+        if index >= count:
+            index = self.rnd.randrange(count)
+        return self.dataset.questions[index]["slug"]
+
+    async def browse_category(self) -> None:
+        category = self.rnd.choice(self.dataset.categories)
+        page = self.rnd.choice([1, 1, 1, 2, 3])
+        await self.recorder.request(
+            "category",
+            self.client,
+            "GET",
+            f"/categories/{category['slug']}",
+            params={"page": page},
+        )
+
+    async def search(self) -> None:
+        await self.recorder.request(
+            "search",
+            self.client,
+            "GET",
+            "/search",
+            params={"q": self.rnd.choice(self.dataset.search_terms)},
+        )
+
+    async def view_question(self) -> None:
+        await self.recorder.request(
+            "question", self.client, "GET", f"/questions/{self._question_slug()}"
+        )
+
+    async def login(self) -> None:
+        client = self.client
+        try:
+            form = await self.recorder.request("login.form", client, "GET", "/login")
+            if form is None:
+                return
+            # Значение скрытого поля формы совпадает с cookie csrf_token.
+            csrf_token = client.cookies.get("csrf_token", "")
+            await self.recorder.request(
+                "login.submit",
+                client,
+                "POST",
+                "/login",
+                expected=(302, 303),
+                data={
+                    "email": self.account["email"],
+                    "password": PASSWORD,
+                    "csrf_token": csrf_token,
+                },
+            )
+        finally:
+            # Остальные сценарии посетитель проходит анонимно.
+            client.cookies.clear()
+
+    async def _authorize(self) -> bool:
+        if self.bearer is not None:
+            return True
+        response = await self.recorder.request(
+            "api.login",
+            self.client,
+            "POST",
+            "/api/auth/jwt/login",
+            data={"username": self.account["email"], "password": PASSWORD},
+        )
+        if response is None:
+            return False
+        self.bearer = response.json()["access_token"]
+        return True
+
+    async def favorites(self) -> None:
+        if not await self._authorize():
+            return
+        headers = {"Authorization": f"Bearer {self.bearer}"}
+        if not self.question_ids:
+            response = await self.recorder.request(
+                "api.questions",
+                self.client,
+                "GET",
+                "/api/questions",
+                params={"limit": 100},
+            )
+            if response is None:
+                return
+            self.question_ids = [item["id"] for item in response.json()["items"]]
+        await self.recorder.request(
+            "favorites.list", self.client, "GET", "/api/favorites", headers=headers
+        )
+        created = await self.recorder.request(
+            "favorites.add",
+            self.client,
+            "POST",
+            "/api/favorites",
+            # Повторное добавление того же вопроса - ожидаемый отказ.
+            expected=(200, 400),
+            headers=headers,
+            json={"question_id": self.rnd.choice(self.question_ids)},
+        )
+        if created is not None and created.status_code == 200:
+            await self.recorder.request(
+                "favorites.remove",
+                self.client,
+                "DELETE",
+                f"/api/favorites/{created.json()['id']}",
+                expected=(204,),
+                headers=headers,
+            )
+
+    async def api_lists(self) -> None:
+        url = self.rnd.choice(["/api/questions", "/api/answers", "/api/categories"])
+        await self.recorder.request(
+            f"api.{url.rsplit('/', 1)[1]}", self.client, "GET", url
+        )
+
+
+Scenario = Callable[[VirtualUser], Awaitable[None]]
+
+# Доли сценариев примерно соответствуют трафику сайта: большинство посетителей
+# анонимно читают каталог, входят и работают с избранным немногие.
+SCENARIOS: dict[str, tuple[Scenario, int]] = {
+    "browse_category": (VirtualUser.browse_category, 30),
+    "view_question": (VirtualUser.view_question, 35),
+    "search": (VirtualUser.search, 15),
+    "api_lists": (VirtualUser.api_lists, 10),
+    "favorites": (VirtualUser.favorites, 7),
+    "login": (VirtualUser.login, 3),
+}
+
+
+def pick_scenario(rnd: random.Random) -> Scenario:
+    scenarios = list(SCENARIOS.values())
+    return rnd.choices(
+        [scenario for scenario, _ in scenarios],
+        weights=[weight for _, weight in scenarios],
+    )[0]
@@ -0,0 +1,195 @@
+"""
+Сравнение двух путей чтения для GET-роутов API: ORM-объекты со
+selectinload + валидация схемой Read + dump_json (прежний путь) и выборка
+столбцов Projection в словари + orjson (путь роутов). Для каждого роута
+проверяется, что JSON совпадает побайтно, и измеряется число операций
+в секунду (запрос к БД и сериализация) для обоих путей.
+
+Работает с БД из настроек приложения (DB__URL) и только читает ее:
+    python -m benchmarks.read_path --duration 5
+
+Завершается с кодом 1, если JSON путей различается или ускорение меньше
+--min-speedup.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.answer.dependencies import (
+    get_answer_by_id,
+    get_answer_row_by_id,
+    get_answers_page,
+    get_answers_page_rows,
+)
+from src.answer.models import Answer
+from src.answer.schemas import AnswerListQuery, AnswerRead
+from src.category.dependencies import (
+    get_categories_page,
+    get_categories_page_rows,
+    get_category_by_id,
+    get_category_row_by_id,
+)
+from src.category.schemas import CategoryListQuery, CategoryRead
+from src.common.projection import dump_json
+from src.common.schemas import CursorPage
+from src.config import settings
+from src.db.database import db_helper
+from src.question.dependencies import (
+    get_question_by_id,
+    get_question_row_by_id,
+    get_questions_page,
+    get_questions_page_rows,
+)
+from src.question.models import Question
+from src.question.schemas import QuestionListQuery, QuestionRead
+
+Fetch = Callable[[AsyncSession], Awaitable[Any]]
+
+
+@dataclass
+class Route:
+    schema: Any
+    orm: Fetch
+    rows: Fetch
+
+
+def build_routes(question_id: int, answer_id: int, category_id: int) -> dict:
+    limit = settings.pagination.api_max_limit
+    questions = QuestionListQuery(limit=limit)
+    newest = QuestionListQuery(limit=limit, order="-id")
+    answers = AnswerListQuery(limit=limit)
+    categories = CategoryListQuery(limit=limit)
+    return {
+        "GET /api/questions": Route(
+            CursorPage[QuestionRead],
+            lambda s: get_questions_page(questions, s),
+            lambda s: get_questions_page_rows(questions, s),
+        ),
+        "GET /api/questions?order=-id": Route(
+            CursorPage[QuestionRead],
+            lambda s: get_questions_page(newest, s),
+            lambda s: get_questions_page_rows(newest, s),
+        ),
+        "GET /api/questions/{id}": Route(
+            QuestionRead,
+            lambda s: get_question_by_id(question_id, s),
+            lambda s: get_question_row_by_id(question_id, s),
+        ),
+        "GET /api/answers": Route(
+            CursorPage[AnswerRead],
+            lambda s: get_answers_page(answers, s),
+            lambda s: get_answers_page_rows(answers, s),
+        ),
+        "GET /api/answers/{id}": Route(
+            AnswerRead,
+            lambda s: get_answer_by_id(answer_id, s),
+            lambda s: get_answer_row_by_id(answer_id, s),
+        ),
+        "GET /api/categories": Route(
+            CursorPage[CategoryRead],
+            lambda s: get_categories_page(categories, s),
+            lambda s: get_categories_page_rows(categories, s),
+        ),
+        "GET /api/categories/{id}": Route(
+            CategoryRead,
+            lambda s: get_category_by_id(category_id, s),
+            lambda s: get_category_row_by_id(category_id, s),
+        ),
+    }
+
+
+async def render_orm(route: Route, session: AsyncSession) -> bytes:
+    adapter = TypeAdapter(route.schema)
+    value = adapter.validate_python(await route.orm(session), from_attributes=True)
+    return adapter.dump_json(value)
+
+
+async def render_rows(route: Route, session: AsyncSession) -> bytes:
+    return dump_json(await route.rows(session))
+
+
+async def throughput(
+    render: Callable[[Route, AsyncSession], Awaitable[bytes]],
+    route: Route,
+    duration: float,
+) -> float:
+    # Новая сессия на каждую операцию, как на каждый запрос к роуту.
+    async with db_helper.session_factory() as session:
+        await render(route, session)  # прогрев
+    operations = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < duration:
+        async with db_helper.session_factory() as session:
+            await render(route, session)
+        operations += 1
+    return operations / elapsed
+
+
+async def main(args: argparse.Namespace) -> int:
+    failures = []
+    try:
+        async with db_helper.session_factory() as session:
+            answer_id, question_id = (
+                await session.execute(
+                    select(Answer.id, Answer.question_id).order_by(Answer.id).limit(1)
+                )
+            ).one()
+            category_id = await session.scalar(
+                select(Question.category_id).where(Question.id == question_id)
+            )
+            total = await session.scalar(select(func.count(Question.id)))
+        print(f"вопросов в БД: {total}")
+        print(f"  {'роут':<34}{'ORM, оп/с':>12}{'столбцы, оп/с':>16}{'ускорение':>11}")
+        for name, route in build_routes(question_id, answer_id, category_id).items():
+            async with db_helper.session_factory() as session:
+                expected = await render_orm(route, session)
+            async with db_helper.session_factory() as session:
+                actual = await render_rows(route, session)
+            if actual != expected:
+                failures.append(f"{name}: JSON отличается")
+                print(f"  {name:<34}JSON отличается")
+                continue
+            orm = await throughput(render_orm, route, args.duration)
+            rows = await throughput(render_rows, route, args.duration)
+            speedup = rows / orm
+            print(f"  {name:<34}{orm:>12.1f}{rows:>16.1f}{speedup:>10.2f}x")
+            if speedup < args.min_speedup:
+                failures.append(f"{name}: ускорение {speedup:.2f}x")
+    finally:
+        await db_helper.dispose()
+
+    if failures:
+        print("Ошибки:")
+        print("\n".join(f"  {line}" for line in failures))
+        return 1
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.read_path",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="секунд на каждый путь роута"
+    )
+    parser.add_argument(
+        "--min-speedup",
+        type=float,
+        default=0.0,
+        help="минимальное ускорение пути столбцов, иначе код 1",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -3,7 +3,7 @@ from typing import Annotated, Sequence
 from fastapi.exceptions import HTTPException
 from fastapi import APIRouter, Request, Depends, status, Form, Query, Path
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from src.common.templates import TimedTemplates
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import RedirectResponse
@@ -40,7 +40,7 @@ from src.auth.fastapi_users import (
 from src.config import settings
 from src.common.dependencies import get_categories, get_all_questions
 
-templates = Jinja2Templates(directory="templates")
+templates = TimedTemplates(directory="templates")
 
 router = APIRouter(prefix=settings.views.prefix_admin, include_in_schema=False)
 
@@ -48,12 +48,13 @@ router = APIRouter(prefix=settings.views.prefix_admin, include_in_schema=False)
 @router.get("", response_class=HTMLResponse)
 async def admin_ui(
     request: Request,
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     superuser: Annotated[User, Depends(current_active_superuser_ui)],
     categories: Sequence[Category] = Depends(get_categories),
     questions: Sequence[Question] = Depends(get_all_questions),
     page: str | None = Query(None),
     page_size: str | None = Query(None),
+    cursor: str | None = Query(None),
     section: str = Query("categories"),
     success_category: str = Query(None),
     category_error: str = Query(None),
@@ -73,24 +74,32 @@ async def admin_ui(
         query_params.page = 1
         query_params.page_size = 9
 
+    # Курсор относится только к списку открытого раздела.
     categories_pagination = await get_all_category_with_pagination(
-        session=session, page=query_params.page, limit=query_params.page_size
+        session=session,
+        page=query_params.page,
+        limit=query_params.page_size,
+        cursor=cursor if section == "categories" else None,
     )
     questions_pagination = await get_all_questions_with_pagination(
         session=session,
         page=query_params.page,
         limit=query_params.page_size,
+        cursor=cursor if section == "questions" else None,
     )
-    total_categories = await get_total_category_count(session=session)
-    total_questions = await get_total_questions_count(session=session)
+    total_pages_categories = None
+    total_pages_questions = None
+    if settings.pagination.count_total:
+        total_categories = await get_total_category_count(session=session)
+        total_questions = await get_total_questions_count(session=session)
 
-    total_pages_categories = (
-        total_categories + query_params.page_size - 1
-    ) // query_params.page_size
+        total_pages_categories = (
+            total_categories + query_params.page_size - 1
+        ) // query_params.page_size
 
-    total_pages_questions = (
-        total_questions + query_params.page_size - 1
-    ) // query_params.page_size
+        total_pages_questions = (
+            total_questions + query_params.page_size - 1
+        ) // query_params.page_size
 
     return templates.TemplateResponse(
         "admin/admin.html",
@@ -213,7 +222,7 @@ async def edite_category(
     request: Request,
     category_id: int,
     superuser: Annotated[User, Depends(current_active_superuser_ui)],
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     categories: Sequence[Category] = Depends(get_categories),
 ):
     if superuser is None:
@@ -263,7 +272,7 @@ async def edit_question(
     request: Request,
     question_id: int,
     superuser: Annotated[User, Depends(current_active_superuser_ui)],
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     categories: Sequence[Category] = Depends(get_categories),
 ):
     if superuser is None:
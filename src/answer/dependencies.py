@@ -1,16 +1,28 @@
-from typing import Sequence
-from sqlalchemy import select
+from typing import AsyncIterator, Sequence
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, joinedload, selectinload
 
-from src.question.dependencies import get_question_by_id
-from src.answer.schemas import AnswerCreate, AnswerUpdate
+from src.common.cache import response_cache
+from src.common.pagination import Page, paginate
+from src.common.projection import Projection, select_fields
+from src.common.schemas import FieldsQuery
+from src.question.dependencies import get_question_by_id, QUESTION_LIST_TAGS
+from src.answer.schemas import AnswerCreate, AnswerUpdate, AnswerListQuery
 from src.answer.models import Answer
+from src.answer.projections import ANSWER_READ
+from src.utils.html import html_to_text
 from fastapi import HTTPException, status
 
 from src.question import Question
 
 
+def set_answer_content(answer: Answer, content: str) -> None:
+    # Текст без разметки считается один раз при записи, а не при каждом ответе API.
+    answer.content = content
+    answer.content_text = html_to_text(content)
+
+
 async def get_answer_by_question_id(
     question_id: int, session: AsyncSession
 ) -> Answer | None:
@@ -29,6 +41,79 @@ async def get_all_answers(session: AsyncSession) -> Sequence[Answer]:
     return result.all()
 
 
+async def get_answers_page(query: AnswerListQuery, session: AsyncSession) -> Page:
+    """
+    Страница ORM-объектов для AnswerRead. Роуты API ее не используют, они
+    читают столбцы через get_answers_page_rows; функция осталась эталоном прежнего пути
+    чтения для benchmarks.read_path и benchmarks.data_access.
+    """
+    stmt = select(Answer).options(
+        selectinload(Answer.question).options(selectinload(Question.category))
+    )
+    if query.category_id is not None:
+        stmt = stmt.join(Answer.question).where(
+            Question.category_id == query.category_id
+        )
+    return await paginate(
+        session=session,
+        stmt=stmt,
+        key_column=Answer.id,
+        limit=query.limit,
+        cursor=query.cursor,
+        descending=query.order == "-id",
+    )
+
+
+def select_answer_rows(projection: Projection, join_question: bool = False) -> Select:
+    # Вопрос и категория присоединяются, только если их столбцы выбраны или
+    # по ним фильтруют; question_id обязателен, и JOIN не отсекает строки.
+    stmt = select(*projection.columns())
+    question = projection.fields.get("question")
+    if join_question or question is not None:
+        stmt = stmt.join(Answer.question)
+    if question is not None and "category" in question.fields:
+        stmt = stmt.join(Question.category)
+    return stmt
+
+
+async def get_answers_page_rows(query: AnswerListQuery, session: AsyncSession) -> Page:
+    """
+    То же, что get_answers_page, но выбираются только столбцы AnswerRead
+    (или поля из ?fields= и ?expand=) одним запросом с JOIN, а элементы
+    страницы - готовые словари.
+    """
+    projection = select_fields(ANSWER_READ, query)
+    stmt = select_answer_rows(projection, join_question=query.category_id is not None)
+    if query.category_id is not None:
+        stmt = stmt.where(Question.category_id == query.category_id)
+    page = await paginate(
+        session=session,
+        stmt=stmt,
+        key_column=Answer.id,
+        limit=query.limit,
+        cursor=query.cursor,
+        descending=query.order == "-id",
+        mappings=True,
+    )
+    page.items = projection.to_dicts(page.items)
+    return page
+
+
+async def stream_all_answers(
+    session: AsyncSession, batch_size: int
+) -> AsyncIterator[Sequence[Answer]]:
+    stmt = (
+        select(Answer)
+        .options(defer(Answer.content))
+        .options(joinedload(Answer.question).joinedload(Question.category))
+        .order_by(Answer.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream_scalars(stmt)
+    async for partition in result.partitions():
+        yield partition
+
+
 async def get_answer_by_id(answer_id: int, session: AsyncSession) -> Answer | None:
     stmt = (
         select(Answer)
@@ -44,6 +129,21 @@ async def get_answer_by_id(answer_id: int, session: AsyncSession) -> Answer | No
     return answer
 
 
+async def get_answer_row_by_id(
+    answer_id: int,
+    session: AsyncSession,
+    selection: FieldsQuery = FieldsQuery(),
+) -> dict:
+    projection = select_fields(ANSWER_READ, selection)
+    stmt = select_answer_rows(projection).where(Answer.id == answer_id)
+    row = (await session.execute(stmt)).mappings().first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Answer not found"
+        )
+    return projection.to_dict(row)
+
+
 async def create_answer(answer_in: AnswerCreate, session: AsyncSession) -> Answer:
     is_question_exist = await get_question_by_id(
         question_id=answer_in.question_id, session=session
@@ -61,10 +161,8 @@ async def create_answer(answer_in: AnswerCreate, session: AsyncSession) -> Answe
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Answer for this question already exists.",
         )
-    new_answer = Answer(
-        content=answer_in.content,
-        question_id=answer_in.question_id,
-    )
+    new_answer = Answer(question_id=answer_in.question_id)
+    set_answer_content(new_answer, answer_in.content)
     session.add(new_answer)
     await session.commit()
     await session.refresh(new_answer)
@@ -75,6 +173,9 @@ async def create_answer(answer_in: AnswerCreate, session: AsyncSession) -> Answe
     )
     result = await session.scalars(stmt)
     answer_with_relations = result.first()
+    await response_cache.invalidate(
+        f"question:{answer_in.question_id}", *QUESTION_LIST_TAGS
+    )
 
     return answer_with_relations
 
@@ -84,8 +185,14 @@ async def update_answer(
 ) -> Answer:
     answer = await get_answer_by_id(answer_id=answer_id, session=session)
     for field, value in answer_in.model_dump(exclude_unset=True).items():
-        setattr(answer, field, value)
+        if field == "content":
+            set_answer_content(answer, value)
+        else:
+            setattr(answer, field, value)
     session.add(answer)
     await session.commit()
     await session.refresh(answer)
+    await response_cache.invalidate(
+        f"answer:{answer.id}", f"question:{answer.question_id}", *QUESTION_LIST_TAGS
+    )
     return answer
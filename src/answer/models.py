@@ -1,4 +1,12 @@
-from sqlalchemy import Integer, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    Integer,
+    Text,
+    ForeignKey,
+    UniqueConstraint,
+    Computed,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.db.base import Base
 from typing import TYPE_CHECKING
@@ -8,10 +16,25 @@ if TYPE_CHECKING:
 
 
 class Answer(Base):
+    __table_args__ = (
+        Index("ix_answers_search_vector", "search_vector", postgresql_using="gin"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    content_text: Mapped[str] = mapped_column(Text, nullable=False, server_default="")
     question_id: Mapped[int] = mapped_column(
         ForeignKey("questions.id", ondelete="CASCADE"), unique=True
     )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', "
+            "regexp_replace(content, '<[^>]+>', ' ', 'g')), 'B') || "
+            "setweight(to_tsvector('english', "
+            "regexp_replace(content, '<[^>]+>', ' ', 'g')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     question: Mapped["Question"] = relationship("Question", back_populates="answer")
@@ -0,0 +1,13 @@
+from src.answer.models import Answer
+from src.common.projection import Projection
+
+ANSWER_READ_NESTED = Projection(
+    # В API отдается текст ответа без HTML, как в AnswerReadText.
+    content=Answer.content_text,
+    question_id=Answer.question_id,
+    id=Answer.id,
+)
+
+from src.question.projections import QUESTION_READ_NESTED
+
+ANSWER_READ = ANSWER_READ_NESTED.extend(question=QUESTION_READ_NESTED)
@@ -1,21 +1,24 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter, Depends, Request, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .dependencies import (
-    get_all_answers,
-    get_answer_by_id,
+    get_answers_page_rows,
+    stream_all_answers,
+    get_answer_row_by_id,
     create_answer,
     update_answer,
 )
 from src.db.database import db_helper
-from .schemas import AnswerRead, AnswerCreate, AnswerUpdate
+from .schemas import AnswerRead, AnswerCreate, AnswerUpdate, AnswerListQuery
 from src.config import settings
 from src.auth.fastapi_users import current_active_superuser
 from src.auth.models import User
-from src.common.dependencies import custom_cache_key_builder
+from src.common.cache import cached, page_tags, query_model_key_builder
+from src.common.schemas import CursorPage, FieldsQuery
+from src.common.export import NDJSON_MEDIA_TYPE, ndjson_response
 
 router = APIRouter(
     prefix=settings.api.prefix_answer,
@@ -23,22 +26,60 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=list[AnswerRead])
-@cache(expire=settings.redis.cache_ttl, key_builder=custom_cache_key_builder)
+def answer_tags(answer: dict) -> list[str]:
+    # Связи, не выбранные через ?fields= и ?expand=, запись кеша не сбрасывают.
+    tags = [f"answer:{answer['id']}"]
+    question = answer.get("question")
+    if question is not None:
+        tags.append(f"question:{question['id']}")
+        if question.get("category") is not None:
+            tags.append(f"category:{question['category']['id']}")
+    return tags
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_answers(request: Request):
+    """Все ответы потоком NDJSON: по одному AnswerRead в строке."""
+    return ndjson_response(
+        request,
+        lambda session: stream_all_answers(session, settings.export.batch_size),
+        AnswerRead,
+    )
+
+
+@router.get("", response_model=CursorPage[AnswerRead])
+@cached(
+    CursorPage[AnswerRead],
+    key_builder=query_model_key_builder,
+    tags=page_tags("list:answers"),
+    validate=False,
+)
 async def get_answers(
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)]
+    query: Annotated[AnswerListQuery, Query()],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ):
-    answers = await get_all_answers(session=session)
-    return answers
+    return await get_answers_page_rows(query=query, session=session)
 
 
 @router.get("/{answer_id}", response_model=AnswerRead)
-@cache(expire=settings.redis.cache_ttl, key_builder=custom_cache_key_builder)
+@cached(
+    AnswerRead,
+    key_builder=query_model_key_builder,
+    tags=answer_tags,
+    validate=False,
+)
 async def get_answer(
     answer_id: int,
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    selection: Annotated[FieldsQuery, Query()],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ):
-    answer = await get_answer_by_id(answer_id=answer_id, session=session)
+    answer = await get_answer_row_by_id(
+        answer_id=answer_id, session=session, selection=selection
+    )
     return answer
 
 
@@ -1,5 +1,8 @@
-from pydantic import BaseModel, ConfigDict, field_validator, field_serializer
-from bs4 import BeautifulSoup
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.common.schemas import CursorQuery, FieldsQuery
 
 
 class AnswerBase(BaseModel):
@@ -16,27 +19,29 @@ class AnswerUpdate(BaseModel):
     question_id: int | None
 
 
+class AnswerListQuery(CursorQuery, FieldsQuery):
+    category_id: int | None = None
+    order: Literal["id", "-id"] = "id"
+
+
 class AnswerReadBase(AnswerBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
 
 
-class AnswerReadNested(AnswerReadBase):
-    @field_serializer("content")
-    def strip_html(self, v):
-        soup = BeautifulSoup(v, "html.parser")
-        return soup.get_text()
+class AnswerReadText(AnswerReadBase):
+    # В API отдается текст ответа без HTML, подготовленный при записи.
+    content: str = Field(validation_alias="content_text")
 
 
-class AnswerRead(AnswerReadBase):
+class AnswerReadNested(AnswerReadText):
+    pass
+
+
+class AnswerRead(AnswerReadText):
     question: "QuestionReadNested"
     model_config = ConfigDict(from_attributes=True)
 
-    @field_serializer("content")
-    def strip_html(self, v):
-        soup = BeautifulSoup(v, "html.parser")
-        return soup.get_text()
-
 
 from src.question.schemas import QuestionReadNested
 
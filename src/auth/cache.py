@@ -0,0 +1,101 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+import orjson
+from redis.exceptions import RedisError
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.auth.models import User
+from src.config import settings
+from src.db.redis import redis_helper
+
+logger = logging.getLogger(__name__)
+
+# hashed_password в кеш не попадает: он нужен только при смене пароля,
+# и там пользователь читается из БД.
+USER_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "is_active",
+    "is_superuser",
+    "is_verified",
+    "token_version",
+)
+
+
+class TokenClaims(NamedTuple):
+    user_id: str
+    version: int
+    expires_at: float
+
+
+class AuthUserCache:
+    """
+    Кеш для определения текущего пользователя без запросов к БД.
+
+    Перед Redis стоит небольшой LRU уже проверенных токенов: повторная проверка
+    подписи JWT не нужна, пока токен не истек. Снимок пользователя хранится
+    в Redis по id не дольше `ttl` секунд и сбрасывается при любом изменении
+    пользователя. Токен действителен, только если его версия совпадает
+    с token_version пользователя: увеличение версии отзывает все выданные токены.
+    """
+
+    def __init__(self, prefix: str, ttl: int, local_max_entries: int) -> None:
+        self.prefix = prefix
+        self.ttl = ttl
+        self.local_max_entries = local_max_entries
+        self._tokens: OrderedDict[str, TokenClaims] = OrderedDict()
+
+    def get_claims(self, token: str) -> TokenClaims | None:
+        claims = self._tokens.get(token)
+        if claims is None:
+            return None
+        if claims.expires_at <= time.time():
+            del self._tokens[token]
+            return None
+        self._tokens.move_to_end(token)
+        return claims
+
+    def set_claims(self, token: str, claims: TokenClaims) -> None:
+        self._tokens[token] = claims
+        self._tokens.move_to_end(token)
+        while len(self._tokens) > self.local_max_entries:
+            self._tokens.popitem(last=False)
+
+    async def get_user(self, user_id: str) -> User | None:
+        try:
+            raw = await redis_helper.client.get(f"{self.prefix}:{user_id}")
+        except RedisError as err:
+            logger.warning("Кеш пользователей недоступен: %s", err)
+            return None
+        if raw is None:
+            return None
+        user = User(**orjson.loads(raw))
+        # Объект считается загруженным из БД: его можно передать в user_manager.update.
+        make_transient_to_detached(user)
+        return user
+
+    async def set_user(self, user: User) -> None:
+        data = {field: getattr(user, field) for field in USER_FIELDS}
+        try:
+            await redis_helper.client.set(
+                f"{self.prefix}:{user.id}", orjson.dumps(data), ex=self.ttl
+            )
+        except RedisError as err:
+            logger.warning("Не удалось сохранить пользователя в кеш: %s", err)
+
+    async def invalidate(self, user_id: int) -> None:
+        try:
+            await redis_helper.client.delete(f"{self.prefix}:{user_id}")
+        except RedisError as err:
+            logger.warning("Не удалось сбросить пользователя в кеше: %s", err)
+
+
+auth_user_cache = AuthUserCache(
+    prefix=settings.auth_cache.prefix,
+    ttl=settings.auth_cache.user_ttl,
+    local_max_entries=settings.auth_cache.local_max_tokens,
+)
@@ -13,6 +13,15 @@ from src.auth.models import User
 async def get_user_db(
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)]
 ):
+    """
+    Пользователи fastapi-users всегда читаются и пишутся в основной БД.
+    Роуты записи делят эту сессию с get_user_db, а роуты чтения берут свою
+    через read_session_getter, и авторизованный запрос чтения открывает две
+    сессии (в DbUsage: sessions=2, read_sessions=1). Это намеренно: найденный
+    пользователь попадает в auth_user_cache, и с отстающей реплики туда
+    попала бы старая token_version, возвращая отозванные выходом токены.
+    Соединение эта сессия берет только при промахе auth_user_cache.
+    """
     yield SQLAlchemyUserDatabase(session, User)
 
 
@@ -1,7 +1,6 @@
 from fastapi_users import FastAPIUsers
 from fastapi_users.authentication import (
     BearerTransport,
-    JWTStrategy,
     AuthenticationBackend,
     CookieTransport,
 )
@@ -9,6 +8,7 @@ from fastapi_users.authentication import (
 from src.config import settings
 from src.auth.models import User
 from src.auth.dependencies import get_user_manager
+from src.auth.strategy import CachedJWTStrategy
 
 
 bearer_transport = BearerTransport(tokenUrl="/api/auth/jwt/login")
@@ -21,8 +21,8 @@ cookie_transport = CookieTransport(
 )
 
 
-def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(
+def get_jwt_strategy() -> CachedJWTStrategy:
+    return CachedJWTStrategy(
         secret=settings.access_token.secret,
         lifetime_seconds=settings.access_token.lifetime_seconds,
     )
@@ -3,7 +3,7 @@ from typing import Annotated, Sequence
 from fastapi import APIRouter, Request, Depends, status, Form, Cookie
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from src.common.templates import TimedTemplates
 from fastapi_users import InvalidPasswordException
 from fastapi_users.exceptions import UserNotExists
 from starlette.responses import RedirectResponse
@@ -18,7 +18,7 @@ from src.common.dependencies import get_categories
 from src.common.csrf import generate_csrf_token, validate_csrf_token
 
 
-templates = Jinja2Templates(directory="templates")
+templates = TimedTemplates(directory="templates")
 
 router = APIRouter(prefix=settings.views.prefix_auth, include_in_schema=False)
 
@@ -60,9 +60,10 @@ async def logout(
     user: Annotated[User, Depends(current_active_user_ui)],
 ):
     strategy = auth_backend_cookie.get_strategy()
-    token = await strategy.read_token(request, user_manager=user_manager)
-    if token:
-        auth_backend_cookie.logout(strategy=strategy, user=user, token=token)
+    token = request.cookies.get(auth_backend_cookie.transport.cookie_name)
+    if token and user:
+        # Увеличивает token_version: выданные ранее токены перестают действовать.
+        await auth_backend_cookie.logout(strategy=strategy, user=user, token=token)
     response = RedirectResponse(url="/", status_code=status.HTTP_302_FOUND)
     response.delete_cookie(
         key=auth_backend_cookie.transport.cookie_name,
@@ -1,10 +1,16 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 import logging
-from fastapi import Request, HTTPException, status
-from fastapi_users import BaseUserManager, IntegerIDMixin, models
+import jwt
+from fastapi import Request
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager, IntegerIDMixin, exceptions, models, schemas
+from fastapi_users.jwt import decode_jwt, generate_jwt
+from src.auth.cache import auth_user_cache
 from src.auth.models import User
+from src.auth.password import PooledPasswordHelper, password_helper
 from src.config import settings
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
+from src.mail.dependencies import enqueue_email
+from src.mail.sender import mail_sender
 
 logger = logging.getLogger(__name__)
 
@@ -12,37 +18,163 @@ logger = logging.getLogger(__name__)
 class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     reset_password_token_secret = settings.access_token.secret
     verification_token_secret = settings.access_token.secret
+    password_helper: PooledPasswordHelper
+
+    # Методы ниже повторяют BaseUserManager, но хешируют и проверяют пароли
+    # через пул потоков password_helper, не блокируя event loop.
+
+    def __init__(self, user_db, password_helper=password_helper) -> None:
+        super().__init__(user_db, password_helper)
+
+    async def create(
+        self,
+        user_create: schemas.UC,
+        safe: bool = False,
+        request: Optional[Request] = None,
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+
+        existing_user = await self.user_db.get_by_email(user_create.email)
+        if existing_user is not None:
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        password = user_dict.pop("password")
+        user_dict["hashed_password"] = await self.password_helper.hash_async(password)
+
+        created_user = await self.user_db.create(user_dict)
+
+        await self.on_after_register(created_user, request)
+
+        return created_user
+
+    async def forgot_password(
+        self, user: User, request: Optional[Request] = None
+    ) -> None:
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        token_data = {
+            "sub": str(user.id),
+            "password_fgpt": await self.password_helper.hash_async(
+                user.hashed_password
+            ),
+            "aud": self.reset_password_token_audience,
+        }
+        token = generate_jwt(
+            token_data,
+            self.reset_password_token_secret,
+            self.reset_password_token_lifetime_seconds,
+        )
+        await self.on_after_forgot_password(user, token, request)
+
+    async def reset_password(
+        self, token: str, password: str, request: Optional[Request] = None
+    ) -> User:
+        try:
+            data = decode_jwt(
+                token,
+                self.reset_password_token_secret,
+                [self.reset_password_token_audience],
+            )
+        except jwt.PyJWTError:
+            raise exceptions.InvalidResetPasswordToken()
+
+        try:
+            user_id = data["sub"]
+            password_fingerprint = data["password_fgpt"]
+        except KeyError:
+            raise exceptions.InvalidResetPasswordToken()
+
+        try:
+            parsed_id = self.parse_id(user_id)
+        except exceptions.InvalidID:
+            raise exceptions.InvalidResetPasswordToken()
+
+        user = await self.get(parsed_id)
+
+        valid_password_fingerprint = await self.password_helper.verify_async(
+            user.hashed_password, password_fingerprint
+        )
+        if not valid_password_fingerprint:
+            raise exceptions.InvalidResetPasswordToken()
+
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        updated_user = await self._update(user, {"password": password})
+
+        await self.on_after_reset_password(user, request)
+
+        return updated_user
+
+    async def authenticate(
+        self, credentials: OAuth2PasswordRequestForm
+    ) -> Optional[User]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Хешируем пароль впустую, чтобы время ответа не выдавало
+            # существование пользователя.
+            await self.password_helper.hash_async(credentials.password)
+            return None
+
+        verified, updated_password_hash = (
+            await self.password_helper.verify_and_update_async(
+                credentials.password, user.hashed_password
+            )
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+
+        return user
+
+    async def _update(self, user: User, update_dict: Dict[str, Any]) -> User:
+        update_dict = dict(update_dict)
+        password = update_dict.pop("password", None)
+        if password is not None:
+            await self.validate_password(password, user)
+            # Передаем в базовый _update уже готовый хеш: поля, отличные от
+            # email и password, он сохраняет как есть.
+            update_dict["hashed_password"] = await self.password_helper.hash_async(
+                password
+            )
+        if (
+            password is not None
+            or update_dict.get("email", user.email) != user.email
+            or update_dict.get("is_active") is False
+        ):
+            # Смена учетных данных или деактивация отзывает выданные токены.
+            update_dict["token_version"] = User.token_version + 1
+        updated_user = await super()._update(user, update_dict)
+        await auth_user_cache.invalidate(updated_user.id)
+        return updated_user
 
     async def on_after_register(
         self, user: User, request: Optional[Request] = None
     ) -> None:
         logger.info("Пользователь %s успешно зарегистрирован.", user.email)
 
+    async def on_after_delete(
+        self, user: User, request: Optional[Request] = None
+    ) -> None:
+        await auth_user_cache.invalidate(user.id)
+
     async def on_after_forgot_password(
         self, user: models.UP, token: str, request: Optional[Request] = None
     ) -> None:
         reset_url = f"{request.url.scheme}://{request.url.hostname}/password-reset-confirm?token={token}"
-        message = MessageSchema(
+        # Письмо только ставится в очередь, отправкой занимается mail_sender.
+        await enqueue_email(
+            self.user_db.session,
+            recipient=user.email,
             subject="Сброс пароля",
-            recipients=[user.email],
             body=f"Чтобы сбросить пароль, перейдите по ссылке: {reset_url}",
-            subtype="plain",
         )
-        fm_conf = ConnectionConfig(
-            MAIL_USERNAME=settings.mail.username,
-            MAIL_PASSWORD=settings.mail.password,
-            MAIL_FROM=settings.mail.from_mail,
-            MAIL_PORT=settings.mail.port,
-            MAIL_SERVER=settings.mail.server,
-            MAIL_STARTTLS=settings.mail.tls,
-            MAIL_SSL_TLS=settings.mail.ssl,
-            USE_CREDENTIALS=settings.mail.use_credentials,
-            VALIDATE_CERTS=settings.mail.validate_certs,
-            MAIL_FROM_NAME=settings.mail.from_mail_name,
-        )
-        fm = FastMail(fm_conf)
-        try:
-            await fm.send_message(message)
-        except Exception as err:
-            logger.error("Ошибка: %s", err)
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        mail_sender.wake()
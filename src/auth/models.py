@@ -16,6 +16,9 @@ class User(Base, SQLAlchemyBaseUserTable[int]):
     is_active: Mapped[bool] = mapped_column(default=True)
     is_superuser: Mapped[bool] = mapped_column(default=False)
     is_verified: Mapped[bool] = mapped_column(default=False)
+    token_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     favorites: Mapped[List["Favorite"]] = relationship(
         "Favorite", back_populates="user"
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+from fastapi_users.password import PasswordHelper
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PooledPasswordHelper(PasswordHelper):
+    """
+    Хеширование и проверка паролей (argon2/bcrypt) в отдельном пуле потоков,
+    чтобы не блокировать event loop. argon2-cffi и bcrypt отпускают GIL,
+    поэтому потоки работают параллельно.
+
+    Одновременно выполняется не больше `max_workers` операций, остальные ждут
+    в очереди не дольше `queue_timeout` секунд, после чего получают 503.
+    Синхронные методы базового класса остаются доступными для кода вне event loop.
+    """
+
+    def __init__(self, max_workers: int, queue_timeout: float) -> None:
+        super().__init__()
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher",
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        # Семафор создается лениво: он привязывается к текущему event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Очередь на хеширование паролей переполнена (ожидание > %s с).",
+                self.queue_timeout,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), partial(func, *args)
+            )
+        finally:
+            self._semaphore.release()
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run(self.hash, password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(self.verify_and_update, plain_password, hashed_password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        verified, _ = await self.verify_and_update_async(
+            plain_password, hashed_password
+        )
+        return verified
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_helper = PooledPasswordHelper(
+    max_workers=settings.password_hashing.max_workers,
+    queue_timeout=settings.password_hashing.queue_timeout,
+)
@@ -0,0 +1,94 @@
+from typing import Optional
+
+import jwt
+from fastapi_users import exceptions
+from fastapi_users.authentication import JWTStrategy
+from fastapi_users.jwt import decode_jwt, generate_jwt
+from fastapi_users.manager import BaseUserManager
+from sqlalchemy import update
+
+from src.auth.cache import TokenClaims, auth_user_cache
+from src.auth.models import User
+from src.db.database import db_helper
+from src.monitoring.timing import measure
+
+
+class CachedJWTStrategy(JWTStrategy[User, int]):
+    """
+    JWT с версией пользователя в claim `ver`.
+    Проверенные токены и пользователи берутся из auth_user_cache, поэтому
+    для активной сессии определение пользователя не обращается к БД.
+    Выход увеличивает token_version и тем самым отзывает токены пользователя.
+    """
+
+    def _decode(self, token: str) -> TokenClaims | None:
+        claims = auth_user_cache.get_claims(token)
+        if claims is not None:
+            return claims
+        try:
+            data = decode_jwt(
+                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+            )
+        except jwt.PyJWTError:
+            return None
+        user_id = data.get("sub")
+        if user_id is None:
+            return None
+        claims = TokenClaims(
+            user_id=user_id,
+            # Токены, выданные до появления версий, соответствуют версии 0.
+            version=data.get("ver", 0),
+            expires_at=data.get("exp", float("inf")),
+        )
+        auth_user_cache.set_claims(token, claims)
+        return claims
+
+    async def read_token(
+        self, token: Optional[str], user_manager: BaseUserManager[User, int]
+    ) -> Optional[User]:
+        with measure("auth"):
+            return await self._read_token(token, user_manager)
+
+    async def _read_token(
+        self, token: Optional[str], user_manager: BaseUserManager[User, int]
+    ) -> Optional[User]:
+        if token is None:
+            return None
+
+        claims = self._decode(token)
+        if claims is None:
+            return None
+
+        user = await auth_user_cache.get_user(claims.user_id)
+        if user is None:
+            try:
+                parsed_id = user_manager.parse_id(claims.user_id)
+                user = await user_manager.get(parsed_id)
+            except (exceptions.UserNotExists, exceptions.InvalidID):
+                return None
+            await auth_user_cache.set_user(user)
+
+        if user.token_version != claims.version:
+            return None
+        return user
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            "sub": str(user.id),
+            "ver": user.token_version,
+            "aud": self.token_audience,
+        }
+        return generate_jwt(
+            data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm
+        )
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        stmt = (
+            update(User)
+            .where(User.id == user.id)
+            .values(token_version=User.token_version + 1)
+        )
+        async with db_helper.session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+        await auth_user_cache.invalidate(user.id)
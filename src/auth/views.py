@@ -2,7 +2,7 @@ from typing import Annotated, Sequence
 
 from fastapi import APIRouter, Request, Depends, status, Form
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from src.common.templates import TimedTemplates
 from fastapi_users import InvalidPasswordException
 from fastapi_users.exceptions import (
     UserNotExists,
@@ -21,7 +21,7 @@ from src.config import settings
 from src.common.dependencies import get_categories
 
 
-templates = Jinja2Templates(directory="templates")
+templates = TimedTemplates(directory="templates")
 
 router = APIRouter(prefix=settings.views.prefix_auth, include_in_schema=False)
 
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Sequence
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from src.category.models import Category
+from src.category.schemas import CategoryRead
+from src.config import settings
+from src.db.database import db_helper
+from src.db.redis import redis_helper
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryCatalog:
+    """
+    Снимок категорий в памяти воркера. Используется для навигации на всех
+    страницах, чтобы не ходить в БД на каждый запрос. После изменения
+    категорий снимок сбрасывается во всех воркерах через Redis pub/sub.
+    """
+
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self._categories: list[CategoryRead] | None = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+        self._listener: asyncio.Task | None = None
+
+    async def get(self) -> Sequence[CategoryRead]:
+        categories = self._categories
+        if categories is not None:
+            return categories
+        async with self._lock:
+            if self._categories is None:
+                await self.load()
+            return self._categories
+
+    async def load(self) -> None:
+        version = self._version
+        # Снимок живет до следующего сброса, поэтому читается из основной БД:
+        # реплика сразу после изменения категорий может его еще не видеть.
+        async with db_helper.primary_session() as session:
+            result = await session.scalars(select(Category).order_by(Category.id))
+            categories = [CategoryRead.model_validate(c) for c in result.all()]
+        # Пока шла загрузка, снимок мог быть сброшен другим запросом.
+        if version == self._version:
+            self._categories = categories
+
+    def reset(self) -> None:
+        self._version += 1
+        self._categories = None
+
+    async def invalidate(self) -> None:
+        self.reset()
+        try:
+            await redis_helper.client.publish(self.channel, "invalidate")
+        except RedisError as err:
+            logger.error("Не удалось разослать сброс кеша категорий: %s", err)
+
+    async def start(self) -> None:
+        try:
+            await self.load()
+        except Exception as err:
+            logger.error("Не удалось загрузить категории при старте: %s", err)
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _listen(self) -> None:
+        await redis_helper.listen(
+            self.channel,
+            on_message=lambda _: self.reset(),
+            on_subscribe=self.reset,
+        )
+
+
+category_catalog = CategoryCatalog(channel=settings.redis.category_channel)
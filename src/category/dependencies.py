@@ -5,10 +5,24 @@ from sqlalchemy import select, func, desc, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.category.cache import category_catalog
+from src.common.cache import response_cache
+from src.common.pagination import Page, paginate
+from src.common.projection import select_fields
+from src.common.schemas import FieldsQuery
+from src.search.dependencies import question_search_filter
 from src.question.models import Question
-from src.category.schemas import CategoryCreate, CategoryUpdate
+from src.category.schemas import CategoryCreate, CategoryUpdate, CategoryListQuery
 from fastapi import HTTPException, status
 from src.category.models import Category
+from src.category.projections import CATEGORY_READ
+
+# Категория встроена в ответы со списками вопросов и ответов.
+CATEGORY_LIST_TAGS = (
+    "list:categories",
+    "list:questions",
+    "list:answers",
+)
 
 
 async def get_all_category(session: AsyncSession) -> Sequence[Category]:
@@ -17,13 +31,60 @@ async def get_all_category(session: AsyncSession) -> Sequence[Category]:
     return result.all()
 
 
+async def get_categories_page(query: CategoryListQuery, session: AsyncSession) -> Page:
+    """
+    Страница ORM-объектов для CategoryRead. Роуты API ее не используют, они
+    читают столбцы через get_categories_page_rows; функция осталась эталоном прежнего пути
+    чтения для benchmarks.read_path и benchmarks.data_access.
+    """
+    return await paginate(
+        session=session,
+        stmt=select(Category),
+        key_column=Category.id,
+        limit=query.limit,
+        cursor=query.cursor,
+        descending=False,
+        sort_column=Category.name if query.order == "name" else None,
+    )
+
+
+async def get_categories_page_rows(
+    query: CategoryListQuery, session: AsyncSession
+) -> Page:
+    """
+    То же, что get_categories_page, но выбираются только столбцы CategoryRead
+    (или поля из ?fields=), а элементы страницы - готовые словари.
+    """
+    projection = select_fields(CATEGORY_READ, query)
+    page = await paginate(
+        session=session,
+        stmt=select(*projection.columns()),
+        key_column=Category.id,
+        limit=query.limit,
+        cursor=query.cursor,
+        descending=False,
+        sort_column=Category.name if query.order == "name" else None,
+        mappings=True,
+    )
+    page.items = projection.to_dicts(page.items)
+    return page
+
+
 async def get_all_category_with_pagination(
-    session: AsyncSession, page: int = 1, limit: int = 9
-) -> Sequence[Category]:
-    offset = (page - 1) * limit
-    stmt = select(Category).order_by(Category.id).offset(offset).limit(limit)
-    result = await session.scalars(stmt)
-    return result.all()
+    session: AsyncSession,
+    page: int = 1,
+    limit: int = 9,
+    cursor: str | None = None,
+) -> Page:
+    return await paginate(
+        session=session,
+        stmt=select(Category),
+        key_column=Category.id,
+        limit=limit,
+        page=page,
+        cursor=cursor,
+        descending=False,
+    )
 
 
 async def get_total_category_count(session: AsyncSession):
@@ -45,6 +106,21 @@ async def get_category_by_id(
     return category
 
 
+async def get_category_row_by_id(
+    category_id: int,
+    session: AsyncSession,
+    selection: FieldsQuery = FieldsQuery(),
+) -> dict:
+    projection = select_fields(CATEGORY_READ, selection)
+    stmt = select(*projection.columns()).where(Category.id == category_id)
+    row = (await session.execute(stmt)).mappings().first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Category not found."
+        )
+    return projection.to_dict(row)
+
+
 async def get_category_by_id_view(
     category_id: int, session: AsyncSession
 ) -> Category | None:
@@ -79,6 +155,8 @@ async def create_category(
     session.add(new_category)
     await session.commit()
     await session.refresh(new_category)
+    await category_catalog.invalidate()
+    await response_cache.invalidate("list:categories")
     return new_category
 
 
@@ -99,23 +177,30 @@ async def update_category(
     session.add(category)
     await session.commit()
     await session.refresh(category)
+    await category_catalog.invalidate()
+    await response_cache.invalidate(f"category:{category.id}", *CATEGORY_LIST_TAGS)
     return category
 
 
 async def get_questions_by_category_id(
     category_id: int,
     session: AsyncSession,
-    offset: int = 0,
+    page: int = 1,
     limit: int = 9,
+    cursor: str | None = None,
     search: str | None = None,
-) -> Sequence[Question]:
+) -> Page:
     stmt = select(Question).where(Question.category_id == category_id)
     if search:
-        search_term = f"%{search}%"
-        stmt = stmt.where(Question.title.ilike(search_term))
-    stmt = stmt.order_by(desc(Question.id)).offset(offset).limit(limit)
-    result = await session.scalars(stmt)
-    return result.all()
+        stmt = stmt.where(question_search_filter(search))
+    return await paginate(
+        session=session,
+        stmt=stmt,
+        key_column=Question.id,
+        limit=limit,
+        page=page,
+        cursor=cursor,
+    )
 
 
 async def get_questions_count_by_category_id(
@@ -129,8 +214,7 @@ async def get_questions_count_by_category_id(
         .where(Question.category_id == category_id)
     )
     if search:
-        search_term = f"%{search}%"
-        stmt = stmt.where(Question.title.ilike(search_term))
+        stmt = stmt.where(question_search_filter(search))
     result = await session.execute(stmt)
     total = result.scalar_one()
     return total
@@ -156,4 +240,6 @@ async def delete_category_by_id(category_id: int, session: AsyncSession):
         )
     await session.delete(category)
     await session.commit()
+    await category_catalog.invalidate()
+    await response_cache.invalidate(f"category:{category_id}", "list:categories")
     return category
@@ -0,0 +1,9 @@
+from src.category.models import Category
+from src.common.projection import Projection
+
+CATEGORY_READ = Projection(
+    name=Category.name,
+    description=Category.description,
+    id=Category.id,
+    slug=Category.slug,
+)
@@ -1,22 +1,22 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from . import Category
 from .dependencies import (
-    get_all_category,
-    get_category_by_id,
+    get_categories_page_rows,
+    get_category_row_by_id,
     create_category,
     update_category,
     delete_category_by_id,
 )
 from src.db.database import db_helper
-from .schemas import CategoryRead, CategoryUpdate, CategoryCreate
+from .schemas import CategoryRead, CategoryUpdate, CategoryCreate, CategoryListQuery
 from src.config import settings
 from src.auth.models import User
 from src.auth.fastapi_users import current_active_superuser
-from src.common.dependencies import custom_cache_key_builder
-from fastapi_cache.decorator import cache
+from src.common.cache import cached, page_tags, query_model_key_builder
+from src.common.schemas import CursorPage, FieldsQuery
 
 router = APIRouter(
     prefix=settings.api.prefix_category,
@@ -24,22 +24,35 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=list[CategoryRead])
-@cache(expire=settings.redis.cache_ttl, key_builder=custom_cache_key_builder)
+@router.get("", response_model=CursorPage[CategoryRead])
+@cached(
+    CursorPage[CategoryRead],
+    key_builder=query_model_key_builder,
+    tags=page_tags("list:categories"),
+    validate=False,
+)
 async def get_categories(
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)]
+    query: Annotated[CategoryListQuery, Query()],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ):
-    categories = await get_all_category(session=session)
-    return categories
+    return await get_categories_page_rows(query=query, session=session)
 
 
 @router.get("/{category_id}", response_model=CategoryRead)
-@cache(expire=settings.redis.cache_ttl, key_builder=custom_cache_key_builder)
+@cached(
+    CategoryRead,
+    key_builder=query_model_key_builder,
+    tags=lambda category: [f"category:{category['id']}"],
+    validate=False,
+)
 async def get_category(
     category_id: int,
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    selection: Annotated[FieldsQuery, Query()],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ):
-    category = await get_category_by_id(category_id=category_id, session=session)
+    category = await get_category_row_by_id(
+        category_id=category_id, session=session, selection=selection
+    )
     return category
 
 
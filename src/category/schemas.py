@@ -1,5 +1,9 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict
 
+from src.common.schemas import CursorQuery, FieldsQuery
+
 
 class CategoryBase(BaseModel):
     name: str
@@ -16,6 +20,10 @@ class CategoryUpdate(CategoryBase):
     slug: str | None = None
 
 
+class CategoryListQuery(CursorQuery, FieldsQuery):
+    order: Literal["id", "name"] = "id"
+
+
 class CategoryRead(CategoryBase):
     id: int
     name: str
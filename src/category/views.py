@@ -4,6 +4,7 @@ from math import ceil
 
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.common.pagination import decode_cursor, encode_cursor
 from src.common.schemas import PaginationQuery
 from . import Category
 from .dependencies import (
@@ -16,36 +17,72 @@ from src.config import settings
 from src.auth.models import User
 from src.auth.fastapi_users import current_active_user_ui
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from src.common.templates import TimedTemplates
 from src.common.dependencies import get_categories
+from src.common.cache import cached_page
 
-templates = Jinja2Templates(directory="templates")
+templates = TimedTemplates(directory="templates")
 
 router = APIRouter(
     prefix=settings.views.prefix_category,
 )
 
 
+def pagination_params(page: str | None, page_size: str | None) -> PaginationQuery:
+    try:
+        return PaginationQuery(page=page, page_size=page_size)
+    except ValidationError:
+        return PaginationQuery()
+
+
+def category_page_query(request: Request) -> tuple | None:
+    # Кешируются только канонические страницы: без поиска и с курсором,
+    # который разобрался. Номер и размер страницы приводятся к тем, что
+    # страница покажет, а произвольные строки идут мимо кеша, иначе каждая
+    # создавала бы свою запись.
+    params = request.query_params
+    if params.get("search"):
+        return None
+    cursor = params.get("cursor")
+    position = decode_cursor(cursor)
+    if cursor and position is None:
+        return None
+    pagination = pagination_params(params.get("page"), params.get("page_size"))
+    cursor = encode_cursor(*position) if position is not None else None
+    return pagination.page, pagination.page_size, cursor
+
+
+def category_page_tags(context: dict) -> list[str] | None:
+    category = context.get("category")
+    if category is None:
+        return None
+    # Страницы за последней не кешируются: таких номеров без предела.
+    total_pages = context["total_pages"]
+    if not context["questions"] or (
+        total_pages is not None and context["page"] > total_pages
+    ):
+        return None
+    return [f"category:{category.id}", "list:questions", "list:categories"]
+
+
 @router.get("/{slug}", response_class=HTMLResponse)
+@cached_page(
+    expire=settings.cache.page_category_ttl,
+    tags=category_page_tags,
+    query=category_page_query,
+)
 async def view_single_category(
     request: Request,
     slug: str,
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     user: Annotated[User, Depends(current_active_user_ui)] = None,
     categories: Sequence[Category] = Depends(get_categories),
     page: str | None = Query(None),
     page_size: str | None = Query(None),
+    cursor: str | None = Query(None),
     search: str | None = Query(""),
 ):
-    query_params: PaginationQuery = PaginationQuery()
-    try:
-        query_params = PaginationQuery(
-            page=page,
-            page_size=page_size,
-        )
-    except ValidationError:
-        query_params.page = 1
-        query_params.page_size = 9
+    query_params = pagination_params(page, page_size)
 
     category = await get_category_by_slug(slug=slug, session=session)
     if category is None:
@@ -58,31 +95,35 @@ async def view_single_category(
                 "categories": categories,
             },
         )
-    offset = (query_params.page - 1) * query_params.page_size
-    questions = await get_questions_by_category_id(
+    questions_page = await get_questions_by_category_id(
         category_id=category.id,
         session=session,
-        offset=offset,
+        page=query_params.page,
         limit=query_params.page_size,
+        cursor=cursor,
         search=search,
     )
-    total_questions = await get_questions_count_by_category_id(
-        category_id=category.id,
-        session=session,
-        search=search,
-    )
-    total_pages = ceil(total_questions / query_params.page_size)
+    total_pages = None
+    if settings.pagination.count_total:
+        total_questions = await get_questions_count_by_category_id(
+            category_id=category.id,
+            session=session,
+            search=search,
+        )
+        total_pages = ceil(total_questions / query_params.page_size)
     return templates.TemplateResponse(
         "category_detail.html",
         {
             "request": request,
             "category": category,
-            "questions": questions,
+            "questions": questions_page.items,
             "user": user,
             "categories": categories,
             "page": query_params.page,
             "page_size": query_params.page_size,
             "total_pages": total_pages,
+            "next_cursor": questions_page.next_cursor,
+            "prev_cursor": questions_page.prev_cursor,
             "search_query": search,
         },
     )
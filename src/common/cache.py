@@ -0,0 +1,665 @@
+import asyncio
+import hashlib
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, NamedTuple, Tuple
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.fastapi_users import cookie_transport
+from src.common.projection import dump_json
+from src.config import settings
+from src.db.database import db_helper
+from src.db.redis import redis_helper
+from src.monitoring.metrics import CACHE_REQUESTS
+from src.monitoring.timing import measure
+
+logger = logging.getLogger(__name__)
+
+# Заголовок записи в Redis (два времени и ETag) заведомо короче этого.
+REMOTE_HEADER_MAX_BYTES = 127
+
+# Вычисляет содержимое записи и ее теги; None вместо тегов - не кешировать.
+Compute = Callable[[], Awaitable[tuple[bytes, Iterable[str] | None]]]
+
+
+def custom_cache_key_builder(
+    func,
+    namespace: str = "",
+    *,
+    request: Request = None,
+    response: Response = None,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> str:
+    return ":".join(
+        [
+            namespace,
+            request.method.lower(),
+            request.url.path,
+            repr(sorted(request.query_params.items())),
+        ]
+    )
+
+
+def query_model_key_builder(
+    func,
+    namespace: str = "",
+    *,
+    request: Request = None,
+    response: Response = None,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> str:
+    """
+    Ключ из провалидированных моделей параметров вместо сырой строки запроса:
+    лишние параметры и разные записи одних значений не создают новых записей.
+    None - не кешировать: в модели задано поле из ее uncached_fields.
+    """
+    for value in kwargs.values():
+        if isinstance(value, BaseModel) and any(
+            getattr(value, name) is not None
+            for name in getattr(value, "uncached_fields", ())
+        ):
+            return None
+    params = [
+        value.model_dump_json(exclude_defaults=True)
+        for _, value in sorted(kwargs.items())
+        if isinstance(value, BaseModel)
+    ]
+    return ":".join([namespace, request.method.lower(), request.url.path, *params])
+
+
+class CacheEntry(NamedTuple):
+    content: bytes
+    fresh_until: float
+    stale_until: float
+    # Валидаторы для условных запросов; None - ответ не кешируется.
+    etag: str | None = None
+    last_modified: float = 0.0
+
+
+class CacheValidators(NamedTuple):
+    etag: str
+    last_modified: float
+
+
+def make_etag(content: bytes) -> str:
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+class ResponseCache:
+    """
+    Двухуровневый кеш ответов: ограниченный LRU в памяти воркера перед Redis.
+    Одновременные промахи по одному ключу вычисляются один раз, а устаревшая
+    запись продолжает отдаваться, пока один воркер ее обновляет.
+    Записи помечаются тегами сущностей (question:1, list:questions), по
+    которым их сбрасывают при изменениях; сброс рассылается всем воркерам.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        channel: str,
+        local_max_entries: int,
+        local_max_bytes: int,
+        stale_ttl: int,
+        refresh_lock_ttl: int,
+    ) -> None:
+        self.prefix = prefix
+        self.channel = channel
+        self.local_max_entries = local_max_entries
+        self.local_max_bytes = local_max_bytes
+        self.stale_ttl = stale_ttl
+        self.refresh_lock_ttl = refresh_lock_ttl
+        self._local: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._local_bytes = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._refreshing: dict[str, asyncio.Future] = {}
+        # Увеличивается при каждом сбросе, чтобы не сохранять результат,
+        # вычисление которого началось до сброса.
+        self._generation = 0
+        self._listener: asyncio.Task | None = None
+
+    async def get_or_compute(
+        self,
+        key: str,
+        expire: int,
+        compute: Compute,
+        namespace: str = "default",
+    ) -> CacheEntry:
+        now = time.time()
+        entry = self._get_local(key, now)
+        if entry is None or entry.fresh_until <= now:
+            # Другой воркер мог уже обновить запись в Redis.
+            remote = await self._get_remote(key, now)
+            if remote is not None and (
+                entry is None or remote.fresh_until > entry.fresh_until
+            ):
+                entry = remote
+                self._set_local(key, entry)
+        if entry is not None:
+            if entry.fresh_until <= now:
+                CACHE_REQUESTS.labels(namespace, "stale").inc()
+                self._schedule_refresh(key, expire, compute, entry)
+            else:
+                CACHE_REQUESTS.labels(namespace, "hit").inc()
+            return entry
+        CACHE_REQUESTS.labels(namespace, "miss").inc()
+        return await self._singleflight(key, expire, compute)
+
+    async def validators(self, key: str) -> CacheValidators | None:
+        """
+        ETag и время создания свежей записи без чтения ее содержимого:
+        из памяти воркера или заголовком записи в Redis (GETRANGE).
+        """
+        now = time.time()
+        entry = self._get_local(key, now)
+        if entry is not None and entry.fresh_until > now:
+            return CacheValidators(entry.etag, entry.last_modified)
+        try:
+            with measure("cache"):
+                raw = await redis_helper.client.getrange(
+                    f"{self.prefix}:{key}", 0, REMOTE_HEADER_MAX_BYTES
+                )
+        except RedisError as err:
+            logger.warning("Кеш ответов недоступен: %s", err)
+            return None
+        header = self._parse_header(raw.partition(b"\n")[0]) if raw else None
+        if header is None or header[0] <= now:
+            return None
+        _, last_modified, etag = header
+        return CacheValidators(etag, last_modified)
+
+    def _get_local(self, key: str, now: float) -> CacheEntry | None:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        if entry.stale_until <= now:
+            self._pop_local(key)
+            return None
+        self._local.move_to_end(key)
+        return entry
+
+    def _set_local(self, key: str, entry: CacheEntry) -> None:
+        if len(entry.content) > self.local_max_bytes:
+            return
+        self._pop_local(key)
+        self._local[key] = entry
+        self._local_bytes += len(entry.content)
+        while (
+            len(self._local) > self.local_max_entries
+            or self._local_bytes > self.local_max_bytes
+        ):
+            _, evicted = self._local.popitem(last=False)
+            self._local_bytes -= len(evicted.content)
+
+    def _pop_local(self, key: str) -> None:
+        entry = self._local.pop(key, None)
+        if entry is not None:
+            self._local_bytes -= len(entry.content)
+
+    async def _get_remote(self, key: str, now: float) -> CacheEntry | None:
+        try:
+            with measure("cache"):
+                raw = await redis_helper.client.get(f"{self.prefix}:{key}")
+        except RedisError as err:
+            logger.warning("Кеш ответов недоступен: %s", err)
+            return None
+        if raw is None:
+            return None
+        header, _, content = raw.partition(b"\n")
+        parsed = self._parse_header(header)
+        if parsed is None:
+            return None
+        fresh_until, last_modified, etag = parsed
+        return CacheEntry(
+            content, fresh_until, fresh_until + self.stale_ttl, etag, last_modified
+        )
+
+    @staticmethod
+    def _parse_header(header: bytes) -> tuple[float, float, str] | None:
+        # "<fresh_until> <last_modified> <etag>" перед содержимым записи.
+        try:
+            fresh_until, last_modified, etag = header.decode().split(" ")
+            return float(fresh_until), float(last_modified), etag
+        except (UnicodeDecodeError, ValueError):
+            return None
+
+    async def _store(
+        self, key: str, expire: int, entry: CacheEntry, tags: Iterable[str]
+    ) -> None:
+        ttl = expire + self.stale_ttl
+        self._set_local(key, entry)
+        try:
+            with measure("cache"):
+                await self._write_remote(key, ttl, entry, tags)
+        except RedisError as err:
+            logger.warning("Не удалось сохранить ответ в кеш: %s", err)
+
+    async def _write_remote(
+        self,
+        key: str,
+        ttl: int,
+        entry: CacheEntry,
+        tags: Iterable[str],
+    ) -> None:
+        header = f"{entry.fresh_until} {entry.last_modified} {entry.etag}\n"
+        async with redis_helper.client.pipeline(transaction=False) as pipe:
+            pipe.set(f"{self.prefix}:{key}", header.encode() + entry.content, ex=ttl)
+            for tag in tags:
+                tag_key = f"{self.prefix}:tag:{tag}"
+                pipe.sadd(tag_key, key)
+                # Набор тега живет не меньше самой долгой записи в нем.
+                pipe.expire(tag_key, ttl, nx=True)
+                pipe.expire(tag_key, ttl, gt=True)
+            await pipe.execute()
+
+    async def _compute_and_store(
+        self,
+        key: str,
+        expire: int,
+        compute: Compute,
+        previous: CacheEntry | None = None,
+    ) -> CacheEntry:
+        generation = self._generation
+        content, tags = await compute()
+        now = time.time()
+        fresh_until = now + expire
+        if tags is None:
+            return CacheEntry(content, fresh_until, fresh_until + self.stale_ttl)
+        etag = make_etag(content)
+        if previous is not None and previous.etag == etag:
+            # Содержимое не изменилось: Last-Modified остается прежним, иначе
+            # If-Modified-Since переставал бы совпадать после каждого обновления.
+            last_modified = previous.last_modified
+        else:
+            # Last-Modified передается с точностью до секунды.
+            last_modified = float(int(now))
+        entry = CacheEntry(
+            content, fresh_until, fresh_until + self.stale_ttl, etag, last_modified
+        )
+        if generation == self._generation:
+            await self._store(key, expire, entry, tags)
+        return entry
+
+    async def invalidate(self, *tags: str) -> None:
+        self._generation += 1
+        tag_keys = [f"{self.prefix}:tag:{tag}" for tag in tags]
+        try:
+            async with redis_helper.client.pipeline(transaction=True) as pipe:
+                pipe.sunion(*tag_keys)
+                pipe.delete(*tag_keys)
+                members, _ = await pipe.execute()
+            keys = [member.decode() for member in members]
+            if keys:
+                await redis_helper.client.delete(
+                    *(f"{self.prefix}:{key}" for key in keys)
+                )
+            self._drop_local(keys)
+            await redis_helper.client.publish(self.channel, orjson.dumps(keys))
+        except RedisError as err:
+            logger.error("Не удалось сбросить кеш по тегам %s: %s", tags, err)
+            self.clear_local()
+
+    def clear_local(self) -> None:
+        self._generation += 1
+        self._local.clear()
+        self._local_bytes = 0
+
+    def _drop_local(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._pop_local(key)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(
+                redis_helper.listen(
+                    self.channel,
+                    on_message=self._on_invalidate,
+                    on_subscribe=self.clear_local,
+                )
+            )
+
+    async def stop(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    def _on_invalidate(self, data: bytes) -> None:
+        self._generation += 1
+        try:
+            keys = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            self.clear_local()
+            return
+        self._drop_local(keys)
+
+    async def _singleflight(
+        self,
+        key: str,
+        expire: int,
+        compute: Compute,
+    ) -> CacheEntry:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._compute_and_store(key, expire, compute)
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield не дает отмене одного клиента прервать вычисление для остальных.
+        return await asyncio.shield(future)
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        expire: int,
+        refresh: Compute,
+        stale: CacheEntry,
+    ) -> None:
+        if key in self._refreshing:
+            return
+        future = asyncio.ensure_future(self._refresh(key, expire, refresh, stale))
+        self._refreshing[key] = future
+        future.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(
+        self,
+        key: str,
+        expire: int,
+        refresh: Compute,
+        stale: CacheEntry,
+    ) -> None:
+        lock_key = f"{self.prefix}:lock:{key}"
+        try:
+            # Обновлением занимается только воркер, захвативший блокировку.
+            if not await redis_helper.client.set(
+                lock_key, b"1", nx=True, ex=self.refresh_lock_ttl
+            ):
+                return
+        except RedisError as err:
+            logger.warning("Кеш ответов недоступен: %s", err)
+            return
+        try:
+            await self._compute_and_store(key, expire, refresh, stale)
+        except Exception as err:
+            logger.error("Не удалось обновить запись кеша %s: %s", key, err)
+        finally:
+            try:
+                await redis_helper.client.delete(lock_key)
+            except RedisError:
+                pass
+
+
+response_cache = ResponseCache(
+    prefix=settings.cache.prefix,
+    channel=settings.cache.channel,
+    local_max_entries=settings.cache.local_max_entries,
+    local_max_bytes=settings.cache.local_max_bytes,
+    stale_ttl=settings.cache.stale_ttl,
+    refresh_lock_ttl=settings.cache.refresh_lock_ttl,
+)
+
+
+def _find_request_param(signature: inspect.Signature) -> str | None:
+    return next(
+        (
+            name
+            for name, param in signature.parameters.items()
+            if param.annotation is Request
+        ),
+        None,
+    )
+
+
+async def _call_with_own_session(func: Callable[..., Awaitable[Any]], args, kwargs):
+    # Вычисление под asyncio.shield переживает отмену запроса, а фоновое
+    # обновление идет после ответа: сессия запроса к этому времени может быть
+    # закрыта, поэтому используется собственная. Она открывается в основной
+    # БД, а не на реплике: запись часто вычисляется сразу после сброса по
+    # тегам, и отстающая реплика вернула бы данные до изменения.
+    async with db_helper.primary_session() as session:
+        own_kwargs = {
+            name: session if isinstance(value, AsyncSession) else value
+            for name, value in kwargs.items()
+        }
+        return await func(*args, **own_kwargs)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Для GET сравнение слабое: префикс W/ не учитывается.
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in header.split(",")
+    )
+
+
+def _is_not_modified(request: Request, validators: CacheValidators) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since не учитывается, если есть If-None-Match.
+        return _etag_matches(if_none_match, validators.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return validators.last_modified <= since
+
+
+def _is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _validator_headers(validators: CacheValidators) -> dict[str, str]:
+    # no-cache: клиент хранит ответ, но перед использованием сверяет ETag.
+    return {
+        "ETag": validators.etag,
+        "Last-Modified": formatdate(validators.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def _not_modified_response(validators: CacheValidators, namespace: str) -> Response:
+    CACHE_REQUESTS.labels(namespace, "not_modified").inc()
+    return Response(status_code=304, headers=_validator_headers(validators))
+
+
+async def _conditional_response(
+    request: Request,
+    key: str,
+    expire: int,
+    compute: Compute,
+    namespace: str,
+    media_type: str,
+) -> Response:
+    """
+    Ответ из кеша с ETag и Last-Modified. На условный запрос, чей валидатор
+    совпадает со свежей записью, отдается 304 без чтения и сериализации тела.
+    """
+    if _is_conditional(request):
+        validators = await response_cache.validators(key)
+        if validators is not None and _is_not_modified(request, validators):
+            return _not_modified_response(validators, namespace)
+    entry = await response_cache.get_or_compute(
+        key, expire, compute, namespace=namespace
+    )
+    if entry.etag is None:
+        return Response(content=entry.content, media_type=media_type)
+    validators = CacheValidators(entry.etag, entry.last_modified)
+    if _is_conditional(request) and _is_not_modified(request, validators):
+        return _not_modified_response(validators, namespace)
+    return Response(
+        content=entry.content,
+        media_type=media_type,
+        headers=_validator_headers(validators),
+    )
+
+
+def cached(
+    response_model: Any,
+    expire: int = settings.redis.cache_ttl,
+    namespace: str = "",
+    key_builder: Callable[..., str | None] = custom_cache_key_builder,
+    tags: Callable[[Any], Iterable[str] | None] | None = None,
+    validate: bool = True,
+):
+    """
+    Кеширует JSON ответа GET-роута. Результат один раз сериализуется через
+    response_model, и при попадании в кеш отдается готовыми байтами.
+    tags получает провалидированный ответ и возвращает теги для сброса;
+    None - ответ не кешировать. key_builder, вернувший None, тоже отключает
+    кеш для запроса.
+
+    validate=False - функция уже возвращает словари в форме response_model
+    (выборка по Projection): они сериализуются orjson без валидации, а tags
+    получает их же.
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(func)
+        request_name = _find_request_param(signature)
+        metrics_namespace = namespace or f"api:{func.__name__}"
+        parameters = list(signature.parameters.values())
+        if request_name is None:
+            parameters.append(
+                inspect.Parameter(
+                    "cache_request",
+                    inspect.Parameter.KEYWORD_ONLY,
+                    annotation=Request,
+                )
+            )
+
+        async def render(value: Any) -> tuple[bytes, Iterable[str] | None]:
+            with measure("serialize"):
+                if validate:
+                    value = adapter.validate_python(value, from_attributes=True)
+                    content = adapter.dump_json(value)
+                else:
+                    content = dump_json(value)
+                entry_tags = tags(value) if tags is not None else []
+                return content, None if entry_tags is None else list(entry_tags)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if request_name is None:
+                request: Request = kwargs.pop("cache_request")
+            else:
+                request = kwargs[request_name]
+            key = key_builder(
+                func,
+                namespace,
+                request=request,
+                response=None,
+                args=args,
+                kwargs=kwargs,
+            )
+            if key is None or request.headers.get("cache-control") == "no-store":
+                if validate:
+                    return await func(*args, **kwargs)
+                content, _ = await render(await func(*args, **kwargs))
+                return Response(content=content, media_type="application/json")
+
+            async def compute() -> tuple[bytes, Iterable[str] | None]:
+                return await render(await _call_with_own_session(func, args, kwargs))
+
+            return await _conditional_response(
+                request,
+                key,
+                expire,
+                compute,
+                metrics_namespace,
+                "application/json",
+            )
+
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+
+    return decorator
+
+
+def page_tags(*tags: str) -> Callable[[Any], list[str] | None]:
+    """
+    Теги страницы списка API. Пустая страница не кешируется: ее дают и
+    фильтры по несуществующим категориям, а таких значений без предела.
+    """
+
+    def build(page: Any) -> list[str] | None:
+        return list(tags) if page.items else None
+
+    return build
+
+
+def page_cache_key(request: Request, query: Any = ()) -> str:
+    return ":".join(["page", request.url.path, repr(query)])
+
+
+def cached_page(
+    expire: int,
+    tags: Callable[[dict], Iterable[str] | None],
+    query: Callable[[Request], Any] | None = None,
+    bypass: Iterable[str] = (),
+):
+    """
+    Кеширует HTML страницы для анонимных посетителей (без cookie авторизации).
+    Ключ - путь и то, что query вернул для запроса: канонические значения
+    параметров, которые читает страница; None - страницу не кешировать.
+    Без query параметры запроса в ключ не входят. С непустым параметром из
+    bypass (одноразовые сообщения после редиректа) страница не кешируется.
+    tags получает контекст шаблона и возвращает теги для сброса; None -
+    страницу не кешировать.
+    """
+    bypass = frozenset(bypass)
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        request_name = _find_request_param(inspect.signature(func))
+        if request_name is None:
+            raise TypeError(f"{func.__name__} must accept a Request to be cached")
+
+        async def render(response: Response) -> tuple[bytes, Iterable[str] | None]:
+            return response.body, tags(response.context)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs[request_name]
+            page_query = () if query is None else query(request)
+            if (
+                page_query is None
+                or request.cookies.get(cookie_transport.cookie_name)
+                or any(request.query_params.get(name) for name in bypass)
+            ):
+                return await func(*args, **kwargs)
+
+            async def compute() -> tuple[bytes, Iterable[str] | None]:
+                return await render(await _call_with_own_session(func, args, kwargs))
+
+            return await _conditional_response(
+                request,
+                page_cache_key(request, page_query),
+                expire,
+                compute,
+                f"page:{func.__name__}",
+                "text/html",
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,42 @@
+from typing import Any, AsyncIterator, Callable, Sequence
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from src.db.database import db_helper
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+PartitionStream = Callable[[AsyncSession], AsyncIterator[Sequence[Any]]]
+
+
+async def encode_ndjson(
+    partitions: AsyncIterator[Sequence[Any]], schema: Any
+) -> AsyncIterator[bytes]:
+    """Кодирует каждую пачку ORM-объектов в строки NDJSON по схеме ответа."""
+    adapter = TypeAdapter(schema)
+    async for partition in partitions:
+        yield b"".join(
+            adapter.dump_json(adapter.validate_python(item, from_attributes=True))
+            + b"\n"
+            for item in partition
+        )
+
+
+def ndjson_response(
+    request: Request, stream: PartitionStream, schema: Any
+) -> StreamingResponse:
+    """
+    Потоковый ответ: строки читаются из серверного курсора пачками и отдаются
+    клиенту сразу после кодирования, поэтому память не зависит от размера
+    выгрузки, а первый байт уходит после первой пачки.
+    """
+
+    async def content() -> AsyncIterator[bytes]:
+        async with db_helper.read_session(request) as session:
+            async for chunk in encode_ndjson(stream(session), schema):
+                yield chunk
+
+    return StreamingResponse(content(), media_type=NDJSON_MEDIA_TYPE)
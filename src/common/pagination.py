@@ -0,0 +1,125 @@
+import base64
+import binascii
+from typing import Any, NamedTuple
+
+import orjson
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class Page(BaseModel):
+    items: list[Any]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class CursorPosition(NamedTuple):
+    key: int
+    backward: bool
+    # Значение дополнительного столбца сортировки у граничной строки.
+    value: Any = None
+
+
+def encode_cursor(key: int, backward: bool = False, value: Any = None) -> str:
+    data = {"k": key, "b": backward}
+    if value is not None:
+        data["v"] = value
+    payload = orjson.dumps(data)
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> CursorPosition | None:
+    if not cursor:
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = orjson.loads(payload)
+        key, backward, value = data["k"], data["b"], data.get("v")
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        return None
+    if not isinstance(key, int) or not isinstance(backward, bool):
+        return None
+    if value is not None and not isinstance(value, (int, str)):
+        return None
+    return CursorPosition(key, backward, value)
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    key_column: InstrumentedAttribute,
+    limit: int = 9,
+    page: int = 1,
+    cursor: str | None = None,
+    descending: bool = True,
+    sort_column: InstrumentedAttribute | None = None,
+    mappings: bool = False,
+) -> Page:
+    """
+    Постраничная выборка по ключу. С курсором строки выбираются по условию
+    на key_column (keyset), без курсора - через OFFSET для перехода на
+    произвольную страницу. Всегда выбирается limit + 1 строка, чтобы узнать
+    о наличии следующей страницы без COUNT(*).
+
+    С sort_column строки упорядочены по (sort_column, key_column): уникальный
+    ключ делает порядок строк с одинаковым значением устойчивым, а курсор
+    хранит обе части.
+
+    С mappings stmt выбирает столбцы, и элементы страницы - строки-словари
+    (RowMapping). Столбцы курсора добавляются в выборку, если их в ней нет.
+    """
+    position = decode_cursor(cursor)
+    if position is not None and (sort_column is None) != (position.value is None):
+        # Курсор от другого порядка сортировки.
+        position = None
+    backward = position is not None and position.backward
+    # При движении назад строки выбираются в обратном порядке и затем
+    # разворачиваются.
+    reverse = descending != backward
+    columns = [key_column] if sort_column is None else [sort_column, key_column]
+    if mappings:
+        selected = stmt.selected_columns.keys()
+        stmt = stmt.add_columns(
+            *(column for column in columns if column.key not in selected)
+        )
+    stmt = stmt.order_by(
+        *(column.desc() if reverse else column.asc() for column in columns)
+    )
+    if position is None:
+        stmt = stmt.offset((page - 1) * limit)
+    elif sort_column is None:
+        stmt = stmt.where(
+            key_column < position.key if reverse else key_column > position.key
+        )
+    else:
+        bound = tuple_(position.value, position.key)
+        current = tuple_(sort_column, key_column)
+        stmt = stmt.where(current < bound if reverse else current > bound)
+    result = await session.execute(stmt.limit(limit + 1))
+    items = list(result.mappings().all() if mappings else result.scalars().all())
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    if backward:
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, position is not None or page > 1
+
+    def field(item: Any, column: InstrumentedAttribute) -> Any:
+        return item[column.key] if mappings else getattr(item, column.key)
+
+    def cursor_for(item: Any, backward: bool = False) -> str:
+        value = None if sort_column is None else field(item, sort_column)
+        return encode_cursor(field(item, key_column), backward, value)
+
+    page_result = Page(items=items)
+    if items:
+        if has_next:
+            page_result.next_cursor = cursor_for(items[-1])
+        if has_prev:
+            page_result.prev_cursor = cursor_for(items[0], backward=True)
+    return page_result
@@ -0,0 +1,157 @@
+from typing import Any, Iterable, Mapping
+
+import orjson
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Label
+
+from src.common.schemas import FieldsQuery
+
+# Разделитель имени вложенного объекта и его поля в метках столбцов.
+NESTED_SEPARATOR = "__"
+
+# Поле вложенного объекта, по которому определяется его наличие.
+NESTED_KEY = "id"
+
+
+class Projection:
+    """
+    Форма ответа API в виде столбцов: поле схемы -> столбец или вложенная
+    проекция. Выборка только этих столбцов через JOIN превращается в
+    словари без ORM-объектов и повторной валидации, и словари сериализуются
+    сразу в JSON той же формы, что и схема Read.
+
+    Порядок полей совпадает с порядком полей схемы, чтобы JSON совпадал
+    побайтно. Вложенный объект при внешнем соединении, у которого столбец
+    id равен NULL, становится None.
+    """
+
+    def __init__(self, **fields: "ColumnElement | Projection") -> None:
+        self.fields = fields
+        self._plan = self._build_plan("")
+
+    def extend(self, **fields: "ColumnElement | Projection") -> "Projection":
+        return Projection(**self.fields, **fields)
+
+    def select(
+        self, fields: list[str] | None = None, expand: list[str] | None = None
+    ) -> "Projection":
+        """
+        Проекция только с выбранными полями и вложенными объектами. Поля
+        вложенных объектов задаются через точку: category.name. Без fields
+        выбираются все поля, без expand раскрываются все вложенные объекты;
+        объект, упомянутый в fields, раскрывается и без expand. Поле id есть
+        на каждом уровне: по нему строятся курсоры и теги кеша, а вложенный
+        объект отличается от None. Неизвестный путь - ValueError.
+        """
+        fields_top, fields_nested = _split_paths(fields)
+        expand_top, expand_nested = _split_paths(expand)
+        for name in sorted(fields_top | expand_top):
+            field = self.fields.get(name)
+            if field is None:
+                raise ValueError(name)
+            if not isinstance(field, Projection) and (
+                name in expand_top or name in fields_nested
+            ):
+                raise ValueError(name)
+
+        chosen = {}
+        for name, field in self.fields.items():
+            if not isinstance(field, Projection):
+                if name == NESTED_KEY or fields is None or name in fields_top:
+                    chosen[name] = field
+                continue
+            if expand is None:
+                expanded = fields is None or name in fields_top
+            else:
+                expanded = name in expand_top or name in fields_top
+            if not expanded:
+                continue
+            try:
+                chosen[name] = field.select(
+                    fields_nested.get(name), expand_nested.get(name)
+                )
+            except ValueError as err:
+                raise ValueError(f"{name}.{err}") from None
+        return Projection(**chosen)
+
+    def columns(self, prefix: str = "") -> list[Label]:
+        columns = []
+        for name, field in self.fields.items():
+            label = prefix + name
+            if isinstance(field, Projection):
+                columns.extend(field.columns(label + NESTED_SEPARATOR))
+            else:
+                columns.append(field.label(label))
+        return columns
+
+    def _build_plan(self, prefix: str) -> list[tuple[str, str, list | None]]:
+        # (поле, метка столбца, план вложенного объекта); для вложенного
+        # объекта метка - его id.
+        plan = []
+        for name, field in self.fields.items():
+            label = prefix + name
+            if isinstance(field, Projection):
+                nested_prefix = label + NESTED_SEPARATOR
+                plan.append(
+                    (name, nested_prefix + NESTED_KEY, field._build_plan(nested_prefix))
+                )
+            else:
+                plan.append((name, label, None))
+        return plan
+
+    def to_dict(self, row: Mapping[str, Any]) -> dict[str, Any]:
+        return _fill(self._plan, row)
+
+    def to_dicts(self, rows: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+        plan = self._plan
+        return [_fill(plan, row) for row in rows]
+
+
+def _split_paths(
+    paths: list[str] | None,
+) -> tuple[set[str], dict[str, list[str]]]:
+    # "category.name" -> поле верхнего уровня category и путь name внутри него.
+    top: set[str] = set()
+    nested: dict[str, list[str]] = {}
+    for path in paths or ():
+        name, _, rest = path.partition(".")
+        top.add(name)
+        if rest:
+            nested.setdefault(name, []).append(rest)
+    return top, nested
+
+
+def select_fields(projection: Projection, query: FieldsQuery) -> Projection:
+    """Projection.select по параметрам запроса; неизвестный путь - 422."""
+    try:
+        return projection.select(query.fields, query.expand)
+    except ValueError as err:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown field: {err}",
+        )
+
+
+def _fill(plan: list, row: Mapping[str, Any]) -> dict[str, Any]:
+    item = {}
+    for name, label, nested in plan:
+        if nested is None:
+            item[name] = row[label]
+        elif row[label] is None:
+            item[name] = None
+        else:
+            item[name] = _fill(nested, row)
+    return item
+
+
+def _dump_model(value: Any) -> Any:
+    # Страница (Page) со словарями строк внутри.
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError
+
+
+def dump_json(value: Any) -> bytes:
+    """JSON ответа из словарей проекции, без валидации схемой."""
+    return orjson.dumps(value, default=_dump_model)
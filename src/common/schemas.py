@@ -1,6 +1,13 @@
-from pydantic import BaseModel, field_validator
+from typing import ClassVar, Generic, TypeVar
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from pydantic_core import PydanticCustomError
 
+from src.common.pagination import decode_cursor
+from src.config import settings
+
+T = TypeVar("T")
+
 
 class PaginationQuery(BaseModel):
     page: int = 1
@@ -51,3 +58,62 @@ class PaginationQuery(BaseModel):
                 "Размер страницы не может быть больше 50",
             )
         return value
+
+
+class CursorQuery(BaseModel):
+    """
+    Параметры списков API. Неизвестные параметры игнорируются, а ключ кеша
+    строится из этой модели, поэтому разные записи одного запроса
+    (порядок, лишние параметры, true/1) попадают в одну запись кеша.
+
+    Запрос, где задано поле из uncached_fields, не кешируется: у таких полей
+    значений без предела (любой курсор), и каждое создавало бы свою запись.
+    Кешируются первые страницы, их и запрашивают чаще всего.
+    """
+
+    uncached_fields: ClassVar[tuple[str, ...]] = ("cursor",)
+
+    limit: int = Field(
+        settings.pagination.api_default_limit,
+        ge=1,
+        le=settings.pagination.api_max_limit,
+    )
+    cursor: str | None = None
+    model_config = ConfigDict(extra="ignore")
+
+    @field_validator("cursor")
+    @classmethod
+    def cursor_validate(cls, value):
+        # Испорченный курсор - первая страница, а не отдельная запись кеша.
+        if value is not None and decode_cursor(value) is None:
+            return None
+        return value
+
+
+class FieldsQuery(BaseModel):
+    """
+    Выбор полей ответа API: ?fields=id,title,category.name и
+    ?expand=category. Значения через запятую или повторением параметра;
+    список нормализуется (без пробелов, повторов, по алфавиту), чтобы разные
+    записи одного выбора попадали в одну запись кеша.
+    """
+
+    fields: list[str] | None = None
+    expand: list[str] | None = None
+    model_config = ConfigDict(extra="ignore")
+
+    @field_validator("fields", "expand")
+    @classmethod
+    def paths_validate(cls, value):
+        if value is None:
+            return None
+        return sorted(
+            {path.strip() for item in value for path in item.split(",") if path.strip()}
+        )
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,23 @@
+import time
+
+from fastapi.templating import Jinja2Templates
+
+from src.monitoring.metrics import TEMPLATE_RENDER
+from src.monitoring.timing import current_timing
+
+
+class TimedTemplates(Jinja2Templates):
+    """
+    Jinja2Templates, замеряющий время рендеринга каждого шаблона
+    (метрика Prometheus и этап render в Server-Timing).
+    """
+
+    def TemplateResponse(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().TemplateResponse(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        TEMPLATE_RENDER.labels(response.template.name).observe(elapsed)
+        timing = current_timing()
+        if timing is not None:
+            timing.add("render", elapsed)
+        return response
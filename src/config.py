@@ -26,6 +26,9 @@ class ApiPrefix(BaseModel):
     prefix_answer: str = "/answers"
     prefix_question: str = "/questions"
     prefix_favorites: str = "/favorites"
+    prefix_search: str = "/search"
+    prefix_mail: str = "/mail"
+    prefix_monitoring: str = "/monitoring"
 
 
 class ViewsPrefix(BaseModel):
@@ -34,6 +37,32 @@ class ViewsPrefix(BaseModel):
     prefix_auth: str = ""
     prefix_profile: str = "/profile"
     prefix_admin: str = "/admin"
+    prefix_search: str = "/search"
+
+
+class PaginationConfig(BaseModel):
+    count_total: bool = True
+    api_default_limit: int = 20
+    api_max_limit: int = 100
+
+
+class ExportConfig(BaseModel):
+    # Строк, которые читаются из серверного курсора и кодируются за раз.
+    batch_size: int = 1000
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = True
+    path: str = "/metrics"
+    # /metrics требует заголовок Authorization: Bearer <token>; без токена
+    # метрики собираются, но роут не публикуется.
+    token: str | None = None
+    loop_lag_interval: float = 0.5
+
+
+class ServerTimingConfig(BaseModel):
+    # Заголовок Server-Timing для всех запросов.
+    enabled: bool = False
 
 
 class CsrfConfig(BaseModel):
@@ -45,9 +74,15 @@ class DatabaseConfig(BaseModel):
     url: PostgresDsn
     echo: bool = False
     echo_pool: bool = False
-    pool_size: int = 50
-    max_overflow: int = 10
+    # Сколько соединений с одним сервером БД могут держать все воркеры вместе;
+    # пул каждого воркера получает свою долю (см. src/db/pool.py).
+    connection_budget: int = 80
+    pool_size: int | None = None
+    max_overflow: int | None = None
     pool_timeout: int = 60
+    replica_urls: list[PostgresDsn] = []
+    replica_check_interval: float = 5.0
+    read_your_writes_window: float = 5.0
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -58,9 +93,51 @@ class DatabaseConfig(BaseModel):
     }
 
 
+class QueryBudgetConfig(BaseModel):
+    enabled: bool = True
+    # Сколько SQL-запросов допустимо на один HTTP-запрос.
+    max_statements: int = 20
+    # Сколько раз может повториться один и тот же запрос (признак N+1).
+    max_repeats: int = 5
+    # В тестах и бенчмарках превышение бюджета - ошибка, а не предупреждение.
+    strict: bool = False
+
+
+class ViewsCounterConfig(BaseModel):
+    flush_interval: float = 10.0
+    # Сколько разных slug копится между сбросами; просмотры новых slug сверх
+    # этого числа отбрасываются.
+    max_pending: int = 10000
+
+
 class RedisConfig(BaseModel):
     url: RedisDsn
-    cache_ttl: int = 60
+    cache_ttl: int = 3600
+    category_channel: str = "categories:invalidate"
+
+
+class CacheConfig(BaseModel):
+    prefix: str = "response-cache"
+    channel: str = "response-cache:invalidate"
+    local_max_entries: int = 1024
+    local_max_bytes: int = 64 * 1024 * 1024
+    stale_ttl: int = 300
+    refresh_lock_ttl: int = 30
+    page_home_ttl: int = 3600
+    page_api_doc_ttl: int = 86400
+    page_category_ttl: int = 600
+    page_question_ttl: int = 3600
+
+
+class AuthCacheConfig(BaseModel):
+    prefix: str = "auth-user"
+    user_ttl: int = 60
+    local_max_tokens: int = 4096
+
+
+class PasswordHashingConfig(BaseModel):
+    max_workers: int = 4
+    queue_timeout: float = 5.0
 
 
 class AccessTokenConfig(BaseModel):
@@ -92,6 +169,17 @@ class MailConfig(BaseModel):
     from_mail_name: str = "devopsoffer"
 
 
+class MailOutboxConfig(BaseModel):
+    poll_interval: float = 5.0
+    batch_size: int = 50
+    max_attempts: int = 8
+    backoff_base: float = 5.0
+    backoff_max: float = 3600.0
+    lease_timeout: float = 300.0
+    smtp_timeout: float = 30.0
+    smtp_idle_timeout: float = 60.0
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -103,10 +191,20 @@ class Settings(BaseSettings):
     logging: LoggingConfig = LoggingConfig()
     db: DatabaseConfig
     access_token: AccessTokenConfig
+    password_hashing: PasswordHashingConfig = PasswordHashingConfig()
+    auth_cache: AuthCacheConfig = AuthCacheConfig()
     views: ViewsPrefix = ViewsPrefix()
     mail: MailConfig
+    mail_outbox: MailOutboxConfig = MailOutboxConfig()
     csrf: CsrfConfig
     redis: RedisConfig
+    cache: CacheConfig = CacheConfig()
+    views_counter: ViewsCounterConfig = ViewsCounterConfig()
+    query_budget: QueryBudgetConfig = QueryBudgetConfig()
+    pagination: PaginationConfig = PaginationConfig()
+    export: ExportConfig = ExportConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    server_timing: ServerTimingConfig = ServerTimingConfig()
 
 
 settings = Settings()
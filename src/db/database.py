@@ -1,5 +1,15 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, AsyncIterator, Iterator, Sequence
 
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncEngine,
@@ -7,10 +17,106 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 
+from starlette.requests import Request
+
 from src.config import settings
+from src.db.pool import InstrumentedPool, pool_limits, worker_count
+
+logger = logging.getLogger(__name__)
+
+
+class DbUsage:
+    """Статистика обращений к БД в рамках одного запроса."""
+
+    __slots__ = (
+        "sessions",
+        "read_sessions",
+        "transactions",
+        "wrote",
+        "statements",
+        "db_seconds",
+        "fingerprints",
+    )
+
+    def __init__(self) -> None:
+        self.sessions = 0
+        # Из sessions: открытые через read_session (реплика или основная БД
+        # для чтения своих записей).
+        self.read_sessions = 0
+        self.transactions = 0
+        self.wrote = False
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+
+_db_usage: ContextVar[DbUsage | None] = ContextVar("db_usage", default=None)
+
+_LITERALS = re.compile(r"\$\d+|%\(\w+\)s|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_fingerprint(statement: str) -> str:
+    """SQL без значений параметров и литералов: одинаков для повторов N+1."""
+    fingerprint = _LITERALS.sub("?", statement)
+    fingerprint = _PLACEHOLDER_LISTS.sub("?, ...", fingerprint)
+    return _SPACES.sub(" ", fingerprint).strip()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement_start(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _db_usage.get() is not None:
+        context.db_usage_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    usage = _db_usage.get()
+    started = getattr(context, "db_usage_started", None)
+    if usage is None or started is None:
+        return
+    usage.statements += 1
+    usage.db_seconds += time.perf_counter() - started
+    usage.fingerprints[statement_fingerprint(statement)] += 1
+
+
+class UsageTrackingSession(AsyncSession):
+    """
+    Сессия, которая учитывает свои транзакции в DbUsage текущего запроса:
+    начало каждой транзакции и фиксацию записи в основную БД (по ней
+    включается чтение своих записей).
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        event.listen(self.sync_session, "after_begin", self._on_begin)
+        event.listen(self.sync_session, "after_commit", self._on_commit)
+
+    def _on_begin(self, session, transaction, connection) -> None:
+        usage = _db_usage.get()
+        if usage is not None:
+            usage.transactions += 1
+
+    def _on_commit(self, session) -> None:
+        usage = _db_usage.get()
+        if usage is not None and not session.info.get("replica"):
+            usage.wrote = True
 
 
 class DatabaseHelper:
+    """
+    Движки БД: основной для записи и, при наличии, реплики для чтения.
+
+    Сессии для чтения (read_session_getter) распределяются по здоровым репликам
+    по кругу. Реплики проверяются в фоне `SELECT 1`; недоступная реплика
+    исключается до следующей успешной проверки, а без здоровых реплик чтение
+    идет в основную БД. Запросы клиента, который недавно сам что-то записал,
+    читают из основной БД в течение `read_your_writes_window` секунд.
+    Кеши ответов и каталог категорий заполняются только из основной БД
+    (primary_session): они живут дольше, чем отставание реплики.
+    """
+
     def __init__(
         self,
         url: str,
@@ -19,35 +125,199 @@ class DatabaseHelper:
         pool_size: int = 10,
         max_overflow: int = 15,
         pool_timeout: int = 30,
+        replica_urls: Sequence[str] = (),
+        replica_check_interval: float = 5.0,
+        read_your_writes_window: float = 5.0,
+        read_your_writes_cookie: str = "db_primary_until",
     ) -> None:
-        self.engine: AsyncEngine = create_async_engine(
-            url=url,
+        engine_options = dict(
             echo=echo,
             echo_pool=echo_pool,
+            poolclass=InstrumentedPool,
             pool_size=pool_size,
             max_overflow=max_overflow,
             pool_timeout=pool_timeout,
         )
-        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-            bind=self.engine,
-            autoflush=False,
-            autocommit=False,
-            expire_on_commit=False,
+        self.engine: AsyncEngine = create_async_engine(url=url, **engine_options)
+        self.session_factory: async_sessionmaker[UsageTrackingSession] = (
+            async_sessionmaker(
+                bind=self.engine,
+                class_=UsageTrackingSession,
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+            )
         )
+        self.replicas: list[AsyncEngine] = [
+            create_async_engine(url=replica_url, **engine_options)
+            for replica_url in replica_urls
+        ]
+        self._replica_factories: list[async_sessionmaker[UsageTrackingSession]] = [
+            async_sessionmaker(
+                bind=replica,
+                class_=UsageTrackingSession,
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+                info={"replica": True},
+            )
+            for replica in self.replicas
+        ]
+        self._healthy = [True] * len(self.replicas)
+        for index, replica in enumerate(self.replicas):
+            replica.pool.stats.name = f"replica_{index}"
+            event.listen(
+                replica.sync_engine, "handle_error", self._on_replica_error(index)
+            )
+        self._round_robin = itertools.count()
+        self.replica_check_interval = replica_check_interval
+        self.read_your_writes_window = read_your_writes_window
+        self.read_your_writes_cookie = read_your_writes_cookie
+        self._health_task: asyncio.Task | None = None
+
+    def pool_stats(self) -> dict[str, dict[str, float | int]]:
+        stats = {"primary": self.engine.pool.snapshot()}
+        for index, replica in enumerate(self.replicas):
+            stats[f"replica_{index}"] = replica.pool.snapshot()
+        return stats
 
     async def dispose(self) -> None:
+        await self.stop()
         await self.engine.dispose()
+        for replica in self.replicas:
+            await replica.dispose()
 
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
+        # FastAPI кеширует зависимость в пределах запроса, поэтому роут,
+        # get_user_db и остальные зависимости получают одну и ту же сессию.
+        # У роутов чтения (read_session_getter) своя сессия, и get_user_db
+        # открывает вторую: см. src.auth.dependencies.get_user_db.
+        usage = _db_usage.get()
+        if usage is not None:
+            usage.sessions += 1
+        async with self.session_factory() as session:
+            yield session
+
+    async def read_session_getter(
+        self, request: Request
+    ) -> AsyncGenerator[AsyncSession, None]:
+        async with self.read_session(request) as session:
+            yield session
+
+    @asynccontextmanager
+    async def primary_session(self) -> AsyncIterator[AsyncSession]:
+        # Для заполнения кешей после сброса: реплика может еще не получить
+        # запись, из-за которой кеш сброшен, и старые данные легли бы в кеш
+        # на весь срок хранения.
+        usage = _db_usage.get()
+        if usage is not None:
+            usage.sessions += 1
         async with self.session_factory() as session:
             yield session
 
+    @asynccontextmanager
+    async def read_session(self, request: Request) -> AsyncIterator[AsyncSession]:
+        # Для потоковых ответов: зависимость закрывает сессию до отправки тела,
+        # поэтому генератор ответа открывает сессию сам.
+        usage = _db_usage.get()
+        if usage is not None:
+            usage.sessions += 1
+            usage.read_sessions += 1
+        async with self.read_session_factory(
+            primary=self.recently_wrote(request)
+        )() as session:
+            yield session
+
+    def read_session_factory(
+        self, primary: bool = False
+    ) -> async_sessionmaker[UsageTrackingSession]:
+        if not primary:
+            healthy = [
+                factory
+                for factory, is_healthy in zip(self._replica_factories, self._healthy)
+                if is_healthy
+            ]
+            if healthy:
+                return healthy[next(self._round_robin) % len(healthy)]
+        return self.session_factory
+
+    def recently_wrote(self, request: Request) -> bool:
+        usage = _db_usage.get()
+        if usage is not None and usage.wrote:
+            return True
+        primary_until = request.cookies.get(self.read_your_writes_cookie)
+        if primary_until is None:
+            return False
+        try:
+            return float(primary_until) > time.time()
+        except ValueError:
+            return False
+
+    def _on_replica_error(self, index: int):
+        def handle_error(context) -> None:
+            if context.is_disconnect and self._healthy[index]:
+                logger.warning("Реплика БД %s недоступна, чтение идет мимо нее.", index)
+                self._healthy[index] = False
+
+        return handle_error
+
+    async def check_replicas(self) -> None:
+        for index, replica in enumerate(self.replicas):
+            try:
+                async with replica.connect() as connection:
+                    await asyncio.wait_for(
+                        connection.execute(text("SELECT 1")),
+                        timeout=self.replica_check_interval,
+                    )
+            except Exception as err:
+                if self._healthy[index]:
+                    logger.warning("Реплика БД %s недоступна: %s", index, err)
+                self._healthy[index] = False
+            else:
+                if not self._healthy[index]:
+                    logger.info("Реплика БД %s снова доступна.", index)
+                self._healthy[index] = True
+
+    async def start(self) -> None:
+        if self.replicas and self._health_task is None:
+            self._health_task = asyncio.create_task(self._check_replicas_forever())
+
+    async def stop(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    async def _check_replicas_forever(self) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(self.replica_check_interval)
+
+    @contextmanager
+    def track_usage(self) -> Iterator[DbUsage]:
+        usage = DbUsage()
+        token = _db_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _db_usage.reset(token)
+
 
 db_helper = DatabaseHelper(
     url=str(settings.db.url),
     echo=settings.db.echo,
     echo_pool=settings.db.echo_pool,
-    pool_size=settings.db.pool_size,
-    max_overflow=settings.db.max_overflow,
     pool_timeout=settings.db.pool_timeout,
+    replica_urls=[str(url) for url in settings.db.replica_urls],
+    replica_check_interval=settings.db.replica_check_interval,
+    read_your_writes_window=settings.db.read_your_writes_window,
+    **pool_limits(
+        budget=settings.db.connection_budget,
+        workers=worker_count(default=settings.run.workers),
+        pool_size=settings.db.pool_size,
+        max_overflow=settings.db.max_overflow,
+    ),
 )
@@ -0,0 +1,96 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import QueryBudgetConfig, settings
+from src.db.database import DbUsage, db_helper
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class DbUsageMiddleware:
+    """
+    Считает для каждого HTTP-запроса открытые сессии, транзакции и SQL-запросы
+    с их суммарным временем. Статистика доступна обработчикам как
+    request.state.db_usage и пишется в журнал на уровне DEBUG.
+
+    Если запросов больше бюджета или один и тот же запрос повторяется слишком
+    часто (N+1), пишется предупреждение со слепками запросов; в строгом режиме
+    (тесты, бенчмарки) вместо этого поднимается QueryBudgetExceeded.
+
+    Если запрос что-то записал в основную БД, клиенту ставится cookie,
+    по которой его чтения ближайшие секунды идут в основную БД, а не в реплику.
+    """
+
+    def __init__(
+        self, app: ASGIApp, budget: QueryBudgetConfig = settings.query_budget
+    ) -> None:
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with db_helper.track_usage() as usage:
+            scope.setdefault("state", {})["db_usage"] = usage
+
+            async def send_wrapper(message: Message) -> None:
+                if (
+                    message["type"] == "http.response.start"
+                    and usage.wrote
+                    and db_helper.replicas
+                ):
+                    window = db_helper.read_your_writes_window
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "set-cookie",
+                        f"{db_helper.read_your_writes_cookie}={time.time() + window:.3f}; "
+                        f"Max-Age={int(window) + 1}; Path=/; HttpOnly; SameSite=lax",
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                logger.debug(
+                    "%s %s: сессий БД %s (для чтения %s), транзакций %s, "
+                    "SQL-запросов %s (%.1f мс)",
+                    scope["method"],
+                    scope["path"],
+                    usage.sessions,
+                    usage.read_sessions,
+                    usage.transactions,
+                    usage.statements,
+                    usage.db_seconds * 1000,
+                )
+            if self.budget.enabled:
+                self.check_budget(scope, usage)
+
+    def check_budget(self, scope: Scope, usage: DbUsage) -> None:
+        repeated = {
+            fingerprint: count
+            for fingerprint, count in usage.fingerprints.items()
+            if count > self.budget.max_repeats
+        }
+        if usage.statements <= self.budget.max_statements and not repeated:
+            return
+        top = repeated or dict(usage.fingerprints.most_common(5))
+        details = "\n".join(
+            f"  {count} x {fingerprint[:300]}" for fingerprint, count in top.items()
+        )
+        message = (
+            f"{scope['method']} {scope['path']}: {usage.statements} SQL-запросов "
+            f"за {usage.db_seconds * 1000:.1f} мс (бюджет {self.budget.max_statements}, "
+            f"повторов {self.budget.max_repeats}):\n{details}"
+        )
+        if self.budget.strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -4,3 +4,4 @@ from src.question import Question
 from src.category import Category
 from src.auth import User
 from src.favorite.models import Favorite
+from src.mail.models import OutboxEmail
@@ -0,0 +1,147 @@
+import logging
+import os
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.monitoring.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAITING,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count(default: int) -> int:
+    # gunicorn и uvicorn берут число воркеров из WEB_CONCURRENCY,
+    # если оно не задано явно в командной строке.
+    try:
+        return max(int(os.environ["WEB_CONCURRENCY"]), 1)
+    except (KeyError, ValueError):
+        return max(default, 1)
+
+
+def pool_limits(
+    budget: int,
+    workers: int,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+) -> dict[str, int]:
+    """
+    Делит общий бюджет соединений с одним сервером БД между воркерами.
+    Примерно пятая часть доли воркера уходит на overflow. Явно заданные
+    pool_size и max_overflow важнее бюджета.
+    """
+    per_worker = max(budget // workers, 2)
+    limits = {
+        "pool_size": per_worker - per_worker // 5,
+        "max_overflow": per_worker // 5,
+    }
+    if pool_size is not None:
+        limits["pool_size"] = pool_size
+    if max_overflow is not None:
+        limits["max_overflow"] = max_overflow
+    if limits["pool_size"] + limits["max_overflow"] > per_worker:
+        logger.warning(
+            "Пулы %s воркеров могут открыть до %s соединений при бюджете %s.",
+            workers,
+            (limits["pool_size"] + limits["max_overflow"]) * workers,
+            budget,
+        )
+    return limits
+
+
+class PoolStats:
+    """
+    Счетчики ожидания соединений пула одного движка. name - метка pool
+    в метриках Prometheus (primary, replica_0, ...).
+    """
+
+    __slots__ = (
+        "name",
+        "checkouts",
+        "wait_seconds",
+        "max_wait_seconds",
+        "timeouts",
+        "waiting",
+    )
+
+    def __init__(self, name: str = "primary") -> None:
+        self.name = name
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.waiting = 0
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, который измеряет время получения соединения
+    (ожидание свободного слота плюс, при необходимости, установку соединения)
+    и считает таймауты. Статистика переживает пересоздание пула.
+
+    Те же значения пишутся в метрики Prometheus с меткой pool: под gunicorn
+    они суммируются по воркерам в /metrics, а snapshot показывает только
+    пул текущего процесса.
+    """
+
+    def __init__(self, *args, stats: PoolStats | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = stats or PoolStats()
+
+    def _do_get(self):
+        stats = self.stats
+        waiting = DB_POOL_WAITING.labels(stats.name)
+        stats.waiting += 1
+        waiting.inc()
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            stats.timeouts += 1
+            DB_POOL_TIMEOUTS.labels(stats.name).inc()
+            logger.warning("Нет свободных соединений в пуле БД: %s", self.status())
+            raise
+        finally:
+            stats.waiting -= 1
+            waiting.dec()
+        elapsed = time.perf_counter() - started
+        stats.checkouts += 1
+        stats.wait_seconds += elapsed
+        stats.max_wait_seconds = max(stats.max_wait_seconds, elapsed)
+        DB_POOL_CHECKOUT_WAIT.labels(stats.name).observe(elapsed)
+        self._export_usage()
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._export_usage()
+
+    def _export_usage(self) -> None:
+        DB_POOL_CHECKED_OUT.labels(self.stats.name).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(self.stats.name).set(max(self.overflow(), 0))
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def snapshot(self) -> dict[str, float | int]:
+        stats = self.stats
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": stats.waiting,
+            "checkouts": stats.checkouts,
+            "checkout_wait_seconds": stats.wait_seconds,
+            "checkout_wait_max_seconds": stats.max_wait_seconds,
+            "timeouts": stats.timeouts,
+        }
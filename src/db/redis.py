@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisHelper:
+    def __init__(self, url: str, reconnect_delay: float = 1.0) -> None:
+        self.client: aioredis.Redis = aioredis.from_url(
+            url, encoding="utf8", decode_responses=False
+        )
+        self.reconnect_delay = reconnect_delay
+
+    async def dispose(self) -> None:
+        await self.client.close()
+
+    async def listen(
+        self,
+        channel: str,
+        on_message: Callable[[bytes], Awaitable[None] | None],
+        on_subscribe: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Слушает канал до отмены задачи, переподключаясь при ошибках Redis.
+        Сообщения, отправленные пока подписки не было, теряются, поэтому
+        on_subscribe вызывается после каждого (пере)подключения.
+        """
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(channel)
+                if on_subscribe is not None:
+                    on_subscribe()
+                async for message in pubsub.listen():
+                    result = on_message(message["data"])
+                    if asyncio.iscoroutine(result):
+                        await result
+            except RedisError as err:
+                logger.warning("Подписка на канал %s прервана: %s", channel, err)
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                await pubsub.close()
+
+
+redis_helper = RedisHelper(url=str(settings.redis.url))
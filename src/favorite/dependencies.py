@@ -3,6 +3,7 @@ from sqlalchemy import select, func, desc
 from fastapi import HTTPException, Depends, status
 from sqlalchemy.orm import selectinload
 
+from src.common.pagination import Page, paginate
 from src.question.models import Question
 from src.favorite.models import Favorite
 from src.favorite.schemas import FavoriteCreate
@@ -20,19 +21,25 @@ async def get_user_favorites(user: User, session: AsyncSession):
 
 
 async def get_all_favorites_with_pagination(
-    user: User, session: AsyncSession, page: int = 1, limit: int = 9
-):
-    offset = (page - 1) * limit
+    user: User,
+    session: AsyncSession,
+    page: int = 1,
+    limit: int = 9,
+    cursor: str | None = None,
+) -> Page:
     stmt = (
         select(Favorite)
         .where(Favorite.user_id == user.id)
         .options(selectinload(Favorite.question).selectinload(Question.category))
-        .order_by(desc(Favorite.id))
-        .offset(offset)
-        .limit(limit)
     )
-    result = await session.scalars(stmt)
-    return result.all()
+    return await paginate(
+        session=session,
+        stmt=stmt,
+        key_column=Favorite.id,
+        limit=limit,
+        page=page,
+        cursor=cursor,
+    )
 
 
 async def get_total_favorites_count(user: User, session: AsyncSession):
@@ -17,7 +17,7 @@ router = APIRouter(
 @router.get("", response_model=List[FavoriteRead])
 async def get_favorites(
     user: Annotated[User, Depends(current_active_user)],
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ):
     favorites = await get_user_favorites(user=user, session=session)
     return favorites
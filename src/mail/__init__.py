@@ -0,0 +1,2 @@
+__all__ = ["OutboxEmail"]
+from .models import OutboxEmail
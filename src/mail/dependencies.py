@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.mail.models import OutboxEmail
+
+
+async def enqueue_email(
+    session: AsyncSession,
+    recipient: str,
+    subject: str,
+    body: str,
+    subtype: str = "plain",
+) -> OutboxEmail:
+    email = OutboxEmail(
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        subtype=subtype,
+    )
+    session.add(email)
+    await session.commit()
+    return email
+
+
+async def claim_outbox_batch(
+    session: AsyncSession, limit: int, lease_timeout: float
+) -> Sequence[OutboxEmail]:
+    """
+    Забирает пачку писем, готовых к отправке, и откладывает их следующую попытку
+    на `lease_timeout` секунд. Если отправитель упадет, не дойдя до результата,
+    письма снова попадут в выборку после истечения аренды.
+    SKIP LOCKED позволяет нескольким воркерам разбирать очередь без дублей.
+    """
+    now = datetime.now(timezone.utc)
+    ids = (
+        select(OutboxEmail.id)
+        .where(OutboxEmail.status == "pending", OutboxEmail.next_attempt_at <= now)
+        .order_by(OutboxEmail.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(OutboxEmail)
+        .where(OutboxEmail.id.in_(ids))
+        .values(
+            attempts=OutboxEmail.attempts + 1,
+            next_attempt_at=now + timedelta(seconds=lease_timeout),
+        )
+        .returning(OutboxEmail)
+    )
+    result = await session.scalars(stmt)
+    emails = result.all()
+    await session.commit()
+    return emails
+
+
+async def mark_email_sent(session: AsyncSession, email_id: int) -> None:
+    # Текст письма больше не нужен, а в нем ссылка со сбросом пароля:
+    # в отправленных строках он не хранится.
+    stmt = (
+        update(OutboxEmail)
+        .where(OutboxEmail.id == email_id)
+        .values(
+            status="sent",
+            sent_at=datetime.now(timezone.utc),
+            last_error=None,
+            body="",
+        )
+    )
+    await session.execute(stmt)
+
+
+async def mark_email_failed(
+    session: AsyncSession,
+    email_id: int,
+    error: str,
+    retry_at: datetime | None,
+) -> None:
+    # retry_at=None означает, что попытки исчерпаны и письмо больше не отправляется;
+    # текст такого письма тоже очищается, как у отправленного.
+    values = {"last_error": error}
+    if retry_at is None:
+        values["status"] = "failed"
+        values["body"] = ""
+    else:
+        values["next_attempt_at"] = retry_at
+    stmt = update(OutboxEmail).where(OutboxEmail.id == email_id).values(**values)
+    await session.execute(stmt)
+
+
+async def get_outbox_depth(session: AsyncSession) -> dict[str, int]:
+    stmt = (
+        select(OutboxEmail.status, func.count())
+        .where(OutboxEmail.status != "sent")
+        .group_by(OutboxEmail.status)
+    )
+    result = await session.execute(stmt)
+    depth = {"pending": 0, "failed": 0}
+    depth.update({status: count for status, count in result.all()})
+    return depth
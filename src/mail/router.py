@@ -0,0 +1,24 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.fastapi_users import current_active_superuser
+from src.auth.models import User
+from src.config import settings
+from src.db.database import db_helper
+from src.mail.dependencies import get_outbox_depth
+from src.mail.schemas import OutboxDepthRead
+
+router = APIRouter(
+    prefix=settings.api.prefix_mail,
+    tags=["Mail"],
+)
+
+
+@router.get("/outbox", response_model=OutboxDepthRead)
+async def get_outbox(
+    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    _: Annotated[User, Depends(current_active_superuser)],
+):
+    return await get_outbox_depth(session=session)
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class OutboxDepthRead(BaseModel):
+    pending: int
+    failed: int
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.utils import formataddr
+
+import aiosmtplib
+
+from src.config import MailConfig, MailOutboxConfig, settings
+from src.db.database import db_helper
+from src.mail.dependencies import (
+    claim_outbox_batch,
+    mark_email_failed,
+    mark_email_sent,
+)
+from src.mail.models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+class MailSender:
+    """
+    Фоновая отправка писем из таблицы outbox_emails.
+
+    Держит одно SMTP-соединение и переиспользует его между письмами и пачками,
+    закрывая после `smtp_idle_timeout` секунд простоя. Неудачные отправки
+    повторяются с экспоненциальной задержкой, после `max_attempts` попыток
+    письмо помечается как failed.
+    """
+
+    def __init__(self, mail: MailConfig, outbox: MailOutboxConfig) -> None:
+        self.mail = mail
+        self.outbox = outbox
+        self._smtp: aiosmtplib.SMTP | None = None
+        self._last_used = 0.0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def wake(self) -> None:
+        # Письмо добавлено в этом воркере: не ждем очередного опроса.
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._disconnect()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                sent = await self.send_pending()
+            except Exception as err:
+                logger.error("Ошибка обработки очереди писем: %s", err)
+                sent = 0
+            if sent >= self.outbox.batch_size:
+                # Пачка заполнена целиком, скорее всего в очереди есть еще письма.
+                continue
+            if (
+                self._smtp is not None
+                and time.monotonic() - self._last_used > self.outbox.smtp_idle_timeout
+            ):
+                await self._disconnect()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.outbox.poll_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def send_pending(self) -> int:
+        """Отправляет одну пачку писем и возвращает ее размер."""
+        async with db_helper.session_factory() as session:
+            emails = await claim_outbox_batch(
+                session,
+                limit=self.outbox.batch_size,
+                lease_timeout=self.outbox.lease_timeout,
+            )
+            for email in emails:
+                try:
+                    await self._send(email)
+                except Exception as err:
+                    logger.warning(
+                        "Не удалось отправить письмо %s (попытка %s): %s",
+                        email.id,
+                        email.attempts,
+                        err,
+                    )
+                    await self._disconnect()
+                    await mark_email_failed(
+                        session,
+                        email_id=email.id,
+                        error=str(err),
+                        retry_at=self._retry_at(email.attempts),
+                    )
+                else:
+                    await mark_email_sent(session, email_id=email.id)
+                # Фиксируем результат сразу, чтобы при падении не отправить письмо повторно.
+                await session.commit()
+        return len(emails)
+
+    def _retry_at(self, attempts: int) -> datetime | None:
+        if attempts >= self.outbox.max_attempts:
+            return None
+        delay = min(
+            self.outbox.backoff_base * 2 ** (attempts - 1), self.outbox.backoff_max
+        )
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    def _build_message(self, email: OutboxEmail) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = formataddr((self.mail.from_mail_name, self.mail.from_mail))
+        message["To"] = email.recipient
+        message["Subject"] = email.subject
+        message.set_content(email.body, subtype=email.subtype)
+        return message
+
+    async def _send(self, email: OutboxEmail) -> None:
+        smtp = await self._connect()
+        await smtp.send_message(self._build_message(email))
+        self._last_used = time.monotonic()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        if self._smtp is not None and self._smtp.is_connected:
+            return self._smtp
+        smtp = aiosmtplib.SMTP(
+            hostname=self.mail.server,
+            port=self.mail.port,
+            timeout=self.outbox.smtp_timeout,
+            use_tls=self.mail.ssl,
+            start_tls=self.mail.tls,
+            validate_certs=self.mail.validate_certs,
+        )
+        await smtp.connect()
+        if self.mail.use_credentials:
+            await smtp.login(self.mail.username, self.mail.password)
+        self._smtp = smtp
+        return smtp
+
+    async def _disconnect(self) -> None:
+        if self._smtp is None:
+            return
+        smtp, self._smtp = self._smtp, None
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            smtp.close()
+
+
+mail_sender = MailSender(mail=settings.mail, outbox=settings.mail_outbox)
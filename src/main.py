@@ -4,11 +4,15 @@ from typing import Annotated, Sequence, AsyncIterator
 from fastapi import FastAPI, Request, Depends, status
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.responses import ORJSONResponse, HTMLResponse
-from fastapi.templating import Jinja2Templates
+from src.common.templates import TimedTemplates
 from fastapi.staticfiles import StaticFiles
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, Response
 
-from src.category.dependencies import get_all_category
+from src.category.cache import category_catalog
+from src.common.cache import response_cache, cached_page
+from src.question.counter import view_counter
+from src.auth.password import password_helper
+from src.mail.sender import mail_sender
 from src.auth.fastapi_users import current_active_user_ui
 from src.category.models import Category
 from src.auth.models import User
@@ -24,20 +28,26 @@ from src.auth.login.views import router as login_view_router
 from src.auth.register.views import router as register_view_router
 from src.profile.views import router as profile_view_router
 from src.admin.views import router as admin_ui_view_router
+from src.search.router import router as search_router
+from src.mail.router import router as mail_router
+from src.monitoring.router import router as monitoring_router
+from src.monitoring.metrics import EventLoopLagMonitor, render_metrics
+from src.monitoring.middleware import MetricsMiddleware, ServerTimingMiddleware
+from src.search.views import router as search_view_router
 import uvicorn
 from src.config import settings
 from src.db.database import db_helper
+from src.db.redis import redis_helper
+from src.db.middleware import DbUsageMiddleware
 from src.common.dependencies import get_categories
+import hmac
 import logging
-from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
-from fastapi_cache.decorator import cache
-from src.common.dependencies import custom_cache_key_builder
-from redis import asyncio as aioredis
 
 logging.basicConfig(format=settings.logging.log_format)
 
-templates = Jinja2Templates(directory="templates")
+templates = TimedTemplates(directory="templates")
+
+loop_lag_monitor = EventLoopLagMonitor(interval=settings.metrics.loop_lag_interval)
 
 if settings.run.mode == "prod":
     docs_url = None
@@ -52,13 +62,23 @@ else:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # start
-    redis = aioredis.from_url(
-        str(settings.redis.url), encoding="utf8", decode_responses=False
-    )
-    FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    if settings.metrics.enabled:
+        await loop_lag_monitor.start()
+    await db_helper.start()
+    await category_catalog.start()
+    await response_cache.start()
+    await view_counter.start()
+    await mail_sender.start()
     yield
     # shutdown
+    await mail_sender.stop()
+    await view_counter.stop()
+    await response_cache.stop()
+    await category_catalog.stop()
+    password_helper.shutdown()
+    await redis_helper.dispose()
     await db_helper.dispose()
+    await loop_lag_monitor.stop()
 
 
 app = FastAPI(
@@ -88,6 +108,30 @@ front_app = FastAPI(
     redoc_url=None,
 )
 
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(DbUsageMiddleware)
+if settings.metrics.enabled:
+    app.add_middleware(MetricsMiddleware, exclude_paths=(settings.metrics.path,))
+
+if settings.metrics.enabled and settings.metrics.token:
+
+    # Роут объявлен до монтирования front_app на "/", иначе тот перехватит путь.
+    @app.get(settings.metrics.path, include_in_schema=False)
+    async def metrics(request: Request) -> Response:
+        expected = f"Bearer {settings.metrics.token}"
+        if not hmac.compare_digest(
+            request.headers.get("authorization", "").encode(), expected.encode()
+        ):
+            return Response(status_code=status.HTTP_401_UNAUTHORIZED)
+        content, media_type = render_metrics()
+        return Response(content=content, media_type=media_type)
+
+elif settings.metrics.enabled:
+    logging.getLogger(__name__).warning(
+        "METRICS__TOKEN не задан: %s не публикуется", settings.metrics.path
+    )
+
+
 app.mount("/api", api_app)
 app.mount("/", front_app)
 
@@ -96,6 +140,9 @@ api_app.include_router(favorite_router)
 api_app.include_router(category_router)
 api_app.include_router(question_router)
 api_app.include_router(answer_router)
+api_app.include_router(search_router)
+api_app.include_router(mail_router)
+api_app.include_router(monitoring_router)
 
 front_app.mount("/static", StaticFiles(directory="static"), name="static")
 front_app.include_router(category_view_router)
@@ -105,6 +152,7 @@ front_app.include_router(register_view_router)
 front_app.include_router(password_reset_view_router)
 front_app.include_router(profile_view_router)
 front_app.include_router(admin_ui_view_router)
+front_app.include_router(search_view_router)
 
 
 @front_app.exception_handler(StarletteHTTPException)
@@ -115,18 +163,16 @@ async def front_http_exception(
     render_html = ""
     if exc.status_code == status.HTTP_404_NOT_FOUND:
         render_html = "errors/404.html"
-    if exc.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR:
+    if exc.status_code in (
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+    ):
         render_html = "errors/500.html"
     if exc.status_code == status.HTTP_405_METHOD_NOT_ALLOWED:
         return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
 
-    session_generator = db_helper.session_getter()
-    session = await anext(session_generator)
     user = current_active_user_ui
-    try:
-        categories = await get_all_category(session=session)
-    finally:
-        await session_generator.aclose()
+    categories = await category_catalog.get()
     return templates.TemplateResponse(
         render_html,
         {
@@ -139,6 +185,7 @@ async def front_http_exception(
 
 
 @front_app.get("/", response_class=HTMLResponse)
+@cached_page(expire=settings.cache.page_home_ttl, tags=lambda _: ["list:categories"])
 async def home(
     request: Request,
     categories: Annotated[Sequence[Category], Depends(get_categories)],
@@ -155,6 +202,7 @@ async def home(
 
 
 @front_app.get("/api_doc", response_class=HTMLResponse)
+@cached_page(expire=settings.cache.page_api_doc_ttl, tags=lambda _: ["list:categories"])
 async def api_doc(
     request: Request,
     categories: Annotated[Sequence[Category], Depends(get_categories)],
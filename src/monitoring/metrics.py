@@ -0,0 +1,184 @@
+"""
+Метрики Prometheus. При запуске под gunicorn задайте PROMETHEUS_MULTIPROC_DIR:
+каждый воркер пишет значения в свои файлы, а /metrics собирает их вместе
+(см. gunicorn.conf.py).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.registry import REGISTRY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import Scope
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["app", "method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Запросы в обработке",
+    ["app"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "Выполненные SQL-запросы",
+    ["route"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Время выполнения SQL-запроса",
+    ["route"],
+    buckets=FAST_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Обращения к кешу ответов",
+    ["namespace", "result"],
+)
+TEMPLATE_RENDER = Histogram(
+    "template_render_seconds",
+    "Время рендеринга шаблона Jinja",
+    ["template"],
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Время получения соединения из пула БД",
+    ["pool"],
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Таймауты ожидания соединения из пула БД",
+    ["pool"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Соединения пула БД, выданные сессиям",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Соединения пула БД сверх pool_size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAITING = Gauge(
+    "db_pool_waiting_checkouts",
+    "Ожидающие соединения из пула БД",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Задержка event loop относительно запланированного пробуждения",
+    buckets=FAST_BUCKETS,
+)
+
+# scope текущего запроса: по нему SQL-запросы получают метку роута.
+current_scope: ContextVar[Scope | None] = ContextVar("metrics_scope", default=None)
+
+
+def route_label(scope: Scope | None) -> str:
+    if scope is None:
+        return "<background>"
+    route = scope.get("route")
+    if route is not None:
+        return scope.get("root_path", "") + route.path
+    if scope["path"].startswith("/static/"):
+        return "/static"
+    return "<unmatched>"
+
+
+def app_label(path: str) -> str:
+    return "api" if path == "/api" or path.startswith("/api/") else "front"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Время старта хранится в контексте выполнения: при ошибке запроса
+    # after_cursor_execute не вызывается, и контекст просто отбрасывается.
+    if context is not None:
+        context.metrics_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "metrics_started", None)
+    if started is None:
+        return
+    route = route_label(current_scope.get())
+    DB_QUERIES.labels(route).inc()
+    DB_QUERY_LATENCY.labels(route).observe(time.perf_counter() - started)
+
+
+class EventLoopLagMonitor:
+    """Периодически засыпает и измеряет, насколько позже планового он проснулся."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(max(loop.time() - started - self.interval, 0.0))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,89 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import ServerTimingConfig, settings
+
+from src.monitoring.metrics import (
+    REQUEST_LATENCY,
+    REQUESTS_IN_PROGRESS,
+    app_label,
+    current_scope,
+    route_label,
+)
+from src.monitoring.timing import track_timing
+
+
+class MetricsMiddleware:
+    """
+    Задержка HTTP-запросов по приложению (api/front) и шаблону роута,
+    число запросов в обработке. Метка роута берется из шаблона пути,
+    а не из самого пути, чтобы не плодить ряды.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: tuple[str, ...] = ()) -> None:
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        app = app_label(scope["path"])
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = current_scope.set(scope)
+        in_progress = REQUESTS_IN_PROGRESS.labels(app)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            REQUEST_LATENCY.labels(
+                app, scope["method"], route_label(scope), str(status_code)
+            ).observe(time.perf_counter() - started)
+            current_scope.reset(token)
+
+
+class ServerTimingMiddleware:
+    """
+    Добавляет заголовок Server-Timing с длительностями этапов: auth, categories,
+    db, cache, render/serialize и total. Включается для всех запросов через
+    SERVER_TIMING__ENABLED. Выбора по пользователю нет: кешированные роуты
+    отвечают, не определяя пользователя.
+    """
+
+    def __init__(
+        self, app: ASGIApp, config: ServerTimingConfig = settings.server_timing
+    ) -> None:
+        self.app = app
+        self.config = config
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.config.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with track_timing() as timing:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    extra = {}
+                    db_usage = scope.get("state", {}).get("db_usage")
+                    if db_usage is not None and db_usage.statements:
+                        extra["db"] = db_usage.db_seconds
+                    MutableHeaders(scope=message).append(
+                        "server-timing", timing.header(extra)
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,22 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from src.auth.fastapi_users import current_active_superuser
+from src.auth.models import User
+from src.config import settings
+from src.db.database import db_helper
+
+router = APIRouter(
+    prefix=settings.api.prefix_monitoring,
+    tags=["Monitoring"],
+)
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(
+    _: Annotated[User, Depends(current_active_superuser)],
+) -> dict[str, dict[str, float | int]]:
+    # Статистика пула текущего воркера: у каждого процесса свой пул.
+    # Сводные значения по всем воркерам - метрики db_pool_* в /metrics.
+    return db_helper.pool_stats()
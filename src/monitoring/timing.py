@@ -0,0 +1,59 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class ServerTiming:
+    """
+    Длительности этапов обработки одного запроса для заголовка Server-Timing.
+    Одноименные этапы суммируются (например, несколько обращений к Redis).
+    """
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self, extra: dict[str, float] | None = None) -> str:
+        phases = {**self.phases, **(extra or {})}
+        phases["total"] = time.perf_counter() - self.started
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items()
+        )
+
+
+_server_timing: ContextVar[ServerTiming | None] = ContextVar(
+    "server_timing", default=None
+)
+
+
+def current_timing() -> ServerTiming | None:
+    return _server_timing.get()
+
+
+@contextmanager
+def track_timing() -> Iterator[ServerTiming]:
+    timing = ServerTiming()
+    token = _server_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _server_timing.reset(token)
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    timing = _server_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
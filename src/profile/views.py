@@ -10,7 +10,7 @@ from fastapi import (
     Path,
     Query,
 )
-from fastapi.templating import Jinja2Templates
+from src.common.templates import TimedTemplates
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi_users.exceptions import (
     InvalidPasswordException,
@@ -32,13 +32,12 @@ from .schemas import EditProfileForm
 from src.category.models import Category
 from src.common.dependencies import get_categories
 from src.config import settings
-from src.auth.fastapi_users import current_active_user_ui
+from src.auth.fastapi_users import auth_backend_cookie, current_active_user_ui
 from src.auth.models import User
 from src.db.database import db_helper
 from src.favorite.dependencies import remove_favorite
-from src.utils.utils import verify_password
 
-templates = Jinja2Templates(directory="templates")
+templates = TimedTemplates(directory="templates")
 
 router = APIRouter(prefix=settings.views.prefix_profile, include_in_schema=False)
 
@@ -47,10 +46,11 @@ router = APIRouter(prefix=settings.views.prefix_profile, include_in_schema=False
 async def profile(
     request: Request,
     user: Annotated[User, Depends(current_active_user_ui)],
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     categories: Sequence[Category] = Depends(get_categories),
     page: str | None = Query(None),
     page_size: str | None = Query(None),
+    cursor: str | None = Query(None),
 ):
     if user is None:
         return RedirectResponse(url="/login", status_code=status.HTTP_302_FOUND)
@@ -66,16 +66,19 @@ async def profile(
         query_params.page_size = 9
 
     # favorites = await get_user_favorites(user=user, session=session)
-    favorites = await get_all_favorites_with_pagination(
+    favorites_page = await get_all_favorites_with_pagination(
         user=user,
         session=session,
         page=query_params.page,
         limit=query_params.page_size,
+        cursor=cursor,
     )
-    total_favorites = await get_total_favorites_count(user=user, session=session)
-    total_pages_favorites = (
-        total_favorites + query_params.page_size - 1
-    ) // query_params.page_size
+    total_pages_favorites = None
+    if settings.pagination.count_total:
+        total_favorites = await get_total_favorites_count(user=user, session=session)
+        total_pages_favorites = (
+            total_favorites + query_params.page_size - 1
+        ) // query_params.page_size
 
     return templates.TemplateResponse(
         "auth/profile.html",
@@ -83,10 +86,12 @@ async def profile(
             "request": request,
             "user": user,
             "categories": categories,
-            "favorites": favorites,
+            "favorites": favorites_page.items,
             "page": query_params.page,
             "page_size": query_params.page_size,
             "total_pages_favorites": total_pages_favorites,
+            "next_cursor": favorites_page.next_cursor,
+            "prev_cursor": favorites_page.prev_cursor,
         },
     )
 
@@ -145,6 +150,11 @@ async def edit_profile(
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
+    # Пользователь мог прийти из кеша авторизации без hashed_password,
+    # для изменения профиля читаем его из БД.
+    user = await user_manager.get(user.id)
+    token_version = user.token_version
+
     if form.email != user.email:
         try:
             is_user_exist = await user_manager.get_by_email(user_email=form.email)
@@ -154,7 +164,9 @@ async def edit_profile(
             pass
 
     if form.change_password:
-        if not verify_password(form.current_password, user.hashed_password):
+        if not await user_manager.password_helper.verify_async(
+            form.current_password, user.hashed_password
+        ):
             errors.append("Текущий пароль введен неправильно.")
 
     if form.username != user.username:
@@ -216,7 +228,7 @@ async def edit_profile(
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "auth/edit_profile.html",
         {
             "request": request,
@@ -226,6 +238,21 @@ async def edit_profile(
         },
         status_code=status.HTTP_200_OK,
     )
+    if user.token_version != token_version:
+        # Смена пароля или email отозвала токены, выдаем новый для текущей сессии.
+        token = await auth_backend_cookie.get_strategy().write_token(user)
+        response.set_cookie(
+            key=auth_backend_cookie.transport.cookie_name,
+            value=token,
+            max_age=auth_backend_cookie.transport.cookie_max_age,
+            expires=auth_backend_cookie.transport.cookie_max_age,
+            path=auth_backend_cookie.transport.cookie_path,
+            domain=auth_backend_cookie.transport.cookie_domain,
+            secure=auth_backend_cookie.transport.cookie_secure,
+            httponly=auth_backend_cookie.transport.cookie_httponly,
+            samesite=auth_backend_cookie.transport.cookie_samesite,
+        )
+    return response
 
 
 @router.get("/delete_favorite/{favorite_id}")
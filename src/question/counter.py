@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from collections import Counter
+
+from src.config import settings
+from src.db.database import db_helper
+from src.question.dependencies import add_question_views
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+    Копит просмотры вопросов (по slug) в памяти воркера и периодически сбрасывает их
+    в БД одним пакетом `UPDATE ... SET views = views + delta`.
+    При остановке приложения накопленные просмотры сбрасываются принудительно.
+
+    Slug приходит из URL до того, как известно, есть ли такой вопрос, поэтому
+    число разных slug в памяти ограничено max_pending: иначе запросы к
+    несуществующим страницам копились бы до сброса без предела. Просмотры
+    новых slug сверх лимита отбрасываются, несуществующие slug отбрасывает
+    сам UPDATE при сбросе.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int) -> None:
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Counter[str] = Counter()
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    def incr(self, slug: str) -> None:
+        if slug in self._pending or len(self._pending) < self.max_pending:
+            self._pending[slug] += 1
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, Counter()
+        try:
+            async with db_helper.session_factory() as session:
+                await add_question_views(views=pending, session=session)
+        except Exception as err:
+            logger.error("Не удалось сохранить просмотры вопросов: %s", err)
+            # Вернем просмотры обратно, чтобы сохранить их при следующем сбросе,
+            # не превышая лимит.
+            for slug, delta in pending.items():
+                if slug in self._pending or len(self._pending) < self.max_pending:
+                    self._pending[slug] += delta
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Задача не отменяется: отмена посреди flush потеряла бы уже
+            # забранные из _pending просмотры. Цикл завершается сам, дождавшись
+            # текущего сброса.
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+
+def count_question_view(slug: str) -> None:
+    # Зависимость роута: выполняется и когда страница отдается из кеша.
+    view_counter.incr(slug)
+
+
+view_counter = ViewCounter(
+    flush_interval=settings.views_counter.flush_interval,
+    max_pending=settings.views_counter.max_pending,
+)
@@ -1,15 +1,36 @@
-from typing import Sequence
+from typing import AsyncIterator, Sequence, Mapping
 
 from slugify import slugify
-from sqlalchemy import select, func, desc
+from sqlalchemy import Select, select, func, desc, update, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from src.common.cache import response_cache
+from src.common.pagination import Page, paginate
+from src.common.projection import Projection, select_fields
+from src.common.schemas import FieldsQuery
 from src.favorite.models import Favorite
 from src.category.dependencies import get_category_by_id
-from src.question.schemas import QuestionRead, QuestionCreate, QuestionUpdate
+from src.question.schemas import (
+    QuestionRead,
+    QuestionCreate,
+    QuestionUpdate,
+    QuestionListQuery,
+)
 from fastapi import HTTPException, status
 from src.question.models import Question
+from src.question.projections import QUESTION_READ
+from src.answer.models import Answer
+from src.category.models import Category
+
+# Вопрос встроен в ответы со списками вопросов и ответов.
+QUESTION_LIST_TAGS = ("list:questions", "list:answers")
+
+# Порядок списка API: дополнительный столбец сортировки и направление.
+QUESTION_ORDERS = {
+    "id": (None, False),
+    "-id": (None, True),
+}
 
 
 async def get_all_question(session: AsyncSession) -> Sequence[Question]:
@@ -23,13 +44,123 @@ async def get_all_question(session: AsyncSession) -> Sequence[Question]:
     return result.all()
 
 
+async def get_questions_page(query: QuestionListQuery, session: AsyncSession) -> Page:
+    """
+    Страница ORM-объектов для QuestionRead. Роуты API ее не используют, они
+    читают столбцы через get_questions_page_rows; функция осталась эталоном прежнего пути
+    чтения для benchmarks.read_path и benchmarks.data_access.
+    """
+    stmt = (
+        select(Question)
+        .options(selectinload(Question.category))
+        .options(selectinload(Question.answer))
+    )
+    if query.category_id is not None:
+        stmt = stmt.where(Question.category_id == query.category_id)
+    if query.category is not None:
+        stmt = stmt.join(Question.category).where(Category.slug == query.category)
+    if query.has_answer is not None:
+        has_answer = Question.answer.has()
+        stmt = stmt.where(has_answer if query.has_answer else ~has_answer)
+    if query.min_views is not None:
+        stmt = stmt.where(Question.views >= query.min_views)
+    sort_column, descending = QUESTION_ORDERS[query.order]
+    return await paginate(
+        session=session,
+        stmt=stmt,
+        key_column=Question.id,
+        limit=query.limit,
+        cursor=query.cursor,
+        descending=descending,
+        sort_column=sort_column,
+    )
+
+
+def select_question_rows(
+    projection: Projection,
+    join_category: bool = False,
+    join_answer: bool = False,
+) -> Select:
+    # Таблицы связей присоединяются, только если их столбцы выбраны или по
+    # ним фильтруют: category_id обязателен, и JOIN не отсекает строки.
+    stmt = select(*projection.columns())
+    if join_category or "category" in projection.fields:
+        stmt = stmt.join(Question.category)
+    if join_answer or "answer" in projection.fields:
+        stmt = stmt.outerjoin(Question.answer)
+    return stmt
+
+
+async def get_questions_page_rows(
+    query: QuestionListQuery, session: AsyncSession
+) -> Page:
+    """
+    То же, что get_questions_page, но выбираются только столбцы QuestionRead
+    (или поля из ?fields= и ?expand=) одним запросом с JOIN, а элементы
+    страницы - готовые словари.
+    """
+    projection = select_fields(QUESTION_READ, query)
+    stmt = select_question_rows(
+        projection,
+        join_category=query.category is not None,
+        join_answer=query.has_answer is not None,
+    )
+    if query.category_id is not None:
+        stmt = stmt.where(Question.category_id == query.category_id)
+    if query.category is not None:
+        stmt = stmt.where(Category.slug == query.category)
+    if query.has_answer is not None:
+        stmt = stmt.where(
+            Answer.id.is_not(None) if query.has_answer else Answer.id.is_(None)
+        )
+    if query.min_views is not None:
+        stmt = stmt.where(Question.views >= query.min_views)
+    sort_column, descending = QUESTION_ORDERS[query.order]
+    page = await paginate(
+        session=session,
+        stmt=stmt,
+        key_column=Question.id,
+        limit=query.limit,
+        cursor=query.cursor,
+        descending=descending,
+        sort_column=sort_column,
+        mappings=True,
+    )
+    page.items = projection.to_dicts(page.items)
+    return page
+
+
+async def stream_all_questions(
+    session: AsyncSession, batch_size: int
+) -> AsyncIterator[Sequence[Question]]:
+    # Один запрос с JOIN вместо selectinload: связи приходят в той же строке
+    # серверного курсора. HTML ответа в выгрузке не нужен.
+    stmt = (
+        select(Question)
+        .options(joinedload(Question.category))
+        .options(joinedload(Question.answer).defer(Answer.content))
+        .order_by(Question.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream_scalars(stmt)
+    async for partition in result.partitions():
+        yield partition
+
+
 async def get_all_questions_with_pagination(
-    session: AsyncSession, page: int = 1, limit: int = 9
-) -> Sequence[Question]:
-    offset = (page - 1) * limit
-    stmt = select(Question).order_by(desc(Question.id)).offset(offset).limit(limit)
-    result = await session.scalars(stmt)
-    return result.all()
+    session: AsyncSession,
+    page: int = 1,
+    limit: int = 9,
+    cursor: str | None = None,
+) -> Page:
+    return await paginate(
+        session=session,
+        stmt=select(Question),
+        key_column=Question.id,
+        limit=limit,
+        page=page,
+        cursor=cursor,
+    )
 
 
 async def get_total_questions_count(session: AsyncSession):
@@ -56,6 +187,21 @@ async def get_question_by_id(
     return question
 
 
+async def get_question_row_by_id(
+    question_id: int,
+    session: AsyncSession,
+    selection: FieldsQuery = FieldsQuery(),
+) -> dict:
+    projection = select_fields(QUESTION_READ, selection)
+    stmt = select_question_rows(projection).where(Question.id == question_id)
+    row = (await session.execute(stmt)).mappings().first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Question not found"
+        )
+    return projection.to_dict(row)
+
+
 async def get_question_by_id_view(
     question_id: int, session: AsyncSession
 ) -> Question | None:
@@ -82,13 +228,19 @@ async def get_question_by_slug(slug: str, session: AsyncSession) -> Question | N
     return question
 
 
-async def update_question_counter(slug: str, session: AsyncSession) -> None:
-    stmt = select(Question).where(Question.slug == slug)
-    result = await session.scalars(stmt)
-    question = result.first()
-    question.views += 1
+async def add_question_views(views: Mapping[str, int], session: AsyncSession) -> None:
+    table = Question.__table__
+    stmt = (
+        update(table)
+        .where(table.c.slug == bindparam("question_slug"))
+        .values(views=table.c.views + bindparam("delta"))
+    )
+    # Сортировка задает одинаковый порядок блокировок строк во всех воркерах.
+    params = [
+        {"question_slug": slug, "delta": delta} for slug, delta in sorted(views.items())
+    ]
+    await session.execute(stmt, params)
     await session.commit()
-    await session.refresh(question)
 
 
 async def create_question(
@@ -128,6 +280,7 @@ async def create_question(
     )
     result = await session.scalars(stmt)
     question_with_relations = result.first()
+    await response_cache.invalidate(*QUESTION_LIST_TAGS)
 
     return question_with_relations
 
@@ -143,6 +296,7 @@ async def update_question(
     session.add(question)
     await session.commit()
     await session.refresh(question)
+    await response_cache.invalidate(f"question:{question.id}", *QUESTION_LIST_TAGS)
     return question
 
 
@@ -171,4 +325,5 @@ async def delete_question_by_id(
         )
     await session.delete(question)
     await session.commit()
+    await response_cache.invalidate(f"question:{question_id}", *QUESTION_LIST_TAGS)
     return {"success": "ok"}
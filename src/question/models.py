@@ -1,4 +1,5 @@
-from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy import Integer, String, ForeignKey, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.db.base import Base
 from typing import TYPE_CHECKING
@@ -9,11 +10,27 @@ if TYPE_CHECKING:
 
 
 class Question(Base):
+    __table_args__ = (
+        Index("ix_questions_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset-пагинация списков API по категории. Индекса по views нет
+        # намеренно: счетчик просмотров обновляется чаще всего, и с индексом
+        # его UPDATE перестал бы быть HOT.
+        Index("ix_questions_category_id_id", "category_id", "id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(150), nullable=False)
     slug: Mapped[str] = mapped_column(String(150), unique=True, nullable=False)
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"))
     views: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', title), 'A') || "
+            "setweight(to_tsvector('english', title), 'A')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     category: Mapped["Category"] = relationship("Category", back_populates="questions")
     answer: Mapped["Answer"] = relationship(
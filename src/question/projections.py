@@ -0,0 +1,14 @@
+from src.category.projections import CATEGORY_READ
+from src.common.projection import Projection
+from src.question.models import Question
+
+QUESTION_READ_NESTED = Projection(
+    title=Question.title,
+    category_id=Question.category_id,
+    id=Question.id,
+    category=CATEGORY_READ,
+)
+
+from src.answer.projections import ANSWER_READ_NESTED
+
+QUESTION_READ = QUESTION_READ_NESTED.extend(answer=ANSWER_READ_NESTED)
@@ -1,23 +1,26 @@
 import time
 from typing import Annotated
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Request, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from bs4 import BeautifulSoup
 
-from src.common.dependencies import custom_cache_key_builder
+from src.common.cache import cached, page_tags, query_model_key_builder
+from src.common.schemas import CursorPage, FieldsQuery
+from src.common.export import NDJSON_MEDIA_TYPE, ndjson_response
 from src.auth.models import User
 from .dependencies import (
-    get_all_question,
-    get_question_by_id,
+    get_questions_page_rows,
+    stream_all_questions,
+    get_question_row_by_id,
     create_question,
     update_question,
     delete_question_by_id,
 )
 from src.db.database import db_helper
-from .schemas import QuestionUpdate, QuestionRead, QuestionCreate
+from .schemas import QuestionUpdate, QuestionRead, QuestionCreate, QuestionListQuery
 from src.config import settings
 from src.auth.fastapi_users import current_active_superuser
-from fastapi_cache.decorator import cache
 
 router = APIRouter(
     prefix=settings.api.prefix_question,
@@ -25,22 +28,59 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=list[QuestionRead])
-@cache(expire=settings.redis.cache_ttl, key_builder=custom_cache_key_builder)
+def question_tags(question: dict) -> list[str]:
+    # Связи, не выбранные через ?fields= и ?expand=, запись кеша не сбрасывают.
+    tags = [f"question:{question['id']}"]
+    if question.get("category") is not None:
+        tags.append(f"category:{question['category']['id']}")
+    if question.get("answer") is not None:
+        tags.append(f"answer:{question['answer']['id']}")
+    return tags
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_questions(request: Request):
+    """Все вопросы потоком NDJSON: по одному QuestionRead в строке."""
+    return ndjson_response(
+        request,
+        lambda session: stream_all_questions(session, settings.export.batch_size),
+        QuestionRead,
+    )
+
+
+@router.get("", response_model=CursorPage[QuestionRead])
+@cached(
+    CursorPage[QuestionRead],
+    key_builder=query_model_key_builder,
+    tags=page_tags("list:questions"),
+    validate=False,
+)
 async def get_questions(
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)]
+    query: Annotated[QuestionListQuery, Query()],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ):
-    questions = await get_all_question(session=session)
-    return questions
+    return await get_questions_page_rows(query=query, session=session)
 
 
 @router.get("/{question_id}", response_model=QuestionRead)
-@cache(expire=settings.redis.cache_ttl, key_builder=custom_cache_key_builder)
+@cached(
+    QuestionRead,
+    key_builder=query_model_key_builder,
+    tags=question_tags,
+    validate=False,
+)
 async def get_question(
     question_id: int,
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    selection: Annotated[FieldsQuery, Query()],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ):
-    question = await get_question_by_id(question_id=question_id, session=session)
+    question = await get_question_row_by_id(
+        question_id=question_id, session=session, selection=selection
+    )
     return question
 
 
@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import ClassVar, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from src.category.schemas import CategoryRead
+from src.common.schemas import CursorQuery, FieldsQuery
 
 
 class QuestionBase(BaseModel):
@@ -19,6 +20,16 @@ class QuestionUpdate(BaseModel):
     # category_id: int
 
 
+class QuestionListQuery(CursorQuery, FieldsQuery):
+    category_id: int | None = None
+    category: str | None = Field(None, description="slug категории")
+    has_answer: bool | None = None
+    min_views: int | None = Field(None, ge=0)
+    order: Literal["id", "-id"] = "id"
+
+    uncached_fields: ClassVar[tuple[str, ...]] = ("cursor", "min_views")
+
+
 class QuestionReadBase(QuestionBase):
     id: int
     category: "CategoryRead"
@@ -8,16 +8,18 @@ from src.favorite.dependencies import add_favorite, get_user_favorites
 from src.favorite.schemas import FavoriteCreate
 from src.question.dependencies import get_question_by_id
 from src.category.models import Category
-from src.question.dependencies import get_question_by_slug, update_question_counter
+from src.question.dependencies import get_question_by_slug
+from src.question.counter import count_question_view
+from src.common.cache import cached_page
 from src.db.database import db_helper
 from src.config import settings
 from src.auth.models import User
 from src.auth.fastapi_users import current_active_user_ui
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from src.common.templates import TimedTemplates
 from src.common.dependencies import get_categories
 
-templates = Jinja2Templates(directory="templates")
+templates = TimedTemplates(directory="templates")
 
 router = APIRouter(
     prefix=settings.views.prefix_question,
@@ -25,11 +27,31 @@ router = APIRouter(
 )
 
 
-@router.get("/{slug}", response_class=HTMLResponse)
+def question_page_tags(context: dict) -> list[str] | None:
+    question = context.get("question")
+    if question is None:
+        return None
+    return [
+        f"question:{question.id}",
+        f"category:{question.category_id}",
+        "list:categories",
+    ]
+
+
+@router.get(
+    "/{slug}",
+    response_class=HTMLResponse,
+    dependencies=[Depends(count_question_view)],
+)
+@cached_page(
+    expire=settings.cache.page_question_ttl,
+    tags=question_page_tags,
+    bypass=("error", "success"),
+)
 async def view_single_question(
     request: Request,
     slug: str,
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     user: Annotated[User, Depends(current_active_user_ui)] = None,
     categories: Sequence[Category] = Depends(get_categories),
     error: str = Query(None),
@@ -53,7 +75,6 @@ async def view_single_question(
     if user:
         favorites = await get_user_favorites(user=user, session=session)
         favorite_question_ids = [favorite.question_id for favorite in favorites]
-    await update_question_counter(slug=slug, session=session)
     return templates.TemplateResponse(
         "question_detail.html",
         {
@@ -0,0 +1,114 @@
+from html import escape
+
+from markupsafe import Markup
+from sqlalchemy import select, func, exists, cast
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.answer.models import Answer
+from src.question.models import Question
+
+SEARCH_CONFIGS = ("russian", "english")
+# ts_headline не экранирует текст, поэтому границы совпадений отмечаются
+# управляющими символами, а <mark> подставляется уже после экранирования.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", '
+    "MaxWords=35, MinWords=15, MaxFragments=2"
+)
+
+
+def build_search_query(search: str) -> ColumnElement:
+    queries = [func.websearch_to_tsquery(config, search) for config in SEARCH_CONFIGS]
+    search_query = queries[0]
+    for query in queries[1:]:
+        search_query = search_query.op("||")(query)
+    return search_query
+
+
+def question_search_filter(search: str) -> ColumnElement:
+    search_query = build_search_query(search)
+    answer_match = exists().where(
+        Answer.question_id == Question.id,
+        Answer.search_vector.bool_op("@@")(search_query),
+    )
+    return Question.search_vector.bool_op("@@")(search_query) | answer_match
+
+
+def render_highlight(headline: str | None) -> Markup | None:
+    """Фрагмент ts_headline в HTML: текст экранируется, разметка - только <mark>."""
+    if headline is None:
+        return None
+    return Markup(
+        escape(headline)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_STOP, "</mark>")
+    )
+
+
+def _search_document() -> ColumnElement:
+    return Question.search_vector.op("||")(
+        func.coalesce(Answer.search_vector, cast("", TSVECTOR))
+    )
+
+
+async def search_questions(
+    search: str,
+    session: AsyncSession,
+    offset: int = 0,
+    limit: int = 9,
+) -> list[tuple]:
+    """
+    Вопросы страницы поиска: (вопрос, ранг, подсветка заголовка, подсветка
+    ответа). Подсветка - безопасный HTML, где размечены только совпадения.
+    """
+    search_query = build_search_query(search)
+    document = _search_document()
+    rank = func.ts_rank(document, search_query)
+    ranked = (
+        select(Question.id.label("id"), rank.label("rank"))
+        .outerjoin(Answer, Answer.question_id == Question.id)
+        .where(question_search_filter(search))
+        .order_by(rank.desc(), Question.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .subquery()
+    )
+    # Подсветка дорогая, поэтому строится только для строк текущей страницы.
+    title_highlight = func.ts_headline(
+        SEARCH_CONFIGS[0], Question.title, search_query, HEADLINE_OPTIONS
+    )
+    answer_highlight = func.ts_headline(
+        SEARCH_CONFIGS[0],
+        Answer.content_text,
+        search_query,
+        HEADLINE_OPTIONS,
+    )
+    stmt = (
+        select(
+            Question,
+            ranked.c.rank,
+            title_highlight.label("title_highlight"),
+            answer_highlight.label("answer_highlight"),
+        )
+        .join(ranked, ranked.c.id == Question.id)
+        .outerjoin(Answer, Answer.question_id == Question.id)
+        .options(selectinload(Question.category))
+        .order_by(ranked.c.rank.desc(), Question.id.desc())
+    )
+    result = await session.execute(stmt)
+    return [
+        (question, rank, render_highlight(title), render_highlight(answer))
+        for question, rank, title, answer in result
+    ]
+
+
+async def get_search_count(search: str, session: AsyncSession) -> int:
+    stmt = (
+        select(func.count()).select_from(Question).where(question_search_filter(search))
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one()
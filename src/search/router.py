@@ -0,0 +1,46 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db.database import db_helper
+from .dependencies import search_questions
+from .schemas import SearchResultRead
+
+router = APIRouter(
+    prefix=settings.api.prefix_search,
+    tags=["Search"],
+)
+
+
+@router.get("", response_model=list[SearchResultRead])
+async def search(
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(9, ge=1, le=50),
+):
+    """
+    Ответ не кешируется: q - произвольный текст, и каждый запрос создавал бы
+    свою запись кеша.
+    """
+    rows = await search_questions(
+        search=q,
+        session=session,
+        offset=(page - 1) * page_size,
+        limit=page_size,
+    )
+    return [
+        SearchResultRead(
+            id=question.id,
+            title=question.title,
+            slug=question.slug,
+            views=question.views,
+            category=question.category,
+            rank=rank,
+            title_highlight=title_highlight,
+            answer_highlight=answer_highlight,
+        )
+        for question, rank, title_highlight, answer_highlight in rows
+    ]
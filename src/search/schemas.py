@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from src.category.schemas import CategoryRead
+
+
+class SearchResultRead(BaseModel):
+    id: int
+    title: str
+    slug: str
+    views: int
+    category: CategoryRead
+    rank: float
+    title_highlight: str
+    answer_highlight: str | None = None
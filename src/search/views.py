@@ -0,0 +1,72 @@
+from typing import Annotated, Sequence
+from math import ceil
+
+from fastapi import APIRouter, Depends, Request, Query
+from fastapi.responses import HTMLResponse
+from src.common.templates import TimedTemplates
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.fastapi_users import current_active_user_ui
+from src.auth.models import User
+from src.category import Category
+from src.common.dependencies import get_categories
+from src.common.schemas import PaginationQuery
+from src.config import settings
+from src.db.database import db_helper
+from .dependencies import search_questions, get_search_count
+
+templates = TimedTemplates(directory="templates")
+
+router = APIRouter(
+    prefix=settings.views.prefix_search,
+    include_in_schema=False,
+)
+
+
+@router.get("", response_class=HTMLResponse)
+async def view_search(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
+    user: Annotated[User, Depends(current_active_user_ui)] = None,
+    categories: Sequence[Category] = Depends(get_categories),
+    q: str = Query(""),
+    page: str | None = Query(None),
+    page_size: str | None = Query(None),
+):
+    query_params: PaginationQuery = PaginationQuery()
+    try:
+        query_params = PaginationQuery(
+            page=page,
+            page_size=page_size,
+        )
+    except ValidationError:
+        query_params.page = 1
+        query_params.page_size = 9
+
+    search = q.strip()[:200]
+    results = []
+    total_pages = 0
+    if search:
+        results = await search_questions(
+            search=search,
+            session=session,
+            offset=(query_params.page - 1) * query_params.page_size,
+            limit=query_params.page_size,
+        )
+        total_results = await get_search_count(search=search, session=session)
+        total_pages = ceil(total_results / query_params.page_size)
+
+    return templates.TemplateResponse(
+        "search.html",
+        {
+            "request": request,
+            "user": user,
+            "categories": categories,
+            "results": results,
+            "q": search,
+            "page": query_params.page,
+            "page_size": query_params.page_size,
+            "total_pages": total_pages,
+        },
+    )
@@ -2,7 +2,7 @@ import os
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 import asyncio
-from fastapi_users.password import PasswordHelper
+from src.auth.password import password_helper
 from sqlalchemy import select
 from src.auth.models import User
 from src.favorite.models import Favorite
@@ -25,8 +25,7 @@ async def create_superuser():
     username = os.environ.get("ADMIN_USERNAME", "admin")
     email = os.environ.get("ADMIN_EMAIL", "admin@example.com")
     password = os.environ.get("ADMIN_PASSWORD", "admin")
-    passwd_helper = PasswordHelper()
-    hashed_password = passwd_helper.hash(password)
+    hashed_password = await password_helper.hash_async(password)
     stmt = select(User).where(User.email == email)
 
     async with async_session_maker() as session:
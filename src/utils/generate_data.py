@@ -0,0 +1,436 @@
+"""
+Генератор синтетического каталога для проверки масштабирования.
+
+Создает категории, вопросы с ответами, пользователей и избранное и загружает
+их через COPY (asyncpg), минуя ORM: миллион вопросов загружается за минуты.
+Данные детерминированы: одинаковые seed и размеры дают одинаковые строки.
+Просмотры и избранное распределены по закону Ципфа - небольшая доля вопросов
+собирает большую часть внимания, как на настоящем сайте.
+
+Запуск:
+    python -m src.utils.generate_data --questions 1000000 --users 100000
+
+Новые строки добавляются к существующим (id продолжают текущие), --truncate
+предварительно очищает каталог и всех пользователей, кроме суперпользователей.
+"""
+
+import argparse
+import asyncio
+import bisect
+import html
+import itertools
+import logging
+import os
+import random
+import time
+from typing import Iterator
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from src.answer.models import Answer
+from src.auth.models import User
+from src.auth.password import password_helper
+from src.category.models import Category
+from src.config import settings
+from src.favorite.models import Favorite
+from src.question.models import Question
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.environ.get("DATABASE_URL", f"{settings.db.url}")
+
+TOPICS = [
+    "Docker",
+    "Kubernetes",
+    "Linux",
+    "Сети",
+    "CI/CD",
+    "Terraform",
+    "Ansible",
+    "Мониторинг",
+    "PostgreSQL",
+    "Облака",
+    "Nginx",
+    "Git",
+    "Безопасность",
+    "Логирование",
+    "Helm",
+]
+TITLE_TEMPLATES = [
+    "Как настроить {0} для {1}?",
+    "Чем {0} отличается от {1}?",
+    "Почему {0} не видит {1}?",
+    "How to configure {0} with {1}?",
+    "What is the difference between {0} and {1}?",
+    "Why does {0} fail after {1} update?",
+]
+TERMS = [
+    "контейнер",
+    "образ",
+    "volume",
+    "deployment",
+    "ingress",
+    "pod",
+    "service",
+    "nginx",
+    "systemd",
+    "cgroups",
+    "pipeline",
+    "runner",
+    "terraform state",
+    "playbook",
+    "alertmanager",
+    "prometheus",
+    "replica",
+    "backup",
+    "load balancer",
+    "dns",
+    "iptables",
+    "helm chart",
+    "secret",
+    "configmap",
+]
+WORDS = TERMS + [
+    "нужно",
+    "сначала",
+    "проверить",
+    "настройки",
+    "запустить",
+    "команду",
+    "после",
+    "этого",
+    "the",
+    "you",
+    "should",
+    "check",
+    "logs",
+    "and",
+    "restart",
+    "if",
+    "needed",
+]
+CODE_SNIPPETS = [
+    "kubectl get pods -A",
+    "docker compose up -d",
+    "systemctl restart nginx",
+    "terraform plan -out=tfplan",
+    "ansible-playbook -i inventory site.yml",
+]
+
+# Столбцы COPY; вычисляемые search_vector заполняет сам PostgreSQL.
+CATEGORY_COLUMNS = ("id", "name", "slug", "description")
+QUESTION_COLUMNS = ("id", "title", "slug", "category_id", "views")
+ANSWER_COLUMNS = ("id", "content", "content_text", "question_id")
+USER_COLUMNS = (
+    "id",
+    "email",
+    "username",
+    "hashed_password",
+    "is_active",
+    "is_superuser",
+    "is_verified",
+    "token_version",
+)
+FAVORITE_COLUMNS = ("id", "user_id", "question_id")
+
+SEARCH_INDEXES = {
+    "ix_questions_search_vector": Question.__tablename__,
+    "ix_answers_search_vector": Answer.__tablename__,
+}
+
+
+class ZipfSampler:
+    """
+    Выбор вопросов с вероятностью, обратной степени их ранга популярности.
+    Ранги назначаются случайной перестановкой, чтобы популярность
+    не совпадала с порядком id.
+    """
+
+    def __init__(self, count: int, exponent: float, rnd: random.Random) -> None:
+        self.ranked = list(range(count))
+        rnd.shuffle(self.ranked)
+        self.cum_weights = list(
+            itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1))
+        )
+        self.rnd = rnd
+
+    def sample(self) -> int:
+        """Номер вопроса (от 0)."""
+        point = self.rnd.random() * self.cum_weights[-1]
+        rank = bisect.bisect_left(self.cum_weights, point)
+        return self.ranked[min(rank, len(self.ranked) - 1)]
+
+    def rank(self) -> list[int]:
+        """Ранг (от 1) каждого вопроса по его номеру."""
+        ranks = [0] * len(self.ranked)
+        for rank, index in enumerate(self.ranked, start=1):
+            ranks[index] = rank
+        return ranks
+
+
+class DataGenerator:
+    def __init__(
+        self,
+        questions: int,
+        users: int,
+        categories: int,
+        favorites_per_user: float,
+        max_views: int,
+        seed: int,
+    ) -> None:
+        self.questions = questions
+        self.users = users
+        self.categories = categories
+        self.favorites_per_user = favorites_per_user
+        self.max_views = max_views
+        self.seed = seed
+
+    def _rnd(self, stream: str) -> random.Random:
+        # Отдельный генератор на каждую таблицу: изменение размера одной
+        # таблицы не меняет содержимое остальных.
+        return random.Random(f"{self.seed}:{stream}")
+
+    def category_rows(self, first_id: int) -> Iterator[tuple]:
+        for number in range(self.categories):
+            topic = TOPICS[number % len(TOPICS)]
+            suffix = "" if number < len(TOPICS) else f" {number // len(TOPICS) + 1}"
+            category_id = first_id + number
+            yield (
+                category_id,
+                f"{topic}{suffix} #{category_id}",
+                f"category-{category_id}",
+                f"Вопросы и ответы по теме {topic}",
+            )
+
+    def question_rows(self, first_id: int, first_category_id: int) -> Iterator[tuple]:
+        rnd = self._rnd("questions")
+        ranks = ZipfSampler(self.questions, 1.0, self._rnd("views")).rank()
+        for number in range(self.questions):
+            question_id = first_id + number
+            template = rnd.choice(TITLE_TEMPLATES)
+            title = template.format(*rnd.sample(TERMS, 2))
+            yield (
+                question_id,
+                title[:150],
+                f"question-{question_id}",
+                first_category_id + rnd.randrange(self.categories),
+                int(self.max_views / ranks[number]),
+            )
+
+    def answer_rows(self, first_id: int, first_question_id: int) -> Iterator[tuple]:
+        rnd = self._rnd("answers")
+        for number in range(self.questions):
+            # Логнормальное число абзацев: в основном короткие ответы,
+            # изредка очень длинные.
+            paragraphs = min(max(int(rnd.lognormvariate(1.0, 0.8)), 1), 60)
+            parts = []
+            texts = []
+            for _ in range(paragraphs):
+                text = " ".join(rnd.choices(WORDS, k=rnd.randint(10, 90)))
+                parts.append(f"<p>{html.escape(text)}</p>")
+                texts.append(text)
+                if rnd.random() < 0.25:
+                    snippet = rnd.choice(CODE_SNIPPETS)
+                    parts.append(f"<pre><code>{html.escape(snippet)}</code></pre>")
+                    texts.append(snippet)
+            # Совпадает с html_to_text для такой разметки, но без разбора HTML.
+            content_text = "\n".join(texts)
+            yield (
+                first_id + number,
+                "".join(parts),
+                content_text,
+                first_question_id + number,
+            )
+
+    def user_rows(self, first_id: int, hashed_password: str) -> Iterator[tuple]:
+        for number in range(self.users):
+            user_id = first_id + number
+            yield (
+                user_id,
+                f"user{user_id}@example.com",
+                f"user{user_id}",
+                hashed_password,
+                True,
+                False,
+                True,
+                0,
+            )
+
+    def favorite_rows(
+        self, first_id: int, first_user_id: int, first_question_id: int
+    ) -> Iterator[tuple]:
+        rnd = self._rnd("favorites")
+        sampler = ZipfSampler(self.questions, 1.0, self._rnd("views"))
+        favorite_id = first_id
+        for number in range(self.users):
+            # Распределение Парето со средним favorites_per_user:
+            # большинство добавляет пару вопросов, единицы - сотни.
+            count = int(self.favorites_per_user * (rnd.paretovariate(2.0) - 1))
+            count = min(count, self.questions // 2)
+            chosen = set()
+            while len(chosen) < count:
+                chosen.add(sampler.sample())
+            for question in sorted(chosen):
+                yield (
+                    favorite_id,
+                    first_user_id + number,
+                    first_question_id + question,
+                )
+                favorite_id += 1
+
+
+async def next_id(connection: asyncpg.Connection, table: str) -> int:
+    return await connection.fetchval(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")
+
+
+async def copy_rows(
+    connection: asyncpg.Connection,
+    table: str,
+    columns: tuple[str, ...],
+    rows: Iterator[tuple],
+) -> None:
+    started = time.perf_counter()
+    result = await connection.copy_records_to_table(
+        table, records=rows, columns=columns
+    )
+    logger.info("%s: %s за %.1f с", table, result, time.perf_counter() - started)
+
+
+async def generate(
+    generator: DataGenerator,
+    password: str = "password",
+    truncate: bool = False,
+    defer_search_indexes: bool = False,
+    database_url: str = DATABASE_URL,
+) -> None:
+    # Один хеш на всех пользователей: пул потоков для CLI не нужен.
+    hashed_password = password_helper.hash(password)
+
+    dsn = make_url(database_url).set(drivername="postgresql")
+    connection = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+    tables = [
+        Category.__tablename__,
+        Question.__tablename__,
+        Answer.__tablename__,
+        User.__tablename__,
+        Favorite.__tablename__,
+    ]
+    started = time.perf_counter()
+    try:
+        async with connection.transaction():
+            if truncate:
+                await connection.execute(
+                    f"TRUNCATE {Favorite.__tablename__}, {Answer.__tablename__}, "
+                    f"{Question.__tablename__}, {Category.__tablename__}"
+                )
+                await connection.execute(
+                    f"DELETE FROM {User.__tablename__} WHERE NOT is_superuser"
+                )
+            if defer_search_indexes:
+                # Построить GIN-индекс один раз быстрее, чем обновлять его
+                # на каждой вставленной строке.
+                for index in SEARCH_INDEXES:
+                    await connection.execute(f"DROP INDEX IF EXISTS {index}")
+
+            first_category_id = await next_id(connection, Category.__tablename__)
+            first_question_id = await next_id(connection, Question.__tablename__)
+            first_user_id = await next_id(connection, User.__tablename__)
+            await copy_rows(
+                connection,
+                Category.__tablename__,
+                CATEGORY_COLUMNS,
+                generator.category_rows(first_category_id),
+            )
+            await copy_rows(
+                connection,
+                Question.__tablename__,
+                QUESTION_COLUMNS,
+                generator.question_rows(first_question_id, first_category_id),
+            )
+            await copy_rows(
+                connection,
+                Answer.__tablename__,
+                ANSWER_COLUMNS,
+                generator.answer_rows(
+                    await next_id(connection, Answer.__tablename__), first_question_id
+                ),
+            )
+            await copy_rows(
+                connection,
+                User.__tablename__,
+                USER_COLUMNS,
+                generator.user_rows(first_user_id, hashed_password),
+            )
+            await copy_rows(
+                connection,
+                Favorite.__tablename__,
+                FAVORITE_COLUMNS,
+                generator.favorite_rows(
+                    await next_id(connection, Favorite.__tablename__),
+                    first_user_id,
+                    first_question_id,
+                ),
+            )
+
+            if defer_search_indexes:
+                for index, table in SEARCH_INDEXES.items():
+                    await connection.execute(
+                        f"CREATE INDEX {index} ON {table} USING gin (search_vector)"
+                    )
+            # id заданы явно, поэтому последовательности нужно сдвинуть вручную.
+            for table in tables:
+                await connection.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"coalesce((SELECT max(id) FROM {table}), 0) + 1, false)"
+                )
+        for table in tables:
+            await connection.execute(f"ANALYZE {table}")
+    finally:
+        await connection.close()
+    logger.info("Готово за %.1f с", time.perf_counter() - started)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.utils.generate_data")
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--categories", type=int, default=30)
+    parser.add_argument("--favorites-per-user", type=float, default=5.0)
+    parser.add_argument("--max-views", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--password",
+        default=os.environ.get("GENERATED_USER_PASSWORD", "password"),
+        help="пароль всех созданных пользователей",
+    )
+    parser.add_argument("--truncate", action="store_true")
+    parser.add_argument(
+        "--defer-search-indexes",
+        action="store_true",
+        help="удалить GIN-индексы поиска на время загрузки и построить заново",
+    )
+    args = parser.parse_args()
+    if args.questions < 1 or args.categories < 1 or args.users < 0:
+        parser.error("нужны хотя бы один вопрос и одна категория")
+    return args
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format=settings.logging.log_format, level=logging.INFO)
+    args = parse_args()
+    asyncio.run(
+        generate(
+            DataGenerator(
+                questions=args.questions,
+                users=args.users,
+                categories=args.categories,
+                favorites_per_user=args.favorites_per_user,
+                max_views=args.max_views,
+                seed=args.seed,
+            ),
+            password=args.password,
+            truncate=args.truncate,
+            defer_search_indexes=args.defer_search_indexes,
+        )
+    )
@@ -0,0 +1,40 @@
+from bs4 import BeautifulSoup
+
+# Теги, после которых в тексте нужен перевод строки, иначе соседние абзацы
+# склеиваются: <p>a b</p><p>c</p> -> "a bc".
+BLOCK_TAGS = [
+    "address",
+    "article",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "tr",
+    "ul",
+]
+
+
+def html_to_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    # Разделитель только после блоков: get_text(" ") разрывал бы и слова
+    # с внутренней разметкой (<b>Kube</b>rnetes).
+    for tag in soup.find_all(BLOCK_TAGS):
+        tag.insert_after("\n")
+    return soup.get_text().strip()
@@ -0,0 +1,145 @@
+import asyncio
+from email.utils import formatdate
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from src.common.cache import (
+    CacheEntry,
+    CacheValidators,
+    ResponseCache,
+    _etag_matches,
+    _is_not_modified,
+    make_etag,
+    page_cache_key,
+    page_tags,
+    query_model_key_builder,
+)
+from src.category.views import category_page_query, category_page_tags
+from src.common.pagination import Page, encode_cursor
+from src.question.schemas import QuestionListQuery
+
+
+def make_request(query: str, headers: dict[str, str] | None = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/categories/docker",
+            "query_string": query.encode(),
+            "headers": [
+                (name.encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+        }
+    )
+
+
+def category_page_key(query: str) -> str | None:
+    page_query = category_page_query(make_request(query))
+    if page_query is None:
+        return None
+    return page_cache_key(make_request(query), page_query)
+
+
+def test_category_page_key_is_canonical():
+    cursor = encode_cursor(42)
+    key = category_page_key(f"page=2&page_size=9&cursor={cursor}")
+    assert key is not None
+    assert category_page_key(f"cursor={cursor}&page=02&page_size=9&utm=x") == key
+    assert category_page_key(f"cursor={cursor}=&page=2&page_size=9") == key
+    assert category_page_key("page=3&page_size=9") != key
+    # Страница без page_size или с неверными значениями - первая страница.
+    first = category_page_key("")
+    assert category_page_key("page=1&page_size=9") == first
+    assert category_page_key("page=7") == first
+    assert category_page_key("page=2&page_size=500") == first
+
+
+def test_category_page_free_form_params_are_not_cached():
+    assert category_page_key("search=docker") is None
+    assert category_page_key("cursor=broken") is None
+
+
+def test_category_pages_past_the_last_are_not_cached():
+    category = SimpleNamespace(id=1)
+    context = {"category": category, "questions": [1], "page": 3, "total_pages": 3}
+    assert category_page_tags(context) is not None
+    assert category_page_tags({**context, "page": 4}) is None
+    assert category_page_tags({**context, "questions": []}) is None
+
+
+def question_list_key(**params) -> str | None:
+    return query_model_key_builder(
+        None,
+        request=make_request(""),
+        args=(),
+        kwargs={"query": QuestionListQuery(**params)},
+    )
+
+
+def test_unbounded_list_params_are_not_cached():
+    assert question_list_key(limit=5) is not None
+    assert question_list_key(cursor=encode_cursor(42)) is None
+    assert question_list_key(min_views=7) is None
+    # Испорченный курсор валидируется в None - это первая страница.
+    assert question_list_key(cursor="broken") == question_list_key()
+
+
+def test_empty_list_page_is_not_cached():
+    tags = page_tags("list:questions")
+    assert tags(Page(items=[{"id": 1}])) == ["list:questions"]
+    assert tags(Page(items=[])) is None
+
+
+def test_etag_matches():
+    etag = make_etag(b"content")
+    assert _etag_matches(etag, etag)
+    assert _etag_matches(f"W/{etag}", etag)
+    assert _etag_matches(f'"other", {etag}', etag)
+    assert _etag_matches(" * ", etag)
+    assert not _etag_matches('"other"', etag)
+    assert not _etag_matches("", etag)
+
+
+def test_is_not_modified():
+    validators = CacheValidators(make_etag(b"content"), 1_700_000_000.0)
+
+    def not_modified(**headers: str) -> bool:
+        return _is_not_modified(make_request("", headers), validators)
+
+    since = formatdate(validators.last_modified, usegmt=True)
+    earlier = formatdate(validators.last_modified - 1, usegmt=True)
+    assert not not_modified()
+    assert not_modified(**{"if-none-match": validators.etag})
+    assert not_modified(**{"if-modified-since": since})
+    assert not not_modified(**{"if-modified-since": earlier})
+    assert not not_modified(**{"if-modified-since": "not a date"})
+    # If-None-Match важнее If-Modified-Since.
+    assert not not_modified(**{"if-none-match": '"other"', "if-modified-since": since})
+
+
+def test_refresh_keeps_last_modified_of_unchanged_content():
+    cache = ResponseCache("test", "test", 10, 1024, 60, 5)
+
+    async def store(*args) -> None:
+        pass
+
+    cache._store = store
+
+    def compute(content: bytes):
+        async def inner():
+            return content, ["list:questions"]
+
+        return inner
+
+    previous = CacheEntry(b"same", 0.0, 60.0, make_etag(b"same"), 1_000.0)
+    unchanged = asyncio.run(
+        cache._compute_and_store("key", 30, compute(b"same"), previous)
+    )
+    assert unchanged.last_modified == previous.last_modified
+    changed = asyncio.run(
+        cache._compute_and_store("key", 30, compute(b"new"), previous)
+    )
+    assert changed.etag != previous.etag
+    assert changed.last_modified > previous.last_modified
@@ -0,0 +1,129 @@
+import asyncio
+from email import message_from_bytes
+
+from src.config import MailConfig, MailOutboxConfig
+from src.mail.models import OutboxEmail
+from src.mail.sender import MailSender
+
+
+class SmtpStandIn:
+    """Минимальный SMTP-сервер: принимает письма и запоминает их."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.logins: list[str] = []
+        self.messages: list[bytes] = []
+        self.server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def __aenter__(self) -> "SmtpStandIn":
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 stand-in ESMTP")
+        while line := await reader.readline():
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                await reply("250-stand-in")
+                await reply("250 AUTH PLAIN")
+            elif verb == "AUTH":
+                self.logins.append(command)
+                await reply("235 Authentication succeeded")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while (chunk := await reader.readline()) != b".\r\n":
+                    data += chunk
+                self.messages.append(data)
+                await reply("250 OK")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("250 OK")
+        writer.close()
+
+
+def make_sender(port: int) -> MailSender:
+    mail = MailConfig(
+        username="sender",
+        password="secret",
+        from_mail="noreply@example.com",
+        server="127.0.0.1",
+        port=port,
+        tls=False,
+        validate_certs=False,
+    )
+    return MailSender(mail=mail, outbox=MailOutboxConfig(smtp_timeout=5.0))
+
+
+def make_email(number: int) -> OutboxEmail:
+    return OutboxEmail(
+        id=number,
+        recipient=f"user{number}@example.com",
+        subject=f"Сброс пароля {number}",
+        body=f"Ссылка {number}",
+        subtype="plain",
+    )
+
+
+def test_sender_reuses_one_smtp_connection():
+    async def scenario() -> SmtpStandIn:
+        async with SmtpStandIn() as smtp:
+            sender = make_sender(smtp.port)
+            for number in (1, 2):
+                await sender._send(make_email(number))
+            await sender._disconnect()
+        return smtp
+
+    smtp = asyncio.run(scenario())
+
+    assert smtp.connections == 1
+    assert len(smtp.logins) == 1
+    messages = [message_from_bytes(data) for data in smtp.messages]
+    assert [message["To"] for message in messages] == [
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert messages[0]["From"] == "devopsoffer <noreply@example.com>"
+    assert messages[0].get_payload(decode=True).decode().strip() == "Ссылка 1"
+
+
+def test_sender_reconnects_after_disconnect():
+    async def scenario() -> SmtpStandIn:
+        async with SmtpStandIn() as smtp:
+            sender = make_sender(smtp.port)
+            await sender._send(make_email(1))
+            await sender._disconnect()
+            await sender._send(make_email(2))
+            await sender._disconnect()
+        return smtp
+
+    smtp = asyncio.run(scenario())
+
+    assert smtp.connections == 2
+    assert len(smtp.messages) == 2
+
+
+def test_retry_backoff_stops_after_max_attempts():
+    sender = make_sender(25)
+    outbox = sender.outbox
+    assert sender._retry_at(1) is not None
+    assert sender._retry_at(outbox.max_attempts) is None
@@ -0,0 +1,22 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+
+import src.monitoring.metrics  # noqa: F401 - регистрирует обработчики событий Engine
+
+
+def queries() -> float:
+    return (
+        REGISTRY.get_sample_value("db_queries_total", {"route": "<background>"}) or 0.0
+    )
+
+
+def test_failed_statements_leave_no_query_state():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        before = queries()
+        with pytest.raises(exc.OperationalError):
+            conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+        assert queries() == before + 1
+        assert "metrics_query_start" not in conn.info
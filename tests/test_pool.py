@@ -0,0 +1,43 @@
+import asyncio
+import sqlite3
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from src.db.pool import InstrumentedPool, PoolStats
+
+
+def make_pool(name: str, **kwargs) -> InstrumentedPool:
+    return InstrumentedPool(
+        lambda: sqlite3.connect(":memory:"), stats=PoolStats(name), **kwargs
+    )
+
+
+def sample(metric: str, pool: str) -> float | None:
+    return REGISTRY.get_sample_value(metric, {"pool": pool})
+
+
+def test_checkouts_are_exported_as_metrics():
+    pool = make_pool("test_usage", pool_size=1, max_overflow=1)
+    first, second = pool.connect(), pool.connect()
+    assert sample("db_pool_checked_out_connections", "test_usage") == 2
+    assert sample("db_pool_overflow_connections", "test_usage") == 1
+
+    second.close()
+    first.close()
+    assert sample("db_pool_checked_out_connections", "test_usage") == 0
+    assert sample("db_pool_checkout_wait_seconds_count", "test_usage") == 2
+    assert sample("db_pool_waiting_checkouts", "test_usage") == 0
+
+
+def test_timeouts_are_counted():
+    pool = make_pool("test_timeout", pool_size=1, max_overflow=0, timeout=0.01)
+    connection = pool.connect()
+    # Ожидание в асинхронном пуле возможно только внутри greenlet.
+    with pytest.raises(exc.TimeoutError):
+        asyncio.run(greenlet_spawn(pool.connect))
+    connection.close()
+    assert sample("db_pool_timeouts_total", "test_timeout") == 1
+    assert pool.snapshot()["timeouts"] == 1
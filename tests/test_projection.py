@@ -0,0 +1,201 @@
+from types import SimpleNamespace
+from typing import get_args
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel, TypeAdapter
+from starlette.requests import Request
+
+from src.answer.dependencies import select_answer_rows
+from src.answer.projections import ANSWER_READ
+from src.answer.schemas import AnswerRead
+from src.category.projections import CATEGORY_READ
+from src.category.schemas import CategoryRead
+from src.common.cache import query_model_key_builder
+from src.common.pagination import Page
+from src.common.projection import Projection, dump_json, select_fields
+from src.common.schemas import CursorPage, FieldsQuery
+from src.question.dependencies import select_question_rows
+from src.question.projections import QUESTION_READ
+from src.question.schemas import QuestionListQuery, QuestionRead
+
+READ_PROJECTIONS = [
+    (QUESTION_READ, QuestionRead),
+    (ANSWER_READ, AnswerRead),
+    (CATEGORY_READ, CategoryRead),
+]
+
+
+def nested_schema(annotation) -> type[BaseModel]:
+    # Optional["AnswerReadNested"] -> AnswerReadNested.
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return next(arg for arg in get_args(annotation) if arg is not type(None))
+
+
+def assert_same_fields(projection: Projection, schema: type[BaseModel]) -> None:
+    assert list(projection.fields) == list(schema.model_fields)
+    for name, field in projection.fields.items():
+        if isinstance(field, Projection):
+            annotation = schema.model_fields[name].annotation
+            assert_same_fields(field, nested_schema(annotation))
+
+
+def as_orm(item: dict | None, schema: type[BaseModel]):
+    # Словарь проекции в объект с атрибутами модели ORM (content_text вместо
+    # content), как его валидирует схема Read на прежнем пути чтения.
+    if item is None:
+        return None
+    attributes = {}
+    for name, value in item.items():
+        field = schema.model_fields[name]
+        if isinstance(value, dict):
+            value = as_orm(value, nested_schema(field.annotation))
+        attributes[field.validation_alias or name] = value
+    return SimpleNamespace(**attributes)
+
+
+def make_row(projection: Projection, seed: int, empty: set[str] = frozenset()):
+    # Строка результата с метками столбцов проекции; вложенный объект из
+    # empty отсутствует, как при внешнем соединении без пары.
+    row = {}
+    for column in projection.columns():
+        label = column.key
+        if label.split("__")[0] in empty:
+            row[label] = None
+        elif column.type.python_type is int:
+            row[label] = seed
+        else:
+            row[label] = f'{label} {seed} "кавычки" </script>'
+    return row
+
+
+@pytest.mark.parametrize(("projection", "schema"), READ_PROJECTIONS)
+def test_projection_fields_follow_schema_order(projection, schema):
+    assert_same_fields(projection, schema)
+
+
+@pytest.mark.parametrize(("projection", "schema"), READ_PROJECTIONS)
+def test_dump_json_matches_schema_json(projection, schema):
+    rows = [make_row(projection, seed) for seed in (1, 2)]
+    if projection is QUESTION_READ:
+        rows.append(make_row(projection, 3, empty={"answer"}))
+    page = Page(items=projection.to_dicts(rows), next_cursor="abc")
+
+    adapter = TypeAdapter(CursorPage[schema])
+    orm_page = SimpleNamespace(
+        items=[as_orm(item, schema) for item in page.items],
+        next_cursor=page.next_cursor,
+        prev_cursor=page.prev_cursor,
+    )
+    expected = adapter.dump_json(
+        adapter.validate_python(orm_page, from_attributes=True)
+    )
+    assert dump_json(page) == expected
+
+    item = projection.to_dict(rows[0])
+    expected = schema.model_validate(as_orm(item, schema), from_attributes=True)
+    assert dump_json(item) == expected.model_dump_json().encode()
+
+
+def test_missing_nested_object_is_none():
+    row = make_row(QUESTION_READ, 1, empty={"answer"})
+    assert QUESTION_READ.to_dict(row)["answer"] is None
+
+
+def selected(projection: Projection) -> dict:
+    # Дерево выбранных полей: {"id": None, "category": {"id": None, ...}}.
+    return {
+        name: selected(field) if isinstance(field, Projection) else None
+        for name, field in projection.fields.items()
+    }
+
+
+def test_fields_select_columns_and_nested_objects():
+    query = FieldsQuery(fields=["title,category.name"])
+    assert selected(select_fields(QUESTION_READ, query)) == {
+        "title": None,
+        "id": None,
+        "category": {"id": None, "name": None},
+    }
+
+
+def test_expand_limits_nested_objects():
+    assert "answer" not in selected(QUESTION_READ.select(expand=["category"]))
+    assert selected(QUESTION_READ.select(fields=["id"], expand=[])) == {"id": None}
+    assert selected(QUESTION_READ.select(expand=[])).keys() == {
+        "title",
+        "category_id",
+        "id",
+    }
+
+
+@pytest.mark.parametrize(
+    ("fields", "expand", "detail"),
+    [
+        (["missing"], None, "missing"),
+        (["category.missing"], None, "category.missing"),
+        (["title.id"], None, "title"),
+        (None, ["title"], "title"),
+    ],
+)
+def test_unknown_path_is_422(fields, expand, detail):
+    with pytest.raises(HTTPException) as err:
+        select_fields(QUESTION_READ, FieldsQuery(fields=fields, expand=expand))
+    assert err.value.status_code == 422
+    assert err.value.detail == f"Unknown field: {detail}"
+
+
+def joined_tables(stmt) -> str:
+    return str(stmt).split("FROM", 1)[1]
+
+
+def test_question_rows_join_only_selected_tables():
+    plain = joined_tables(select_question_rows(QUESTION_READ.select(fields=["id"])))
+    assert "JOIN" not in plain
+    with_category = joined_tables(
+        select_question_rows(QUESTION_READ.select(expand=["category"]))
+    )
+    assert "JOIN categories" in with_category
+    assert "answers" not in with_category
+    full = joined_tables(select_question_rows(QUESTION_READ))
+    assert "JOIN categories" in full and "LEFT OUTER JOIN answers" in full
+    # Фильтр по связанной таблице присоединяет ее и без ее полей.
+    filtered = joined_tables(
+        select_question_rows(QUESTION_READ.select(fields=["id"]), join_answer=True)
+    )
+    assert "LEFT OUTER JOIN answers" in filtered
+
+
+def test_answer_rows_join_only_selected_tables():
+    plain = joined_tables(select_answer_rows(ANSWER_READ.select(expand=[])))
+    assert "JOIN" not in plain
+    with_question = joined_tables(
+        select_answer_rows(ANSWER_READ.select(fields=["question.title"]))
+    )
+    assert "JOIN questions" in with_question
+    assert "categories" not in with_question
+    full = joined_tables(select_answer_rows(ANSWER_READ))
+    assert "JOIN questions" in full and "JOIN categories" in full
+    filtered = joined_tables(
+        select_answer_rows(ANSWER_READ.select(expand=[]), join_question=True)
+    )
+    assert "JOIN questions" in filtered and "categories" not in filtered
+
+
+def test_equivalent_field_lists_share_cache_key():
+    request = Request(
+        {"type": "http", "method": "GET", "path": "/questions", "headers": []}
+    )
+
+    def key(**params) -> str | None:
+        return query_model_key_builder(
+            None,
+            request=request,
+            args=(),
+            kwargs={"query": QuestionListQuery(**params)},
+        )
+
+    expected = key(fields=["id,title"], expand=["category"])
+    assert key(fields=["title", " id ", "title"], expand=["category,"]) == expected
+    assert key(fields=["title"], expand=["category"]) != expected
@@ -0,0 +1,35 @@
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.config import ServerTimingConfig
+from src.monitoring.middleware import ServerTimingMiddleware
+from src.monitoring.timing import measure
+
+
+async def homepage(request):
+    with measure("cache"):
+        time.sleep(0.001)
+    return PlainTextResponse("ok")
+
+
+def make_client(enabled: bool) -> TestClient:
+    app = Starlette(routes=[Route("/", homepage)])
+    app.add_middleware(
+        ServerTimingMiddleware, config=ServerTimingConfig(enabled=enabled)
+    )
+    return TestClient(app)
+
+
+def test_server_timing_header_when_enabled():
+    header = make_client(enabled=True).get("/").headers["server-timing"]
+    names = [part.split(";")[0] for part in header.split(", ")]
+    assert names == ["cache", "total"]
+
+
+def test_no_server_timing_header_by_default():
+    response = make_client(enabled=False).get("/")
+    assert "server-timing" not in response.headers
@@ -0,0 +1,8 @@
+from src.question.counter import ViewCounter
+
+
+def test_new_slugs_over_limit_are_dropped():
+    counter = ViewCounter(flush_interval=10.0, max_pending=2)
+    for slug in ("docker", "k8s", "missing-1", "missing-2", "docker"):
+        counter.incr(slug)
+    assert counter._pending == {"docker": 2, "k8s": 1}